@@ -9,13 +9,14 @@
 
 import tkinter as tk
 
-from typing import Optional
+from typing import List, Optional
 
 from checker.jsktoolbox.basetool.data import BData
 from checker.jsktoolbox.edmctool.stars import StarsSystem
 
 from checker.keys import CheckerKeys
-from checker.th import ThSearchSystem
+from checker.queues import StatusChannel
+from checker.th import ThPrefetchSystems, ThSearchSystem
 
 
 class BCheckerData(BData):
@@ -72,6 +73,82 @@ class BCheckerData(BData):
         """
         self._set_data(key=CheckerKeys.PLUGIN_NAME, value=value, set_default_type=str)
 
+    @property
+    def prefetch_depth(self) -> int:
+        """prefetch_depth property
+
+        Returns:
+            [int] -- number of route systems to prefetch after the target
+        """
+        return self._get_data(key=CheckerKeys.PREFETCH_DEPTH, default_value=5)  # type: ignore
+
+    @prefetch_depth.setter
+    def prefetch_depth(self, value: int) -> None:
+        """prefetch_depth setter
+
+        Arguments:
+            value -- [int] number of route systems to prefetch
+        """
+        self._set_data(
+            key=CheckerKeys.PREFETCH_DEPTH, value=value, set_default_type=int
+        )
+
+    @property
+    def search_workers(self) -> int:
+        """search_workers property
+
+        Returns:
+            [int] -- number of lookup workers of the search engine
+        """
+        return self._get_data(key=CheckerKeys.SEARCH_WORKERS, default_value=3)  # type: ignore
+
+    @search_workers.setter
+    def search_workers(self, value: int) -> None:
+        """search_workers setter
+
+        Arguments:
+            value -- [int] number of lookup workers
+        """
+        self._set_data(
+            key=CheckerKeys.SEARCH_WORKERS, value=value, set_default_type=int
+        )
+
+    @property
+    def route(self) -> List[StarsSystem]:
+        """route property
+
+        Returns:
+            List[StarsSystem] -- plotted route from NavRoute event
+        """
+        if self._get_data(key=CheckerKeys.ROUTE, default_value=None) is None:
+            self._set_data(key=CheckerKeys.ROUTE, value=[], set_default_type=List)
+        return self._get_data(key=CheckerKeys.ROUTE)  # type: ignore
+
+    @route.setter
+    def route(self, value: Optional[List[StarsSystem]]) -> None:
+        """route setter
+
+        Arguments:
+            value -- Optional[List[StarsSystem]]
+        """
+        self._set_data(
+            key=CheckerKeys.ROUTE,
+            value=[] if value is None else value,
+            set_default_type=List,
+        )
+
+    @property
+    def _prefetch(self) -> Optional[ThPrefetchSystems]:
+        return self._get_data(key=CheckerKeys.TH_PREFETCH, default_value=None)
+
+    @_prefetch.setter
+    def _prefetch(self, value: ThPrefetchSystems) -> None:
+        self._set_data(
+            key=CheckerKeys.TH_PREFETCH,
+            value=value,
+            set_default_type=ThPrefetchSystems,
+        )
+
     @property
     def _search(self) -> Optional[ThSearchSystem]:
         return self._get_data(key=CheckerKeys.TH_SEARCH, default_value=None)
@@ -102,6 +179,21 @@ class BCheckerData(BData):
             key=CheckerKeys.STATUS, value=value, set_default_type=tk.StringVar
         )
 
+    @property
+    def status_channel(self) -> StatusChannel:
+        """status_channel property
+
+        Returns:
+            StatusChannel -- status lines published to the status variable
+        """
+        if self._get_data(key=CheckerKeys.STATUS_CHANNEL, default_value=None) is None:
+            self._set_data(
+                key=CheckerKeys.STATUS_CHANNEL,
+                value=StatusChannel(),
+                set_default_type=StatusChannel,
+            )
+        return self._get_data(key=CheckerKeys.STATUS_CHANNEL)  # type: ignore
+
     @property
     def version(self) -> str:
         return self._get_data(key=CheckerKeys.VERSION, default_value="")  # type: ignore
@@ -10,13 +10,16 @@
 
 from checker.jsktoolbox.edmctool.base import BLogClient, BLogProcessor
 from checker.jsktoolbox.edmctool.logs import LogClient, LogProcessor
+from checker.jsktoolbox.edmctool.stars import StarsSystem, StarsSystemRegistry
 from checker.base_data import BCheckerData
 
 
 from queue import SimpleQueue
 from threading import Thread
+from typing import Any, Dict, List, Optional
 
-from checker.th import ThSearchSystem
+from checker.jsktoolbox.edmctool.ed_keys import EDKeys
+from checker.th import ThPrefetchSystems, ThSearchSystem
 
 
 class Checker(BLogProcessor, BLogClient, BCheckerData):
@@ -56,16 +59,72 @@ class Checker(BLogProcessor, BLogClient, BCheckerData):
         self.logger.debug = f"{self.plugin_name} starting search engine..."
         if self._search is None:
             # init search thread
-            search = ThSearchSystem(self.qlog, self.status)
+            search = ThSearchSystem(
+                self.qlog, self.status_channel, workers=self.search_workers
+            )
             print(search.name)
             if search:
                 search.start()
                 self._search = search
+        if self._prefetch is None and self._search is not None:
+            # init route prefetch thread
+            prefetch = ThPrefetchSystems(
+                self.qlog, self._search.idle, lookups=self._search.lookups
+            )
+            prefetch.start()
+            self._prefetch = prefetch
 
     def dialog_update(self) -> None:
         if self._search:
             search: ThSearchSystem = self._search
-            search.search_queue.put(self.jump_system)
+            # snapshot, jump_system is mutated by the following journal events
+            target = StarsSystem(
+                name=self.jump_system.name, address=self.jump_system.address
+            )
+            target.star_class = self.jump_system.star_class
+            # canonical object shares data with route and prefetch results
+            search.search_queue.put(StarsSystemRegistry.shared().intern(target))
+            # drain status lines until the lookup posts its final one
+            self.status_channel.wake()
+
+    def route_update(self, route: Optional[List[Dict[str, Any]]]) -> None:
+        """Store the plotted route from NavRoute journal event."""
+        registry: StarsSystemRegistry = StarsSystemRegistry.shared()
+        systems: List[StarsSystem] = []
+        for item in route or []:
+            system = StarsSystem(
+                name=item.get(EDKeys.STAR_SYSTEM),
+                address=item.get(EDKeys.SYSTEM_ADDRESS),
+                star_pos=item.get(EDKeys.STAR_POS),
+            )
+            system.star_class = item.get(EDKeys.STAR_CLASS, "")
+            systems.append(registry.intern(system))
+        self.route = systems
+        self.prefetch_update()
+
+    def prefetch_update(self, remaining: Optional[int] = None) -> None:
+        """Queue the route systems following the current jump target.
+
+        remaining:  RemainingJumpsInRoute from FSDTarget event, used
+                    when the target cannot be found on the route by name
+        """
+        if self._prefetch is None or not self.route:
+            return None
+        start: int = 0
+        for idx, system in enumerate(self.route):
+            if (
+                self.jump_system.address is not None
+                and system.address == self.jump_system.address
+            ) or (self.jump_system.name and system.name == self.jump_system.name):
+                start = idx
+                break
+        else:
+            if remaining is not None and 0 < remaining <= len(self.route):
+                start = len(self.route) - remaining
+        # route systems are interned, prefetched data lands on the canonical objects
+        self._prefetch.prefetch_queue.put(
+            self.route[start + 1 : start + 1 + self.prefetch_depth]
+        )
 
 
 # #[EOF]#######################################################################
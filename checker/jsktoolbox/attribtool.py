@@ -58,6 +58,8 @@ class NoDynamicAttributes:
     of derived types.
     """
 
+    __slots__ = ()
+
     def __setattr__(self, name: str, value: Any) -> None:
         if not hasattr(self, name):
             raise AttributeError(
@@ -17,6 +17,8 @@ from ..attribtool import NoDynamicAttributes
 class BClasses(NoDynamicAttributes):
     """Base class for projects."""
 
+    __slots__ = ()
+
     @property
     def _c_name(self) -> str:
         """Return class name."""
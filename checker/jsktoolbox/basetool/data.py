@@ -4,13 +4,25 @@ data.py
 Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
 Created: 15.01.2024, 10:23:11
 
-Purpose: BData container base class.
+Purpose: BData and BSlotData container base classes.
 """
 
 import copy
+import types
 
+from collections.abc import MutableMapping
 from inspect import currentframe
-from typing import Dict, List, Any, Optional
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Any,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
 
 from ..raisetool import Raise
 
@@ -210,5 +222,317 @@ class BData(BClasses):
         self.__types = None
 
 
+class _Missing(object):
+    """Marker of an unset slot, survives copy and pickle as a singleton."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+    def __reduce__(self) -> str:
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+def _runtime_types(hint: Any) -> Tuple[type, ...]:
+    """Returns tuple of classes for isinstance() check of a type hint.
+
+    Unions and Optional are flattened, generic aliases are reduced
+    to their origin class, Any and unknown hints accept everything.
+    """
+    if hint is None or hint is type(None):
+        return (type(None),)
+    origin: Any = get_origin(hint)
+    if origin is Union or origin is getattr(types, "UnionType", Union):
+        out: Tuple[type, ...] = ()
+        for arg in get_args(hint):
+            out += tuple(item for item in _runtime_types(arg) if item not in out)
+        return out
+    if origin is not None:
+        return _runtime_types(origin)
+    if isinstance(hint, type):
+        return (hint,)
+    return (object,)
+
+
+class BSlotData(BClasses):
+    """BSlotData container class.
+
+    Compact variant of BData with the same _get_data/_set_data API.
+    Keys declared in the _FIELDS dict of a class, key -> type hint,
+    are compiled once at class creation into a slot index and tuples
+    of classes for isinstance() checks, and stored in a list held
+    in __slots__. Undeclared keys fall back to an internal dict.
+
+    Subclasses declare __slots__ = () to keep instances without __dict__,
+    _FIELDS of base classes are inherited.
+    """
+
+    __slots__ = ("__values", "__extra", "__types", "__weakref__")
+
+    _FIELDS: Dict[str, Any] = {}
+    # compiled by __init_subclass__
+    _SLOT_INDEX: Dict[str, int] = {}
+    _SLOT_HINTS: Tuple[Any, ...] = ()
+    _SLOT_TYPES: Tuple[Tuple[type, ...], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Compile fields declarations of the class."""
+        super().__init_subclass__(**kwargs)
+        fields: Dict[str, Any] = {}
+        for base in reversed(cls.__mro__):
+            fields.update(base.__dict__.get("_FIELDS", {}))
+        cls._SLOT_INDEX = {key: idx for idx, key in enumerate(fields)}
+        cls._SLOT_HINTS = tuple(fields.values())
+        cls._SLOT_TYPES = tuple(_runtime_types(hint) for hint in fields.values())
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "BSlotData":
+        """Create object with all slots unset."""
+        obj: BSlotData = super().__new__(cls)
+        # NoDynamicAttributes.__setattr__ rejects unset slots
+        object.__setattr__(obj, "_BSlotData__values", [_MISSING] * len(cls._SLOT_INDEX))
+        object.__setattr__(obj, "_BSlotData__extra", None)
+        object.__setattr__(obj, "_BSlotData__types", None)
+        return obj
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the class lookup finds properties and slots without calling getters
+        if not hasattr(type(self), name):
+            raise AttributeError(
+                f"Cannot add new attribute '{name}' to {self.__class__.__name__} object"
+            )
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def _slot_values(cls) -> List[Any]:
+        """Returns new list of unset slot values in _SLOT_INDEX order."""
+        return [_MISSING] * len(cls._SLOT_INDEX)
+
+    @classmethod
+    def _from_slot_values(cls, values: List[Any]) -> Any:
+        """Returns object holding the given slot values list.
+
+        Bulk constructor path, the values are not checked against _FIELDS,
+        the caller validates them. Use _slot_values() for the list template.
+        """
+        if len(values) != len(cls._SLOT_INDEX):
+            raise Raise.error(
+                f"Expected {len(cls._SLOT_INDEX)} values, received: {len(values)}",
+                ValueError,
+                cls.__name__,
+                currentframe(),
+            )
+        obj: BSlotData = cls.__new__(cls)
+        obj.__values = values
+        return obj
+
+    def __type_error(self, expected: Any, value: Any, frame: Any) -> Exception:
+        return Raise.error(
+            f"Expected '{expected}' type, received: '{type(value)}'",
+            TypeError,
+            self._c_name,
+            frame,
+        )
+
+    def _copy_data(self, key: str) -> Optional[Any]:
+        """Copy data from the internal storage.
+
+        ### Arguments:
+        * key [str] - variable name,
+        """
+        idx: Optional[int] = self._SLOT_INDEX.get(key)
+        if idx is not None:
+            value: Any = self.__values[idx]
+            return None if value is _MISSING else copy.deepcopy(value)
+        if self.__extra and key in self.__extra:
+            return copy.deepcopy(self.__extra[key])
+        return None
+
+    def _get_data(
+        self,
+        key: str,
+        set_default_type: Optional[Any] = None,
+        default_value: Optional[Any] = None,
+    ) -> Optional[Any]:
+        """Gets data from internal storage.
+
+        ### Arguments:
+        * key [str] - variable name,
+        * set_default_type [Optional[Any]] - sets and restrict default type
+          of undeclared variable if not None,
+        * default_value [Optional[Any]] - returns it if variable not found
+        """
+        idx: Optional[int] = self._SLOT_INDEX.get(key)
+        if idx is not None:
+            value: Any = self.__values[idx]
+            if value is not _MISSING:
+                return value
+            if default_value is not None and not isinstance(
+                default_value, self._SLOT_TYPES[idx]
+            ):
+                raise self.__type_error(
+                    self._SLOT_HINTS[idx], default_value, currentframe()
+                )
+            return default_value
+        if self.__extra and key in self.__extra:
+            return self.__extra[key]
+        if set_default_type:
+            if self.__types is None:
+                self.__types = {}
+            self.__types[key] = set_default_type
+        if default_value is not None:
+            if (
+                self.__types
+                and key in self.__types
+                and not isinstance(default_value, self.__types[key])
+            ):
+                raise self.__type_error(
+                    self.__types[key], default_value, currentframe()
+                )
+            return default_value
+        return None
+
+    def _set_data(
+        self, key: str, value: Optional[Any], set_default_type: Optional[Any] = None
+    ) -> None:
+        """Sets data to internal storage.
+
+        ### Arguments:
+        * key [str] - variable name,
+        * value [Optional[Any]] - value of variable
+        * set_default_type [Optional[Any]] - sets and restrict default type
+          of undeclared variable if not None, declared fields keep
+          the type from _FIELDS.
+        """
+        idx: Optional[int] = self._SLOT_INDEX.get(key)
+        if idx is not None:
+            if not isinstance(value, self._SLOT_TYPES[idx]):
+                raise self.__type_error(self._SLOT_HINTS[idx], value, currentframe())
+            old: Any = self.__values[idx]
+            if old is not value and isinstance(old, (list, dict)):
+                old.clear()
+            self.__values[idx] = value
+            return None
+        if self.__types is None:
+            self.__types = {}
+        if key not in self.__types and set_default_type:
+            self.__types[key] = set_default_type
+        if key in self.__types and not isinstance(value, self.__types[key]):
+            raise self.__type_error(self.__types[key], value, currentframe())
+        if self.__extra is None:
+            self.__extra = {}
+        old = self.__extra.get(key)
+        if old is not value and isinstance(old, (list, dict)):
+            old.clear()
+        self.__extra[key] = value
+
+    def _delete_data(self, key: str) -> None:
+        """Delete data and data type of undeclared variable.
+
+        ### Arguments:
+        * key [str] - variable name to delete
+        """
+        self._clear_data(key)
+        if self.__types and key in self.__types:
+            del self.__types[key]
+
+    def _clear_data(self, key: str) -> None:
+        """Clear data from internal storage.
+        Does not delete data type.
+        If key is not found, does nothing.
+
+        ### Arguments:
+        * key [str] - variable name to delete
+        """
+        idx: Optional[int] = self._SLOT_INDEX.get(key)
+        if idx is not None:
+            if isinstance(self.__values[idx], (list, dict)):
+                self.__values[idx].clear()
+            self.__values[idx] = _MISSING
+        elif self.__extra and key in self.__extra:
+            if isinstance(self.__extra[key], (list, dict)):
+                self.__extra[key].clear()
+            del self.__extra[key]
+
+    @property
+    def _data(self) -> "MutableMapping[str, Any]":
+        """Return data mapping.
+
+        As in BData, it holds all set variables, declared and undeclared.
+        It is a live view, assignments go through _set_data type checks.
+        """
+        return _SlotDataView(self)
+
+    @_data.setter
+    def _data(self, value: Optional[Dict[str, Any]]) -> None:
+        """Set data from dict, clear all data and types if None."""
+        if value is None:
+            for key in list(_SlotDataView(self)):
+                self._clear_data(key)
+            if self.__types is not None:
+                self.__types.clear()
+            return None
+        if not isinstance(value, Dict):
+            raise Raise.error(
+                f"Expected Dict type, received: '{type(value)}'.",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        for key, item in value.items():
+            self._set_data(key, item)
+
+    @_data.deleter
+    def _data(self) -> None:
+        """Delete all data and types of undeclared variables."""
+        self._data = None
+
+
+class _SlotDataView(MutableMapping):
+    """Live mapping of the variables set in a BSlotData object."""
+
+    __slots__ = ("__obj",)
+
+    def __init__(self, obj: BSlotData) -> None:
+        self.__obj = obj
+
+    def __getitem__(self, key: str) -> Any:
+        obj: BSlotData = self.__obj
+        idx: Optional[int] = obj._SLOT_INDEX.get(key)
+        if idx is not None:
+            value: Any = obj._BSlotData__values[idx]  # type: ignore
+            if value is not _MISSING:
+                return value
+        else:
+            extra: Optional[Dict[str, Any]] = obj._BSlotData__extra  # type: ignore
+            if extra and key in extra:
+                return extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.__obj._set_data(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.__obj._clear_data(key)
+
+    def __iter__(self) -> Iterator[str]:
+        obj: BSlotData = self.__obj
+        values: List[Any] = obj._BSlotData__values  # type: ignore
+        for key, idx in obj._SLOT_INDEX.items():
+            if values[idx] is not _MISSING:
+                yield key
+        extra: Optional[Dict[str, Any]] = obj._BSlotData__extra  # type: ignore
+        if extra:
+            yield from list(extra)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 #
 # #[EOF]#######################################################################
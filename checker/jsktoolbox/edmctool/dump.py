@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+dump.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 13:05:41
+
+Purpose: EDSM nightly dumps importer.
+"""
+
+import gzip
+
+import requests  # type: ignore
+
+from inspect import currentframe
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional
+
+from ..attribtool import ReadOnlyClass
+from ..basetool.classes import BClasses
+from ..raisetool import Raise
+from .edsm import JsonDecoder, LocalSystemsStore
+
+
+class DumpUrls(object, metaclass=ReadOnlyClass):
+    """EDSM nightly dumps addresses."""
+
+    SYSTEMS: str = "https://www.edsm.net/dump/systemsWithCoordinates.json.gz"
+    SYSTEMS_7DAYS: str = "https://www.edsm.net/dump/systemsWithCoordinates7days.json.gz"
+
+
+class EdsmDumpImporter(BClasses):
+    """EdsmDumpImporter.
+
+    Streams an EDSM systems dump into LocalSystemsStore.
+    The dump is a JSON list with one system per line, so it is decoded
+    line by line and never loaded whole. The source may be a local file,
+    plain or gzipped, or a http(s) address.
+    """
+
+    __store: LocalSystemsStore = None  # type: ignore
+    __batch_size: int = None  # type: ignore
+
+    def __init__(self, store: LocalSystemsStore, batch_size: int = 20000) -> None:
+        """Create importer object.
+
+        ### Arguments:
+        * store [LocalSystemsStore] - target database,
+        * batch_size [int] - number of systems written in one transaction.
+        """
+        if not isinstance(store, LocalSystemsStore):
+            raise Raise.error(
+                f"LocalSystemsStore type expected, '{type(store)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise Raise.error(
+                f"Positive int expected for batch_size, '{batch_size}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__store = store
+        self.__batch_size = batch_size
+
+    @staticmethod
+    def records(stream: IO[bytes]) -> Iterator[Dict[str, Any]]:
+        """Yields system records from dump stream.
+
+        List brackets, trailing commas and malformed lines are skipped.
+        """
+        for line in stream:
+            line = line.strip()
+            if line.endswith(b","):
+                line = line[:-1]
+            if not line.startswith(b"{"):
+                continue
+            try:
+                yield JsonDecoder.loads(line)
+            except ValueError:
+                continue
+
+    def run(
+        self,
+        source: str = DumpUrls.SYSTEMS,
+        replace: bool = True,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Imports dump from source, returns number of imported systems.
+
+        ### Arguments:
+        * source [str] - file path or http(s) address of the dump,
+        * replace [bool] - if set, the store is cleared before import,
+          incremental dumps are imported with replace set to False,
+        * progress [Optional[Callable[[int], None]]] - called after each
+          batch with the number of imported systems.
+        """
+        response: Optional[requests.Response] = None
+        stream: IO[bytes]
+        if source.startswith(("http://", "https://")):
+            response = requests.get(source, stream=True, timeout=60)
+            if response.status_code != 200:
+                response.close()
+                raise Raise.error(
+                    f"Error downloading dump: {response.status_code}",
+                    ValueError,
+                    self._c_name,
+                    currentframe(),
+                )
+            stream = response.raw
+            if source.endswith(".gz"):
+                stream = gzip.GzipFile(fileobj=response.raw)  # type: ignore
+        elif source.endswith(".gz"):
+            stream = gzip.open(source, "rb")  # type: ignore
+        else:
+            stream = open(source, "rb")
+
+        count: int = 0
+        try:
+            if replace:
+                self.__store.clear()
+            records: Iterator[Dict[str, Any]] = self.records(stream)
+            while True:
+                batch: List[Dict[str, Any]] = list(islice(records, self.__batch_size))
+                if not batch:
+                    break
+                count += self.__store.add_many(batch)
+                if progress is not None:
+                    progress(count)
+        finally:
+            stream.close()
+            if response is not None:
+                response.close()
+        return count
+
+
+# #[EOF]#######################################################################
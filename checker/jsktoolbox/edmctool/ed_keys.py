@@ -438,6 +438,7 @@ class EDKeys(object, metaclass=ReadOnlyClass):
     RING: str = "Ring"
     RINGS: str = "Rings"
     RING_CLASS: str = "RingClass"
+    ROUTE: str = "Route"
     ROCKY: str = "Rocky"
     ROLE: str = "Role"
     ROTATION_PERIOD: str = "RotationPeriod"
@@ -8,28 +8,1271 @@ Purpose:
 """
 
 import requests  # type: ignore
+import asyncio
+import codecs
+import hashlib
 import json
 import json
+import mmap
+import os
+import re
+import sqlite3
+import time
+import zlib
 
-from typing import Dict, List, Optional, Any, Union
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.client import HTTPMessage, parse_headers
+from io import BytesIO
+from typing import (
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Any,
+    Set,
+    Tuple,
+    Union,
+)
+from requests.adapters import HTTPAdapter  # type: ignore
 from requests.utils import requote_uri  # type: ignore
 from inspect import currentframe
+from email.utils import parsedate_to_datetime
+from json.scanner import make_scanner
+from _thread import LockType
+from threading import Condition, Event, Lock, Thread
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from .edsm_keys import EdsmKeys
+from .metrics import Metrics
+from .spatial import SpatialIndex, clamp_radius, clamp_size
+from .system import EnvLocal
 
 
+from ..basetool.classes import BClasses
 from ..basetool.data import BData
 from ..attribtool import ReadOnlyClass
 from ..raisetool import Raise
-from ..edmctool.stars import StarsSystem
+from ..edmctool.stars import StarsSystem, StarsSystemRegistry
+
+# available JSON decoders, the first importable one is used
+_JSON_BACKENDS: Dict[str, Callable[[Union[str, bytes]], Any]] = {}
+
+try:
+    import orjson  # type: ignore
+
+    _JSON_BACKENDS["orjson"] = orjson.loads
+except ModuleNotFoundError:
+    pass
+
+try:
+    import ujson  # type: ignore
+
+    _JSON_BACKENDS["ujson"] = ujson.loads
+except ModuleNotFoundError:
+    pass
+
+_JSON_BACKENDS["json"] = json.loads
 
 
 class _Keys(object, metaclass=ReadOnlyClass):
     """Internal  keys container class."""
 
+    ABORT: str = "__abort__"
+    CACHE: str = "__cache__"
+    FIELDS: str = "__fields__"
+    LOCAL_STORE: str = "__local_store__"
+    LOOP: str = "__loop__"
+    LOOP_THREAD: str = "__loop_thread__"
+    METRICS: str = "__metrics__"
     OPTIONS: str = "__options__"
+    POOL: str = "__pool__"
+    POOL_SIZE: str = "__pool_size__"
+    SPATIAL: str = "__spatial__"
+    PRIORITY: str = "__priority__"
+    RETRIES: str = "__retries__"
+    BACKOFF: str = "__backoff__"
+    SESSION: str = "__session__"
     SYSTEMS_URL: str = "__systems_url__"
     SYSTEM_URL: str = "__system_url__"
+    URL: str = "__url__"
+
+    # EdsmCache
+    DB: str = "__db__"
+    DB_PATH: str = "__db_path__"
+    LOCK: str = "__lock__"
+    MAX_ENTRIES: str = "__max_entries__"
+    TTL_BODIES: str = "__ttl_bodies__"
+    TTL_NEGATIVE: str = "__ttl_negative__"
+    TTL_SYSTEM: str = "__ttl_system__"
+
+    # LocalSystemsStore
+    COORDS: str = "__coords__"
+    COORDS_MAP: str = "__coords_map__"
+
+
+class JsonDecoder(object, metaclass=ReadOnlyClass):
+    """JsonDecoder.
+
+    Pluggable decoder for EDSM responses. The backend is selected once
+    at import, orjson or ujson when importable, stdlib json otherwise.
+    """
+
+    BACKENDS: Dict[str, Callable[[Union[str, bytes]], Any]] = _JSON_BACKENDS
+    BACKEND: str = next(iter(_JSON_BACKENDS))
+    loads: Callable[[Union[str, bytes]], Any] = staticmethod(
+        _JSON_BACKENDS[next(iter(_JSON_BACKENDS))]
+    )
+
+
+class EdsmCache(BData):
+    """EdsmCache.
+
+    Persistent, TTL-aware cache for decoded EDSM API responses.
+    Entries are stored in a SQLite database keyed by the normalised
+    request URL and evicted in LRU order when the size cap is exceeded.
+    Empty answers for unknown systems are kept as negative entries
+    with their own, shorter lifetime. Expired entries are kept with their
+    validators, ETag, Last-Modified and content digest, until evicted,
+    so they can be revalidated instead of downloaded again.
+    """
+
+    SCHEMA_VERSION: int = 3
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        system_ttl: int = 86400,
+        bodies_ttl: int = 3600,
+        max_entries: int = 5000,
+        negative_ttl: int = 1800,
+    ) -> None:
+        """Create cache object.
+
+        ### Arguments:
+        * path [Optional[str]] - database file, default in EnvLocal().tmpdir,
+        * system_ttl [int] - lifetime of system metadata entries in seconds,
+        * bodies_ttl [int] - lifetime of bodies entries in seconds,
+        * max_entries [int] - size cap for LRU eviction,
+        * negative_ttl [int] - lifetime of negative entries in seconds.
+        """
+        if path is None:
+            path = os.path.join(EnvLocal().tmpdir, "edsm_checker_cache.sqlite")
+        for name, value in (
+            ("system_ttl", system_ttl),
+            ("bodies_ttl", bodies_ttl),
+            ("max_entries", max_entries),
+            ("negative_ttl", negative_ttl),
+        ):
+            if not isinstance(value, int) or value < 1:
+                raise Raise.error(
+                    f"Positive int expected for '{name}', '{value}' received",
+                    ValueError,
+                    self._c_name,
+                    currentframe(),
+                )
+        self._set_data(key=_Keys.DB_PATH, value=path, set_default_type=str)
+        self._set_data(key=_Keys.TTL_SYSTEM, value=system_ttl, set_default_type=int)
+        self._set_data(key=_Keys.TTL_BODIES, value=bodies_ttl, set_default_type=int)
+        self._set_data(key=_Keys.MAX_ENTRIES, value=max_entries, set_default_type=int)
+        self._set_data(key=_Keys.TTL_NEGATIVE, value=negative_ttl, set_default_type=int)
+        self._set_data(key=_Keys.LOCK, value=Lock(), set_default_type=LockType)
+        self._set_data(
+            key=_Keys.DB,
+            value=self.__connect(path),
+            set_default_type=Optional[sqlite3.Connection],
+        )
+
+    def __connect(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema if needed."""
+        try:
+            db = sqlite3.connect(
+                path, timeout=5, check_same_thread=False, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            version: int = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS responses")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL, "
+                "negative INTEGER NOT NULL DEFAULT 0, "
+                "created REAL NOT NULL, "
+                "accessed REAL NOT NULL, "
+                "etag TEXT, "
+                "modified TEXT, "
+                "digest TEXT)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+            db.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            return db
+        except sqlite3.Error as ex:
+            print(f"EDSM cache disabled: {ex}")
+        return None
+
+    @property
+    def __db(self) -> Optional[sqlite3.Connection]:
+        return self._get_data(key=_Keys.DB)  # type: ignore
+
+    @property
+    def __lock(self) -> LockType:
+        return self._get_data(key=_Keys.LOCK)  # type: ignore
+
+    @property
+    def path(self) -> str:
+        """Returns database file path."""
+        return self._get_data(key=_Keys.DB_PATH)  # type: ignore
+
+    @property
+    def system_ttl(self) -> int:
+        """Returns lifetime of system metadata entries in seconds."""
+        return self._get_data(key=_Keys.TTL_SYSTEM)  # type: ignore
+
+    @property
+    def bodies_ttl(self) -> int:
+        """Returns lifetime of bodies entries in seconds."""
+        return self._get_data(key=_Keys.TTL_BODIES)  # type: ignore
+
+    @property
+    def negative_ttl(self) -> int:
+        """Returns lifetime of negative entries in seconds."""
+        return self._get_data(key=_Keys.TTL_NEGATIVE)  # type: ignore
+
+    @property
+    def max_entries(self) -> int:
+        """Returns size cap of the cache."""
+        return self._get_data(key=_Keys.MAX_ENTRIES)  # type: ignore
+
+    @staticmethod
+    def normalize(url: str) -> str:
+        """Returns normalised form of the url used as a cache key.
+
+        Scheme, host and system names are lowercased and query parameters
+        are sorted, so equivalent requests share one entry.
+        """
+        parts = urlsplit(url)
+        query: str = urlencode(
+            sorted(
+                (key, value.lower() if key.startswith(EdsmKeys.SYSTEM_NAME) else value)
+                for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            )
+        )
+        return urlunsplit(
+            (
+                parts.scheme.lower(),
+                parts.netloc.lower(),
+                parts.path,
+                query,
+                parts.fragment,
+            )
+        )
+
+    def ttl(self, url: str) -> int:
+        """Returns lifetime in seconds for entries of given url."""
+        if urlsplit(url).path.rstrip("/").endswith("/bodies"):
+            return self.bodies_ttl
+        return self.system_ttl
+
+    def __row(self, key: str) -> Optional[Any]:
+        """Returns valid database row for key.
+
+        Expired negative entries are removed, expired data entries are
+        left for revalidation.
+        """
+        row = self.__db.execute(  # type: ignore
+            "SELECT data, negative, created FROM responses WHERE url=?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1]:
+            if time.time() - row[2] > self.negative_ttl:
+                self.__db.execute("DELETE FROM responses WHERE url=?", (key,))  # type: ignore
+                return None
+        elif time.time() - row[2] > self.ttl(key):
+            return None
+        return row
+
+    def get(self, url: str) -> Optional[Any]:
+        """Returns cached data for url or None if missing or expired."""
+        if self.__db is None or not url:
+            return None
+        key: str = self.normalize(url)
+        try:
+            with self.__lock:
+                row = self.__row(key)
+                if row is None or row[1]:
+                    return None
+                self.__db.execute(
+                    "UPDATE responses SET accessed=? WHERE url=?", (time.time(), key)
+                )
+            return JsonDecoder.loads(row[0])
+        except (sqlite3.Error, ValueError) as ex:
+            print(f"EDSM cache read error: {ex}")
+        return None
+
+    def is_negative(self, url: str) -> bool:
+        """Checks if url has a valid negative entry."""
+        if self.__db is None or not url:
+            return False
+        key: str = self.normalize(url)
+        try:
+            with self.__lock:
+                row = self.__row(key)
+                if row is None or not row[1]:
+                    return False
+                self.__db.execute(
+                    "UPDATE responses SET accessed=? WHERE url=?", (time.time(), key)
+                )
+                return True
+        except sqlite3.Error as ex:
+            print(f"EDSM cache read error: {ex}")
+        return False
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Returns validators of data entry for url, expired or not.
+
+        Keys are 'etag', 'modified' and 'digest', missing values are skipped.
+        """
+        if self.__db is None or not url:
+            return {}
+        try:
+            with self.__lock:
+                row = self.__db.execute(
+                    "SELECT etag, modified, digest FROM responses "
+                    "WHERE url=? AND negative=0",
+                    (self.normalize(url),),
+                ).fetchone()
+        except sqlite3.Error as ex:
+            print(f"EDSM cache read error: {ex}")
+            return {}
+        if row is None:
+            return {}
+        return {
+            name: value
+            for name, value in zip(("etag", "modified", "digest"), row)
+            if value
+        }
+
+    def refresh(self, url: str) -> Optional[Any]:
+        """Renews lifetime of data entry for url, returns its data.
+
+        Used when the server confirms that the entry is unchanged.
+        """
+        if self.__db is None or not url:
+            return None
+        key: str = self.normalize(url)
+        now: float = time.time()
+        try:
+            with self.__lock:
+                row = self.__db.execute(
+                    "SELECT data FROM responses WHERE url=? AND negative=0", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                self.__db.execute(
+                    "UPDATE responses SET created=?, accessed=? WHERE url=?",
+                    (now, now, key),
+                )
+            return JsonDecoder.loads(row[0])
+        except (sqlite3.Error, ValueError) as ex:
+            print(f"EDSM cache write error: {ex}")
+        return None
+
+    def __store(
+        self,
+        url: str,
+        data: Any,
+        negative: bool,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Stores entry for url and evicts least recently used entries."""
+        if self.__db is None or not url:
+            return None
+        key: str = self.normalize(url)
+        now: float = time.time()
+        try:
+            payload: str = json.dumps(data, separators=(",", ":"))
+            if validators is None:
+                validators = {}
+            with self.__lock:
+                self.__db.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, data, negative, created, accessed, etag, modified, digest) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        payload,
+                        int(negative),
+                        now,
+                        now,
+                        validators.get("etag"),
+                        validators.get("modified"),
+                        validators.get("digest"),
+                    ),
+                )
+                count: int = self.__db.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+                if count > self.max_entries:
+                    self.__db.execute(
+                        "DELETE FROM responses WHERE url IN ("
+                        "SELECT url FROM responses ORDER BY accessed LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+        except (sqlite3.Error, TypeError, ValueError) as ex:
+            print(f"EDSM cache write error: {ex}")
+
+    def put(
+        self, url: str, data: Any, validators: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Stores data for url and evicts least recently used entries.
+
+        ### Arguments:
+        * url [str] - request url,
+        * data [Any] - decoded response,
+        * validators [Optional[Dict[str, str]]] - 'etag', 'modified' and
+          'digest' values for later revalidation.
+        """
+        self.__store(url, data, False, validators)
+
+    def put_negative(self, url: str) -> None:
+        """Marks url as an unknown system for negative_ttl seconds."""
+        self.__store(url, None, True)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        if self.__db is None:
+            return None
+        try:
+            with self.__lock:
+                self.__db.execute("DELETE FROM responses")
+        except sqlite3.Error as ex:
+            print(f"EDSM cache clear error: {ex}")
+
+    def close(self) -> None:
+        """Closes database connection."""
+        if self.__db is not None:
+            with self.__lock:
+                self.__db.close()
+                self._set_data(key=_Keys.DB, value=None)
+
+
+class LocalSystemsStore(BData):
+    """LocalSystemsStore.
+
+    Local systems database built from the EDSM nightly dumps.
+    Names and ids are kept in a SQLite database indexed by id64 and
+    lowercased name. Coordinates are kept in a flat file of doubles,
+    three per row, mapped into memory, so lookups need no network access
+    and route algorithms can scan millions of positions.
+    """
+
+    SCHEMA_VERSION: int = 1
+    # system fields of the lookup() answer
+    FIELDS: frozenset = frozenset(
+        (EdsmKeys.NAME, EdsmKeys.ID, EdsmKeys.ID64, EdsmKeys.COORDS)
+    )
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """Create store object.
+
+        ### Arguments:
+        * path [Optional[str]] - database file, default in EnvLocal().tmpdir,
+          coordinates are kept next to it in a '.coords' file.
+        """
+        if path is None:
+            path = os.path.join(EnvLocal().tmpdir, "edsm_checker_systems.sqlite")
+        self._set_data(key=_Keys.DB_PATH, value=path, set_default_type=str)
+        self._set_data(key=_Keys.LOCK, value=Lock(), set_default_type=LockType)
+        self._set_data(
+            key=_Keys.COORDS_MAP, value=None, set_default_type=Optional[mmap.mmap]
+        )
+        self._set_data(
+            key=_Keys.COORDS, value=None, set_default_type=Optional[memoryview]
+        )
+        self._set_data(
+            key=_Keys.DB,
+            value=self.__connect(path),
+            set_default_type=Optional[sqlite3.Connection],
+        )
+        self.__remap()
+
+    def __connect(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the database and create the schema if needed."""
+        try:
+            db = sqlite3.connect(
+                path, timeout=5, check_same_thread=False, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            version: int = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS systems")
+                if os.path.exists(f"{path}.coords"):
+                    os.remove(f"{path}.coords")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS systems ("
+                "id64 INTEGER PRIMARY KEY, "
+                "id INTEGER, "
+                "name TEXT NOT NULL, "
+                "name_lc TEXT NOT NULL, "
+                "idx INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS systems_name ON systems (name_lc)")
+            db.execute("CREATE INDEX IF NOT EXISTS systems_idx ON systems (idx)")
+            db.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            return db
+        except (sqlite3.Error, OSError) as ex:
+            print(f"EDSM local store disabled: {ex}")
+        return None
+
+    def __remap(self) -> None:
+        """Maps the coordinates file into memory."""
+        self.__unmap()
+        if not os.path.exists(self.coords_path):
+            return None
+        # incomplete trailing row is ignored
+        size: int = os.path.getsize(self.coords_path)
+        size -= size % (3 * 8)
+        if size == 0:
+            return None
+        with open(self.coords_path, "rb") as file:
+            coords_map = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+        self._set_data(key=_Keys.COORDS_MAP, value=coords_map)
+        self._set_data(key=_Keys.COORDS, value=memoryview(coords_map).cast("d"))
+
+    @property
+    def __db(self) -> Optional[sqlite3.Connection]:
+        return self._get_data(key=_Keys.DB)  # type: ignore
+
+    @property
+    def __lock(self) -> LockType:
+        return self._get_data(key=_Keys.LOCK)  # type: ignore
+
+    @property
+    def __coords(self) -> Optional[memoryview]:
+        return self._get_data(key=_Keys.COORDS)  # type: ignore
+
+    @property
+    def path(self) -> str:
+        """Returns database file path."""
+        return self._get_data(key=_Keys.DB_PATH)  # type: ignore
+
+    @property
+    def coords_path(self) -> str:
+        """Returns coordinates file path."""
+        return f"{self.path}.coords"
+
+    @property
+    def coordinates(self) -> Optional[memoryview]:
+        """Returns flat view of coordinates, x, y, z for each row."""
+        return self.__coords
+
+    @property
+    def count(self) -> int:
+        """Returns number of systems in the store."""
+        if self.__db is None:
+            return 0
+        try:
+            with self.__lock:
+                return self.__db.execute("SELECT COUNT(*) FROM systems").fetchone()[0]
+        except sqlite3.Error as ex:
+            print(f"EDSM local store read error: {ex}")
+        return 0
+
+    def position(self, idx: int) -> Tuple[float, float, float]:
+        """Returns coordinates of row idx."""
+        coords: Optional[memoryview] = self.__coords
+        if coords is None or idx < 0 or 3 * idx + 2 >= len(coords):
+            raise Raise.error(
+                f"Row index out of range: '{idx}'",
+                IndexError,
+                self._c_name,
+                currentframe(),
+            )
+        return (coords[3 * idx], coords[3 * idx + 1], coords[3 * idx + 2])
+
+    def lookup(
+        self, name: Optional[str] = None, id64: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Returns system data in EDSM API format or None if not found.
+
+        The id64 is checked first, the lowercased name is used otherwise.
+        """
+        if self.__db is None or (not name and id64 is None):
+            return None
+        try:
+            with self.__lock:
+                row = None
+                if id64 is not None:
+                    row = self.__db.execute(
+                        "SELECT id64, id, name, idx FROM systems WHERE id64=?",
+                        (id64,),
+                    ).fetchone()
+                if row is None and name:
+                    row = self.__db.execute(
+                        "SELECT id64, id, name, idx FROM systems WHERE name_lc=?",
+                        (name.lower(),),
+                    ).fetchone()
+        except sqlite3.Error as ex:
+            print(f"EDSM local store read error: {ex}")
+            return None
+        return self.__format(row)
+
+    def row(self, idx: int) -> Optional[Dict[str, Any]]:
+        """Returns system data in EDSM API format for coordinates row idx.
+
+        Rows left unused by replaced systems return None.
+        """
+        if self.__db is None:
+            return None
+        try:
+            with self.__lock:
+                row = self.__db.execute(
+                    "SELECT id64, id, name, idx FROM systems WHERE idx=?", (idx,)
+                ).fetchone()
+        except sqlite3.Error as ex:
+            print(f"EDSM local store read error: {ex}")
+            return None
+        return self.__format(row)
+
+    def __format(self, row: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        """Returns database row converted to EDSM API format."""
+        if row is None:
+            return None
+        out: Dict[str, Any] = {
+            EdsmKeys.NAME: row[2],
+            EdsmKeys.ID: row[1],
+            EdsmKeys.ID64: row[0],
+        }
+        try:
+            x, y, z = self.position(row[3])
+            out[EdsmKeys.COORDS] = {EdsmKeys.X: x, EdsmKeys.Y: y, EdsmKeys.Z: z}
+        except IndexError:
+            pass
+        return out
+
+    def spatial_index(self, cell_size: float = 50.0) -> Optional[SpatialIndex]:
+        """Returns spatial index over stored coordinates or None if empty.
+
+        The index keeps its own view of the mapping, so it stays valid
+        after the next import; build a new one to see the new systems.
+        """
+        if self.__coords is None:
+            return None
+        return SpatialIndex(self.__coords[:], cell_size, self.row)
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Adds systems in EDSM dump format, returns number of added rows.
+
+        Records without id64, name or coordinates are skipped.
+        Existing systems are replaced, their old coordinates rows are
+        left unused until the next full import.
+        """
+        if self.__db is None:
+            return 0
+        rows: List[Tuple[int, Optional[int], str, str, int]] = []
+        coords: array = array("d")
+        with self.__lock:
+            try:
+                idx: int = (
+                    os.path.getsize(self.coords_path) // (3 * 8)
+                    if os.path.exists(self.coords_path)
+                    else 0
+                )
+                for record in records:
+                    name: Optional[str] = record.get(EdsmKeys.NAME)
+                    pos: Optional[Dict] = record.get(EdsmKeys.COORDS)
+                    if record.get(EdsmKeys.ID64) is None or not name or not pos:
+                        continue
+                    coords.extend(
+                        (
+                            float(pos[EdsmKeys.X]),
+                            float(pos[EdsmKeys.Y]),
+                            float(pos[EdsmKeys.Z]),
+                        )
+                    )
+                    rows.append(
+                        (
+                            int(record[EdsmKeys.ID64]),
+                            record.get(EdsmKeys.ID),
+                            name,
+                            name.lower(),
+                            idx + len(rows),
+                        )
+                    )
+                if not rows:
+                    return 0
+                with open(self.coords_path, "ab") as file:
+                    coords.tofile(file)
+                self.__db.execute("BEGIN")
+                self.__db.executemany(
+                    "INSERT OR REPLACE INTO systems (id64, id, name, name_lc, idx) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self.__db.execute("COMMIT")
+            except (sqlite3.Error, OSError, KeyError, TypeError, ValueError) as ex:
+                if self.__db.in_transaction:
+                    self.__db.execute("ROLLBACK")
+                print(f"EDSM local store write error: {ex}")
+                return 0
+            finally:
+                self.__remap()
+        return len(rows)
+
+    def clear(self) -> None:
+        """Removes all systems."""
+        if self.__db is None:
+            return None
+        with self.__lock:
+            try:
+                self.__db.execute("DELETE FROM systems")
+                if os.path.exists(self.coords_path):
+                    os.remove(self.coords_path)
+            except (sqlite3.Error, OSError) as ex:
+                print(f"EDSM local store clear error: {ex}")
+            self.__remap()
+
+    def close(self) -> None:
+        """Closes database connection and coordinates mapping."""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self._set_data(key=_Keys.DB, value=None)
+            self.__unmap()
+
+    def __unmap(self) -> None:
+        """Releases coordinates mapping.
+
+        A mapping still exported to the caller is left to the garbage
+        collector.
+        """
+        coords_map: Optional[mmap.mmap] = self._get_data(key=_Keys.COORDS_MAP)
+        try:
+            if self.__coords is not None:
+                self.__coords.release()
+            if coords_map is not None:
+                coords_map.close()
+        except BufferError:
+            pass
+        self._set_data(key=_Keys.COORDS, value=None)
+        self._set_data(key=_Keys.COORDS_MAP, value=None)
+
+
+class BodiesSummaryDecoder(BClasses):
+    """BodiesSummaryDecoder.
+
+    Incremental decoder for the api-system-v1/bodies response.
+    The top-level scalar fields are decoded as usual, but elements of the
+    'bodies' list are decoded one by one and only counted, so the full
+    object graph is never built and the payload is never buffered whole.
+    The 'bodies' key of the result holds the number of bodies.
+    """
+
+    __WS = re.compile(r"[ \t\n\r]*")
+    __SEP = re.compile(r"[ \t\n\r]*(?:,[ \t\n\r]*)?")
+    # characters that may continue a number cut at the end of a chunk
+    __NUMBER_TAIL = frozenset("0123456789+-.eE")
+
+    __decoder: json.JSONDecoder = None  # type: ignore
+    __scan: Any = None
+    __chunks: Iterator[str] = None  # type: ignore
+    __buf: str = None  # type: ignore
+    __pos: int = None  # type: ignore
+    __eof: bool = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Create decoder object."""
+        self.__decoder = json.JSONDecoder()
+        self.__scan = make_scanner(self.__decoder)
+        self.__chunks = iter(())
+        self.__buf = ""
+        self.__pos = 0
+        self.__eof = False
+
+    def __more(self) -> bool:
+        """Append next chunk to the buffer, returns False at the end of data."""
+        for chunk in self.__chunks:
+            if chunk:
+                self.__buf = self.__buf[self.__pos :] + chunk
+                self.__pos = 0
+                return True
+        self.__eof = True
+        return False
+
+    def __peek(self) -> str:
+        """Skip whitespaces and return the next character or ''."""
+        while True:
+            match = self.__WS.match(self.__buf, self.__pos)
+            self.__pos = match.end() if match else self.__pos
+            if self.__pos < len(self.__buf):
+                return self.__buf[self.__pos]
+            if not self.__more():
+                return ""
+
+    def __expect(self, char: str) -> None:
+        """Consume the expected structural character."""
+        if self.__peek() != char:
+            raise ValueError(
+                f"'{char}' expected at position {self.__pos} of the response"
+            )
+        self.__pos += 1
+
+    def __value(self) -> Any:
+        """Decode the next complete JSON value from the stream."""
+        self.__peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buf, self.__pos)
+            except json.JSONDecodeError:
+                if self.__eof or not self.__more():
+                    raise
+                continue
+            # a number cut by the chunk boundary may continue in the next chunk
+            if (
+                self.__is_cut(value, self.__buf, end)
+                and not self.__eof
+                and self.__more()
+            ):
+                continue
+            self.__pos = end
+            return value
+
+    def __is_cut(self, value: Any, buf: str, end: int) -> bool:
+        """Check if value decoded up to end may be incomplete."""
+        if end == len(buf):
+            return True
+        return type(value) in (int, float) and buf[end] in self.__NUMBER_TAIL
+
+    def __count(self) -> int:
+        """Count elements of the list, stops before the closing bracket.
+
+        Hot loop of the decoder, elements are scanned with the C scanner
+        of the json module and dropped at once.
+        """
+        scan = self.__scan
+        sep = self.__SEP
+        is_cut = self.__is_cut
+        count: int = 0
+        while True:
+            buf: str = self.__buf
+            pos: int = sep.match(buf, self.__pos).end()  # type: ignore
+            while pos < len(buf) and buf[pos] != "]":
+                try:
+                    value, end = scan(buf, pos)
+                except (StopIteration, json.JSONDecodeError):
+                    break
+                if is_cut(value, buf, end):
+                    break
+                count += 1
+                pos = sep.match(buf, end).end()  # type: ignore
+            self.__pos = pos
+            if pos < len(buf) and buf[pos] == "]":
+                return count
+            if self.__eof or not self.__more():
+                if pos < len(self.__buf):
+                    # the last element fills the buffer up to the end of data
+                    self.__value()
+                    count += 1
+                    continue
+                raise ValueError("Unterminated bodies list in the response")
+
+    def decode(self, chunks: Iterable[str]) -> Any:
+        """Returns bodies summary decoded from iterable of text chunks."""
+        self.__chunks = iter(chunks)
+        self.__buf = ""
+        self.__pos = 0
+        self.__eof = False
+
+        if self.__peek() != "{":
+            # unknown system, EDSM returns an empty list
+            return self.__value()
+        self.__expect("{")
+        out: Dict[str, Any] = {}
+        while self.__peek() != "}":
+            key: str = self.__value()
+            self.__expect(":")
+            if key == EdsmKeys.BODIES and self.__peek() == "[":
+                self.__expect("[")
+                out[key] = self.__count()
+                self.__expect("]")
+            else:
+                out[key] = self.__value()
+            if self.__peek() == ",":
+                self.__pos += 1
+        self.__expect("}")
+        return out
+
+
+class Priority(object, metaclass=ReadOnlyClass):
+    """Request priority lanes, the lower value is served first."""
+
+    FOREGROUND: int = 0
+    PREFETCH: int = 1
+    SCAN: int = 2
+
+
+class RateLimiter(BClasses):
+    """RateLimiter.
+
+    Token bucket request scheduler shared by all Url and AsyncUrl instances.
+    Waiting requests are served by priority lane, a lower lane gets
+    a token only when no request of a higher lane is waiting.
+    """
+
+    # longest sleep of acquire_async between abort checks, in seconds
+    POLL: float = 0.05
+
+    __shared: Optional["RateLimiter"] = None
+    __shared_lock: Lock = Lock()
+
+    __cond: Condition = None  # type: ignore
+    __rate: float = None  # type: ignore
+    __burst: float = None  # type: ignore
+    __tokens: float = None  # type: ignore
+    __stamp: float = None  # type: ignore
+    __waiting: List[int] = None  # type: ignore
+    __metrics: List[List[float]] = None  # type: ignore
+
+    def __init__(self, rate: float = 1.0, burst: int = 10) -> None:
+        """Create limiter object.
+
+        ### Arguments:
+        * rate [float] - number of requests per second in the long run,
+        * burst [int] - number of requests allowed at once.
+        """
+        self.__cond = Condition()
+        self.__waiting = [0, 0, 0]
+        # requests, total wait, max wait
+        self.__metrics = [[0, 0.0, 0.0] for _ in range(3)]
+        self.configure(rate, burst)
+        self.__tokens = self.__burst
+
+    @classmethod
+    def shared(cls) -> "RateLimiter":
+        """Returns process-wide limiter instance."""
+        with cls.__shared_lock:
+            if cls.__shared is None:
+                cls.__shared = cls()
+            return cls.__shared
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Set rate in requests per second and bucket size."""
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise Raise.error(
+                f"Positive number expected for rate, '{rate}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(burst, int) or burst < 1:
+            raise Raise.error(
+                f"Positive int expected for burst, '{burst}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        with self.__cond:
+            self.__rate = float(rate)
+            self.__burst = float(burst)
+            self.__stamp = time.monotonic()
+            if self.__tokens is not None:
+                self.__tokens = min(self.__tokens, self.__burst)
+            self.__cond.notify_all()
+
+    @property
+    def rate(self) -> float:
+        """Returns number of requests per second in the long run."""
+        return self.__rate
+
+    @property
+    def burst(self) -> int:
+        """Returns number of requests allowed at once."""
+        return int(self.__burst)
+
+    def __refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        now: float = time.monotonic()
+        self.__tokens = min(
+            self.__burst, self.__tokens + (now - self.__stamp) * self.__rate
+        )
+        self.__stamp = now
+
+    def acquire(
+        self, priority: int = Priority.FOREGROUND, abort: Optional[Event] = None
+    ) -> float:
+        """Wait for a request token, returns time spent waiting in seconds.
+
+        Raises InterruptedError if the abort event is set, call wake()
+        after setting it to end the wait at once.
+        """
+        lane: int = min(max(int(priority), Priority.FOREGROUND), Priority.SCAN)
+        start: float = time.monotonic()
+        with self.__cond:
+            self.__waiting[lane] += 1
+            try:
+                while True:
+                    if abort is not None and abort.is_set():
+                        raise Raise.error(
+                            "Request aborted",
+                            InterruptedError,
+                            self._c_name,
+                            currentframe(),
+                        )
+                    self.__refill()
+                    if self.__tokens >= 1.0 and not any(self.__waiting[:lane]):
+                        self.__tokens -= 1.0
+                        break
+                    timeout: Optional[float] = None
+                    if self.__tokens < 1.0:
+                        timeout = (1.0 - self.__tokens) / self.__rate
+                    self.__cond.wait(timeout)
+            finally:
+                self.__waiting[lane] -= 1
+                self.__cond.notify_all()
+            wait: float = self.__record(lane, start)
+        return wait
+
+    async def acquire_async(
+        self, priority: int = Priority.FOREGROUND, abort: Optional[Event] = None
+    ) -> float:
+        """Coroutine variant of acquire, returns time spent waiting in seconds.
+
+        The wait does not hold a thread, the coroutine sleeps on its event
+        loop until the next token is due, checking the abort event at least
+        every POLL seconds. Raises InterruptedError if the abort event is set.
+        """
+        lane: int = min(max(int(priority), Priority.FOREGROUND), Priority.SCAN)
+        start: float = time.monotonic()
+        with self.__cond:
+            self.__waiting[lane] += 1
+        try:
+            while True:
+                if abort is not None and abort.is_set():
+                    raise Raise.error(
+                        "Request aborted",
+                        InterruptedError,
+                        self._c_name,
+                        currentframe(),
+                    )
+                with self.__cond:
+                    self.__refill()
+                    if self.__tokens >= 1.0 and not any(self.__waiting[:lane]):
+                        self.__tokens -= 1.0
+                        break
+                    delay: float = self.POLL
+                    if self.__tokens < 1.0:
+                        delay = min(delay, (1.0 - self.__tokens) / self.__rate)
+                await asyncio.sleep(delay)
+        finally:
+            with self.__cond:
+                self.__waiting[lane] -= 1
+                self.__cond.notify_all()
+        with self.__cond:
+            wait: float = self.__record(lane, start)
+        return wait
+
+    def __record(self, lane: int, start: float) -> float:
+        """Adds wait since start to the lane metrics, returns the wait.
+
+        Must be called with the condition held.
+        """
+        wait: float = time.monotonic() - start
+        metrics: List[float] = self.__metrics[lane]
+        metrics[0] += 1
+        metrics[1] += wait
+        metrics[2] = max(metrics[2], wait)
+        return wait
+
+    def wake(self) -> None:
+        """Wake up waiting requests, so they check their abort events."""
+        with self.__cond:
+            self.__cond.notify_all()
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Returns queue wait statistics for each priority lane."""
+        out: Dict[str, Dict[str, float]] = {}
+        with self.__cond:
+            for name, lane in (
+                ("foreground", Priority.FOREGROUND),
+                ("prefetch", Priority.PREFETCH),
+                ("scan", Priority.SCAN),
+            ):
+                count, total, maximum = self.__metrics[lane]
+                out[name] = {
+                    "requests": count,
+                    "wait_total": total,
+                    "wait_avg": total / count if count else 0.0,
+                    "wait_max": maximum,
+                }
+        return out
+
+
+class FieldsProfile(BClasses):
+    """FieldsProfile.
+
+    Declarative set of EDSM fields needed by a consumer of Url.
+    The show* flags of the api-v1 endpoints are derived from it, as well
+    as whether the system and the bodies endpoints are queried at all
+    and whether the bodies list is reduced to a count.
+
+    EDSM has no lighter endpoint returning the number of bodies,
+    api-system-v1/estimated-value lists the valuable bodies only, so
+    counts are always taken from api-system-v1/bodies.
+    """
+
+    # system fields -> show* flag of api-v1 endpoints returning them
+    SYSTEM_FLAGS: Dict[str, str] = {
+        EdsmKeys.ID: EdsmKeys.SHOW_ID,
+        EdsmKeys.ID64: EdsmKeys.SHOW_ID,
+        EdsmKeys.COORDS: EdsmKeys.SHOW_COORDINATES,
+        EdsmKeys.COORDS_LOCKED: EdsmKeys.SHOW_COORDINATES,
+        EdsmKeys.REQUIRE_PERMIT: EdsmKeys.SHOW_PERMIT,
+        EdsmKeys.PERMIT_NAME: EdsmKeys.SHOW_PERMIT,
+        EdsmKeys.INFORMATION: EdsmKeys.SHOW_INFORMATION,
+        EdsmKeys.PRIMARY_STAR: EdsmKeys.SHOW_PRIMARY_STAR,
+    }
+    # fields returned by api-system-v1/bodies only
+    BODIES_FIELDS: Tuple[str, ...] = (EdsmKeys.BODIES, EdsmKeys.BODY_COUNT)
+
+    __fields: frozenset = None  # type: ignore
+    __body_fields: Tuple[str, ...] = None  # type: ignore
+
+    def __init__(self, fields: Iterable[str], body_fields: Iterable[str] = ()) -> None:
+        """Create profile object.
+
+        ### Arguments:
+        * fields [Iterable[str]] - EdsmKeys of the system and bodies
+          responses, EdsmKeys.BODIES stands for the number of bodies,
+        * body_fields [Iterable[str]] - EdsmKeys needed from each element
+          of the bodies list, if empty the list is only counted.
+        """
+        if isinstance(fields, str) or isinstance(body_fields, str):
+            raise Raise.error(
+                "Iterable of EdsmKeys expected, str received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__fields = frozenset(fields)
+        self.__body_fields = tuple(sorted(set(body_fields)))
+        if self.__body_fields:
+            self.__fields |= {EdsmKeys.BODIES}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self._c_name}(fields={sorted(self.__fields)}, "
+            f"body_fields={list(self.__body_fields)})"
+        )
+
+    @classmethod
+    def full(cls) -> "FieldsProfile":
+        """Returns profile of system identifiers, coordinates, permit
+        and the number of bodies."""
+        return cls(
+            (
+                EdsmKeys.ID,
+                EdsmKeys.ID64,
+                EdsmKeys.COORDS,
+                EdsmKeys.COORDS_LOCKED,
+                EdsmKeys.REQUIRE_PERMIT,
+                EdsmKeys.PERMIT_NAME,
+                EdsmKeys.BODIES,
+                EdsmKeys.BODY_COUNT,
+            )
+        )
+
+    @classmethod
+    def status(cls) -> "FieldsProfile":
+        """Returns profile of the fields shown in the plugin status line."""
+        return cls(
+            (
+                EdsmKeys.COORDS_LOCKED,
+                EdsmKeys.REQUIRE_PERMIT,
+                EdsmKeys.BODIES,
+                EdsmKeys.BODY_COUNT,
+            )
+        )
+
+    @property
+    def fields(self) -> frozenset:
+        """Returns needed fields."""
+        return self.__fields
+
+    @property
+    def system_fields(self) -> frozenset:
+        """Returns needed fields of the api-v1/system response."""
+        return self.__fields.difference(self.BODIES_FIELDS)
+
+    @property
+    def body_fields(self) -> Tuple[str, ...]:
+        """Returns fields needed from each body."""
+        return self.__body_fields
+
+    @property
+    def options(self) -> Dict[str, int]:
+        """Returns show* flags of api-v1 endpoints, sorted by name."""
+        return {
+            flag: 1
+            for flag in sorted(
+                {
+                    self.SYSTEM_FLAGS[field]
+                    for field in self.__fields
+                    if field in self.SYSTEM_FLAGS
+                }
+            )
+        }
+
+    @property
+    def system(self) -> bool:
+        """Checks if api-v1/system has to be queried.
+
+        It is needed for any show* flag, or if the bodies endpoint is not
+        queried at all. Otherwise api-system-v1/bodies alone is enough,
+        it returns the name and ids too, and its empty answer tells
+        that the system is unknown.
+        """
+        return bool(self.options) or not self.bodies
+
+    @property
+    def bodies(self) -> bool:
+        """Checks if api-system-v1/bodies has to be queried."""
+        return any(field in self.__fields for field in self.BODIES_FIELDS)
+
+    @property
+    def summary(self) -> bool:
+        """Checks if the bodies list can be reduced to its length."""
+        return not self.__body_fields
+
+    def reduce(self, data: Any) -> Any:
+        """Returns bodies response with elements limited to body_fields.
+
+        For the summary profile the list is replaced with its length.
+        """
+        if not isinstance(data, Dict) or not isinstance(
+            data.get(EdsmKeys.BODIES), List
+        ):
+            return data
+        if self.summary:
+            data[EdsmKeys.BODIES] = len(data[EdsmKeys.BODIES])
+            return data
+        keys: Tuple[str, ...] = self.__body_fields
+        data[EdsmKeys.BODIES] = [
+            {key: body[key] for key in keys if key in body}
+            for body in data[EdsmKeys.BODIES]
+            if isinstance(body, Dict)
+        ]
+        return data
 
 
 class Url(BData):
@@ -38,26 +1281,198 @@ class Url(BData):
     Class for serving HTTP/HTTPS requests.
     """
 
-    def __init__(self) -> None:
-        """Create Url helper object."""
-        self.__options = {
-            EdsmKeys.SHOW_ID: 1,
-            EdsmKeys.SHOW_PERMIT: 1,
-            EdsmKeys.SHOW_COORDINATES: 1,
-            EdsmKeys.SHOW_INFORMATION: 0,
-            EdsmKeys.SHOW_PRIMARY_STAR: 0,
-            EdsmKeys.INCLUDE_HIDDEN: 0,
-        }
+    # answers retried by Url requests
+    RETRY_STATUS: frozenset = frozenset((429, 500, 502, 503, 504))
+    # Content-Length above which a bodies summary is decoded while streaming,
+    # BodiesSummaryDecoder bounds memory but is slower than a whole decode
+    STREAM_LENGTH: int = 4 << 20
+    # JsonDecoder backends replaced by streaming, orjson and ujson are
+    # faster than the stdlib scanner of BodiesSummaryDecoder at any size
+    STREAM_BACKENDS: frozenset = frozenset(("json",))
+
+    def __init__(
+        self,
+        cache: Optional[EdsmCache] = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 4,
+        priority: int = Priority.FOREGROUND,
+        local_store: Optional[LocalSystemsStore] = None,
+        spatial_index: Optional[SpatialIndex] = None,
+        base_url: str = "https://www.edsm.net/",
+        metrics: Optional[Metrics] = None,
+        fields: Optional[FieldsProfile] = None,
+    ) -> None:
+        """Create Url helper object.
+
+        ### Arguments:
+        * cache [Optional[EdsmCache]] - optional persistent response cache,
+        * retries [int] - number of retries for failed or throttled requests,
+        * backoff [float] - exponential backoff factor between retries,
+        * pool_size [int] - number of keep-alive connections per host,
+        * priority [int] - default Priority lane of the requests,
+        * local_store [Optional[LocalSystemsStore]] - offline systems database
+          consulted before the cache and the API,
+        * spatial_index [Optional[SpatialIndex]] - local index answering
+          neighbourhood queries instead of the API,
+        * base_url [str] - EDSM server address, for tests and benchmarks,
+        * metrics [Optional[Metrics]] - registry for request counters
+          and timings,
+        * fields [Optional[FieldsProfile]] - fields needed from the API,
+          FieldsProfile.full() if None.
+        """
         self._set_data(
-            key=_Keys.SYSTEMS_URL,
-            value="https://www.edsm.net/api-v1/",
-            set_default_type=str,
+            key=_Keys.CACHE, value=cache, set_default_type=Optional[EdsmCache]
         )
         self._set_data(
-            key=_Keys.SYSTEM_URL,
-            value="https://www.edsm.net/api-system-v1/",
-            set_default_type=str,
+            key=_Keys.SESSION,
+            value=self.__create_session(retries, backoff, pool_size),
+            set_default_type=requests.Session,
         )
+        self._set_data(key=_Keys.RETRIES, value=retries, set_default_type=int)
+        self._set_data(key=_Keys.ABORT, value=Event(), set_default_type=Event)
+        self._set_data(key=_Keys.BACKOFF, value=float(backoff), set_default_type=float)
+        self._set_data(key=_Keys.PRIORITY, value=priority, set_default_type=int)
+        self._set_data(
+            key=_Keys.LOCAL_STORE,
+            value=local_store,
+            set_default_type=Optional[LocalSystemsStore],
+        )
+        self._set_data(
+            key=_Keys.SPATIAL,
+            value=spatial_index,
+            set_default_type=Optional[SpatialIndex],
+        )
+        self._set_data(
+            key=_Keys.METRICS, value=metrics, set_default_type=Optional[Metrics]
+        )
+        self.fields = fields if fields is not None else FieldsProfile.full()
+        self.base_url = base_url
+
+    def __create_session(
+        self, retries: int, backoff: float, pool_size: int
+    ) -> requests.Session:
+        """Returns pooled HTTP session.
+
+        The session does not retry, failed and throttled requests are
+        repeated by Url, so each attempt takes a RateLimiter token.
+        """
+        if not isinstance(retries, int) or retries < 0:
+            raise Raise.error(
+                f"Non-negative int expected for retries, '{retries}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(backoff, (int, float)) or backoff < 0:
+            raise Raise.error(
+                f"Non-negative number expected for backoff, '{backoff}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise Raise.error(
+                f"Positive int expected for pool_size, '{pool_size}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session = requests.Session()
+        session.headers.update(
+            {
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @property
+    def __session(self) -> requests.Session:
+        return self._get_data(key=_Keys.SESSION)  # type: ignore
+
+    @property
+    def retries(self) -> int:
+        """Returns number of retries for failed or throttled requests."""
+        return self._get_data(key=_Keys.RETRIES)  # type: ignore
+
+    @property
+    def backoff(self) -> float:
+        """Returns exponential backoff factor between retries."""
+        return self._get_data(key=_Keys.BACKOFF)  # type: ignore
+
+    @property
+    def cache(self) -> Optional[EdsmCache]:
+        """Returns response cache object, if set."""
+        return self._get_data(key=_Keys.CACHE)  # type: ignore
+
+    @property
+    def local_store(self) -> Optional[LocalSystemsStore]:
+        """Returns offline systems database, if set."""
+        return self._get_data(key=_Keys.LOCAL_STORE)  # type: ignore
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """Returns metrics registry, if set."""
+        return self._get_data(key=_Keys.METRICS)  # type: ignore
+
+    @metrics.setter
+    def metrics(self, value: Optional[Metrics]) -> None:
+        """Sets metrics registry."""
+        self._set_data(key=_Keys.METRICS, value=value)
+
+    def _count(self, name: str) -> None:
+        """Increments counter name if metrics are set."""
+        if self.metrics is not None:
+            self.metrics.increment(name)
+
+    def _observe(self, name: str, start: float) -> None:
+        """Records time elapsed since perf_counter start if metrics are set."""
+        if self.metrics is not None:
+            self.metrics.observe(name, time.perf_counter() - start)
+
+    @property
+    def spatial_index(self) -> Optional[SpatialIndex]:
+        """Returns local index for neighbourhood queries, if set."""
+        return self._get_data(key=_Keys.SPATIAL)  # type: ignore
+
+    @spatial_index.setter
+    def spatial_index(self, value: Optional[SpatialIndex]) -> None:
+        """Sets local index for neighbourhood queries."""
+        self._set_data(key=_Keys.SPATIAL, value=value)
+
+    @property
+    def priority(self) -> int:
+        """Returns default Priority lane of the requests."""
+        return self._get_data(key=_Keys.PRIORITY)  # type: ignore
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        """Sets default Priority lane of the requests."""
+        self._set_data(key=_Keys.PRIORITY, value=value)
+
+    def close(self) -> None:
+        """Closes pooled connections."""
+        self.__session.close()
+
+    def abort(self) -> None:
+        """Stops requests of the object, safe to call from any thread.
+
+        A wait for a RateLimiter token or between retries ends at once
+        and no further attempts are made, pooled connections are closed.
+        A request in progress ends within its timeout.
+        """
+        self.__abort.set()
+        RateLimiter.shared().wake()
+        self.close()
+
+    @property
+    def __abort(self) -> Event:
+        return self._get_data(key=_Keys.ABORT)  # type: ignore
 
     @property
     def __options(self) -> Dict:
@@ -70,6 +1485,54 @@ class Url(BData):
         else:
             self._set_data(key=_Keys.OPTIONS, value=value, set_default_type=Dict)
 
+    @property
+    def fields(self) -> FieldsProfile:
+        """Returns profile of the fields needed from the API."""
+        return self._get_data(key=_Keys.FIELDS)  # type: ignore
+
+    @fields.setter
+    def fields(self, value: FieldsProfile) -> None:
+        """Sets profile of the fields needed from the API.
+
+        The show* flags of the api-v1 urls follow the profile, so cache
+        entries are kept per profile.
+        """
+        if not isinstance(value, FieldsProfile):
+            raise Raise.error(
+                f"FieldsProfile type expected, '{type(value)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self._set_data(key=_Keys.FIELDS, value=value, set_default_type=FieldsProfile)
+        self.__options = value.options
+
+    @property
+    def base_url(self) -> str:
+        """Returns EDSM server address."""
+        if self.__systems_url is None:
+            return ""
+        return self.__systems_url[: -len("api-v1/")]
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        """Sets EDSM server address."""
+        if not isinstance(value, str) or not value.startswith(("http://", "https://")):
+            raise Raise.error(
+                f"http(s) address expected for base_url, '{value}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not value.endswith("/"):
+            value = f"{value}/"
+        self._set_data(
+            key=_Keys.SYSTEMS_URL, value=f"{value}api-v1/", set_default_type=str
+        )
+        self._set_data(
+            key=_Keys.SYSTEM_URL, value=f"{value}api-system-v1/", set_default_type=str
+        )
+
     @property
     def __system_url(self) -> str:
         return self._get_data(key=_Keys.SYSTEM_URL)  # type: ignore
@@ -127,13 +1590,7 @@ class Url(BData):
                 self._c_name,
                 currentframe(),
             )
-        if not isinstance(radius, int):
-            radius = 50
-        else:
-            if radius < 5:
-                radius = 5
-            elif radius > 100:
-                radius = 100
+        radius = clamp_radius(radius)
 
         if s_system.name:
             return requote_uri(
@@ -150,13 +1607,7 @@ class Url(BData):
                 self._c_name,
                 currentframe(),
             )
-        if not isinstance(size, int):
-            size = 100
-        else:
-            if size < 10:
-                size = 10
-            elif size > 200:
-                size = 200
+        size = clamp_size(size)
 
         if s_system.name:
             return requote_uri(
@@ -164,6 +1615,239 @@ class Url(BData):
             )
         return ""
 
+    def systems_url(self, s_systems: List[StarsSystem]) -> str:
+        """Returns proper API url for getting data of many systems at once."""
+        names: List[str] = []
+        for s_system in s_systems:
+            if not isinstance(s_system, StarsSystem):
+                raise Raise.error(
+                    f"StarsSystem type expected, '{type(s_system)}' received",
+                    TypeError,
+                    self._c_name,
+                    currentframe(),
+                )
+            if s_system.name:
+                names.append(f"systemName[]={s_system.name}")
+        if names:
+            return requote_uri(
+                f"{self.__systems_url}systems?{'&'.join(names)}{self.options}"
+            )
+        return ""
+
+    def _lane(self, url: str) -> int:
+        """Returns Priority lane for url.
+
+        Neighbourhood scans are scheduled in the lowest priority lane.
+        """
+        if "/sphere-systems" in url or "/cube-systems" in url:
+            return max(self.priority, Priority.SCAN)
+        return self.priority
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """Returns cache lookup result as a (hit, data) tuple.
+
+        A valid negative entry is a hit with None data.
+        """
+        if self.cache is not None:
+            cached: Optional[Any] = self.cache.get(key)
+            if cached:
+                self._count("cache.hit")
+                return True, cached
+            if self.cache.is_negative(key):
+                self._count("cache.negative")
+                return True, None
+            self._count("cache.miss")
+        return False, None
+
+    def _remember(
+        self,
+        key: str,
+        out: Optional[Any],
+        validators: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Stores request result in the cache.
+
+        EDSM returns an empty answer for unknown systems, it is stored
+        as a negative entry.
+        """
+        if self.cache is not None:
+            if out:
+                self.cache.put(key, out, validators)
+            elif out is not None:
+                self.cache.put_negative(key)
+
+    def _conditional_headers(self, key: str) -> Dict[str, str]:
+        """Returns revalidation headers for the cache entry of key."""
+        out: Dict[str, str] = {}
+        if self.cache is not None:
+            validators: Dict[str, str] = self.cache.validators(key)
+            if "etag" in validators:
+                out["If-None-Match"] = validators["etag"]
+            if "modified" in validators:
+                out["If-Modified-Since"] = validators["modified"]
+        return out
+
+    def _unchanged(self, key: str, digest: str) -> bool:
+        """Checks if payload digest matches the cache entry of key."""
+        if self.cache is None:
+            return False
+        return self.cache.validators(key).get("digest") == digest
+
+    @staticmethod
+    def _validators(headers: Any, digest: str) -> Dict[str, str]:
+        """Returns validators of response headers and payload digest."""
+        out: Dict[str, str] = {"digest": digest}
+        if headers.get("ETag"):
+            out["etag"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            out["modified"] = headers["Last-Modified"]
+        return out
+
+    @staticmethod
+    def _retry_after(headers: Any) -> Optional[float]:
+        """Returns delay in seconds from the Retry-After header, if set."""
+        value: Optional[str] = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def __get(
+        self, url: str, timeout: int, stream: bool, headers: Dict[str, str]
+    ) -> requests.Response:
+        """Returns response for url, retrying failed and throttled requests.
+
+        Connection errors, timeouts, HTTP 429 and 5xx answers are retried
+        with exponential backoff, HTTP 429 waits at least as long as
+        the Retry-After header asks. Every attempt takes a RateLimiter
+        token, so retries are throttled as any other request.
+        Raises InterruptedError after abort().
+        """
+        attempt: int = 0
+        while True:
+            wait: float = RateLimiter.shared().acquire(self._lane(url), self.__abort)
+            if self.metrics is not None:
+                self.metrics.observe("ratelimit.wait", wait)
+            delay: float = self.backoff * (2**attempt)
+            try:
+                response: requests.Response = self.__session.get(
+                    url, timeout=timeout, stream=stream, headers=headers
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in self.RETRY_STATUS
+                    or attempt >= self.retries
+                ):
+                    return response
+                self._count(f"http.{response.status_code}")
+                if response.status_code == 429:
+                    delay = max(delay, self._retry_after(response.headers) or 0.0)
+                response.close()
+            self._count("http.retry")
+            attempt += 1
+            if self.__abort.wait(delay):
+                raise Raise.error(
+                    "Request aborted", InterruptedError, self._c_name, currentframe()
+                )
+
+    def _stream(self, response: requests.Response) -> bool:
+        """Checks if the response is long enough for streamed decoding.
+
+        Responses are always decoded whole with a fast JsonDecoder backend.
+        """
+        if JsonDecoder.BACKEND not in self.STREAM_BACKENDS:
+            return False
+        try:
+            length: int = int(response.headers.get("Content-Length", 0))
+        except ValueError:
+            return False
+        return length > self.STREAM_LENGTH
+
+    def __request(
+        self,
+        url: str,
+        timeout: int,
+        label: str,
+        summary: bool = False,
+        key: Optional[str] = None,
+    ) -> Optional[Any]:
+        """Returns decoded response for url or None on error.
+
+        If summary is set, the response is longer than STREAM_LENGTH and
+        the stdlib JsonDecoder backend is used, it is streamed through
+        BodiesSummaryDecoder instead of being buffered and decoded whole.
+        If key is set, the result is stored in the cache under key and
+        an expired entry is revalidated: with If-None-Match or
+        If-Modified-Since when it has validators, and by comparing
+        the payload digest otherwise, so an unchanged payload is not
+        decoded again.
+        """
+        headers: Dict[str, str] = self._conditional_headers(key) if key else {}
+        try:
+            with self.__get(url, timeout, summary, headers) as response:
+                self._count(f"http.{response.status_code}")
+                if response.status_code == 304 and key and self.cache is not None:
+                    self._count("cache.revalidated")
+                    return self.cache.refresh(key)
+                if response.status_code != 200:
+                    print(f"Error calling API for {label} data: {response.status_code}")
+                    return None
+                digest = hashlib.blake2b(digest_size=16)
+                streamed: bool = summary and self._stream(response)
+                if streamed:
+                    text = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+                    def chunks() -> Iterator[str]:
+                        for chunk in response.iter_content(chunk_size=16384):
+                            digest.update(chunk)
+                            yield text.decode(chunk)
+
+                    # streamed decoding includes the body download time
+                    start: float = time.perf_counter()
+                    stream: Iterator[str] = chunks()
+                    out: Optional[Any] = BodiesSummaryDecoder().decode(stream)
+                    # the digest covers the whole payload
+                    for _ in stream:
+                        pass
+                    self._observe(f"decode.{label}", start)
+                else:
+                    raw: bytes = response.content
+                    digest.update(raw)
+                    if key and self._unchanged(key, digest.hexdigest()):
+                        out = self.cache.refresh(key)  # type: ignore
+                        if out is not None:
+                            self._count("cache.unchanged")
+                            return out
+                    start = time.perf_counter()
+                    out = JsonDecoder.loads(raw)
+                    if label == "bodies":
+                        out = self.fields.reduce(out)
+                    self._observe(f"decode.{label}", start)
+                if key:
+                    if streamed and self._unchanged(key, digest.hexdigest()):
+                        self._count("cache.unchanged")
+                        self.cache.refresh(key)  # type: ignore
+                    else:
+                        self._remember(
+                            key,
+                            out,
+                            self._validators(response.headers, digest.hexdigest()),
+                        )
+                return out
+        except Exception as ex:
+            self._count("http.error")
+            print(ex)
+        return None
+
     def system_query(self, s_system: StarsSystem) -> Optional[Dict]:
         """Returns result of query for system data."""
         if not isinstance(s_system, StarsSystem):
@@ -177,30 +1861,719 @@ class Url(BData):
         if not url:
             return None
 
-        try:
-            response: requests.Response = requests.get(url, timeout=30)
-            if response.status_code != 200:
-                print(f"Error calling API for system data: {response.status_code}")
-                return None
-            return json.loads(response.text)
-        except Exception as ex:
-            print(ex)
+        local: Optional[Dict] = None
+        if self.local_store is not None:
+            local = self.local_store.lookup(s_system.name, s_system.address)
+            if local and self.fields.system_fields <= LocalSystemsStore.FIELDS:
+                return local
+
+        hit, cached = self._cached(url)
+        if not hit:
+            cached = self.__request(url, 30, "system", key=url)
+        return self._merge_local(cached, local)
+
+    def _merge_local(self, data: Optional[Dict], local: Optional[Dict]) -> Any:
+        """Returns api answer completed with local store data.
+
+        The local data is returned if the api gave no answer.
+        """
+        if not local:
+            return data
+        if not isinstance(data, Dict) or not data:
+            return local
+        out: Dict = dict(data)
+        for key, value in local.items():
+            out.setdefault(key, value)
+        return out
+
+    def systems_query(
+        self,
+        s_systems: List[StarsSystem],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+    ) -> List[StarsSystem]:
+        """Updates many systems with EDSM data using batch requests.
+
+        Systems found in the local store or in the cache are resolved
+        without network access, the rest is split into chunks of chunk_size
+        names and fetched in parallel from the 'systems' endpoint. Each result is mapped back
+        by name onto the StarsSystem objects and cached per system.
+
+        ### Arguments:
+        * s_systems [List[StarsSystem]] - systems to update,
+        * chunk_size [int] - maximum number of names per request,
+        * max_workers [int] - maximum number of parallel requests.
+
+        ### Returns:
+        List of systems that were found in the EDSM database.
+        """
+        if not isinstance(s_systems, List):
+            raise Raise.error(
+                f"List type expected, '{type(s_systems)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise Raise.error(
+                f"Positive int expected for chunk_size, '{chunk_size}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        # name -> systems waiting for data
+        pending: Dict[str, List[StarsSystem]] = {}
+        # ids of resolved objects
+        found: Set[int] = set()
+        for s_system in s_systems:
+            url: str = self.system_url(s_system)
+            if not url:
+                continue
+            if self.local_store is not None:
+                local: Optional[Dict] = self.local_store.lookup(
+                    s_system.name, s_system.address
+                )
+                if local:
+                    # coordinates and ids, the rest comes from cache or api
+                    s_system.update_from_edsm(local)
+                    found.add(id(s_system))
+                    if self.fields.system_fields <= LocalSystemsStore.FIELDS:
+                        continue
+            if self.cache is not None:
+                cached: Optional[Dict] = self.cache.get(url)
+                if cached:
+                    s_system.update_from_edsm(cached)
+                    found.add(id(s_system))
+                    continue
+                if self.cache.is_negative(url):
+                    continue
+            pending.setdefault(s_system.name.lower(), []).append(s_system)  # type: ignore
+
+        if pending:
+            names: List[str] = list(pending.keys())
+            chunks: List[List[StarsSystem]] = [
+                [pending[name][0] for name in names[idx : idx + chunk_size]]
+                for idx in range(0, len(names), chunk_size)
+            ]
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(chunks)))
+            ) as executor:
+                results = executor.map(
+                    lambda chunk: self.__request(
+                        self.systems_url(chunk), 60, "systems"
+                    ),
+                    chunks,
+                )
+                for chunk, result in zip(chunks, results):
+                    if not isinstance(result, List):
+                        continue
+                    if self.cache is not None:
+                        # names missing in the answer are unknown to EDSM
+                        known: Set[str] = {
+                            data[EdsmKeys.NAME].lower()
+                            for data in result
+                            if isinstance(data, Dict) and data.get(EdsmKeys.NAME)
+                        }
+                        for s_system in chunk:
+                            if s_system.name.lower() not in known:  # type: ignore
+                                self.cache.put_negative(self.system_url(s_system))
+                    for data in result:
+                        if not isinstance(data, Dict) or not data.get(EdsmKeys.NAME):
+                            continue
+                        name: str = data[EdsmKeys.NAME].lower()
+                        for s_system in pending.get(name, []):
+                            if self.cache is not None:
+                                self.cache.put(self.system_url(s_system), data)
+                            s_system.update_from_edsm(data)
+                            found.add(id(s_system))
+
+        return [s_system for s_system in s_systems if id(s_system) in found]
+
+    def bodies_query(self, s_system: StarsSystem) -> Optional[Dict]:
+        """Returns bodies data for system.
+
+        If the fields profile needs no body details, the 'bodies' key holds
+        the number of bodies instead of the list, very long responses are
+        decoded in streaming mode unless a fast JsonDecoder backend is
+        loaded. Otherwise the elements of the list are limited to the profile
+        body fields.
+        """
+        if not isinstance(s_system, StarsSystem):
+            raise Raise.error(
+                f"StarsSystem type expected, '{type(s_system)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        url: str = self.bodies_url(s_system)
+        if not url:
+            return None
+        key: str = self.bodies_key(url)
+
+        hit, cached = self._cached(key)
+        if hit:
+            return cached
+
+        return self.__request(url, 60, "bodies", summary=self.fields.summary, key=key)
+
+    def bodies_key(self, url: str) -> str:
+        """Returns cache key of bodies url for the fields profile."""
+        if self.fields.summary:
+            return f"{url}#summary"
+        return f"{url}#{','.join(self.fields.body_fields)}"
+
+    def __center(self, s_system: StarsSystem) -> Optional[List[float]]:
+        """Returns coordinates of system, resolved by system_query if unknown."""
+        if None not in s_system.star_pos:
+            return list(s_system.star_pos)
+        data: Optional[Dict] = self.system_query(s_system)
+        if data and EdsmKeys.COORDS in data:
+            coords: Dict = data[EdsmKeys.COORDS]
+            return [coords[EdsmKeys.X], coords[EdsmKeys.Y], coords[EdsmKeys.Z]]
         return None
 
+    def radius_query(self, s_system: StarsSystem, radius: int) -> List[Dict[str, Any]]:
+        """Returns systems in radius from s_system in EDSM API format.
+
+        The local spatial index is used if set, the API otherwise.
+        """
+        if self.spatial_index is not None:
+            center: Optional[List[float]] = self.__center(s_system)
+            if center is not None:
+                return self._local_sphere(center, radius)
+        return self.url_query(self.radius_url(s_system, radius))  # type: ignore
+
+    def cube_query(self, s_system: StarsSystem, size: int) -> List[Dict[str, Any]]:
+        """Returns systems in cube around s_system in EDSM API format.
+
+        The local spatial index is used if set, the API otherwise.
+        """
+        if self.spatial_index is not None:
+            center: Optional[List[float]] = self.__center(s_system)
+            if center is not None:
+                return self._local_cube(center, size)
+        return self.url_query(self.cube_url(s_system, size))  # type: ignore
+
+    def _local_sphere(self, center: List[float], radius: int) -> List[Dict[str, Any]]:
+        """Returns systems in radius from center found in the spatial index."""
+        out: List[Dict[str, Any]] = []
+        for row, dist in self.spatial_index.sphere(center, radius):  # type: ignore
+            data: Optional[Dict[str, Any]] = self.spatial_index.resolve(row)  # type: ignore
+            if data:
+                data[EdsmKeys.DISTANCE] = round(dist, 2)
+                out.append(data)
+        return out
+
+    def _local_cube(self, center: List[float], size: int) -> List[Dict[str, Any]]:
+        """Returns systems in cube around center found in the spatial index."""
+        out: List[Dict[str, Any]] = []
+        for row in self.spatial_index.cube(center, size):  # type: ignore
+            data: Optional[Dict[str, Any]] = self.spatial_index.resolve(row)  # type: ignore
+            if data:
+                out.append(data)
+        return out
+
+    def radius_systems(
+        self,
+        s_system: StarsSystem,
+        radius: int,
+        registry: Optional[StarsSystemRegistry] = None,
+    ) -> List[StarsSystem]:
+        """Returns systems in radius from s_system as StarsSystem objects."""
+        return StarsSystem.from_edsm_many(self.radius_query(s_system, radius), registry)
+
+    def cube_systems(
+        self,
+        s_system: StarsSystem,
+        size: int,
+        registry: Optional[StarsSystemRegistry] = None,
+    ) -> List[StarsSystem]:
+        """Returns systems in cube around s_system as StarsSystem objects."""
+        return StarsSystem.from_edsm_many(self.cube_query(s_system, size), registry)
+
     def url_query(self, url: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Returns result of query for url."""
         out = []
         if not url:
             return out
 
-        try:
-            response: requests.Response = requests.get(url, timeout=60)
-            if response.status_code != 200:
-                print(f"Error calling API for EDSM data: {response.status_code}")
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached:
+                return cached
+
+        data = self.__request(url, 60, "EDSM")
+        if data:
+            out = data
+            if self.cache is not None:
+                self.cache.put(url, out)
+        return out
+
+
+class AsyncUrl(BData):
+    """AsyncUrl.
+
+    Asyncio variant of Url with the same system, bodies, radius and cube
+    query surface. All coroutines run on one event loop thread owned by
+    the object and talk HTTP/1.1 over asyncio streams, so many lookups are
+    in flight without a thread for each of them, also while they wait for
+    a RateLimiter token. URL building, fields profile, retries, cache,
+    local store and spatial index are taken from the wrapped Url.
+
+    Schedule the coroutines with submit(), they must run on the loop of
+    the object.
+    """
+
+    # headers of every request
+    HEADERS: Dict[str, str] = {
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+    def __init__(self, url: Optional[Url] = None, pool_size: int = 4) -> None:
+        """Create AsyncUrl object and start its event loop thread.
+
+        ### Arguments:
+        * url [Optional[Url]] - configured Url object, a default one if None,
+        * pool_size [int] - number of idle keep-alive connections per host.
+        """
+        if url is None:
+            url = Url()
+        if not isinstance(url, Url):
+            raise Raise.error(
+                f"Url type expected, '{type(url)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(pool_size, int) or pool_size < 1:
+            raise Raise.error(
+                f"Positive int expected for pool_size, '{pool_size}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self._set_data(key=_Keys.URL, value=url, set_default_type=Url)
+        self._set_data(key=_Keys.POOL_SIZE, value=pool_size, set_default_type=int)
+        self._set_data(key=_Keys.POOL, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.ABORT, value=Event(), set_default_type=Event)
+        loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._set_data(
+            key=_Keys.LOOP, value=loop, set_default_type=asyncio.AbstractEventLoop
+        )
+        thread = Thread(target=loop.run_forever, name=self._c_name, daemon=True)
+        self._set_data(key=_Keys.LOOP_THREAD, value=thread, set_default_type=Thread)
+        thread.start()
+
+    @property
+    def url(self) -> Url:
+        """Returns wrapped Url object."""
+        return self._get_data(key=_Keys.URL)  # type: ignore
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Returns event loop running the queries."""
+        return self._get_data(key=_Keys.LOOP)  # type: ignore
+
+    @property
+    def __abort(self) -> Event:
+        return self._get_data(key=_Keys.ABORT)  # type: ignore
+
+    @property
+    def __pool(
+        self,
+    ) -> Dict[
+        Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+    ]:
+        """Returns idle connections by (scheme, host, port), loop thread only."""
+        return self._get_data(key=_Keys.POOL)  # type: ignore
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedules coroutine on the event loop thread.
+
+        Safe to call from any thread, returns concurrent.futures.Future.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def abort(self) -> None:
+        """Stops requests of the object, safe to call from any thread.
+
+        A wait for a RateLimiter token or between retries ends within
+        RateLimiter.POLL seconds and no further attempts are made.
+        A request in progress ends within its timeout.
+        """
+        self.__abort.set()
+
+    def close(self) -> None:
+        """Cancels pending queries, closes connections and stops the loop.
+
+        Call it from any thread but the loop thread of the object.
+        """
+        if self.loop.is_closed():
+            return None
+        if self.loop.is_running():
+            self.submit(self.__shutdown()).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._get_data(key=_Keys.LOOP_THREAD).join()  # type: ignore
+        self.loop.close()
+
+    async def __shutdown(self) -> None:
+        """Cancels other tasks of the loop and closes idle connections."""
+        tasks: List[asyncio.Task] = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for idle in self.__pool.values():
+            for _, writer in idle:
+                writer.close()
+        self.__pool.clear()
+
+    async def __pause(self, delay: float) -> bool:
+        """Sleeps for delay seconds, returns True as soon as aborted."""
+        end: float = time.monotonic() + delay
+        while not self.__abort.is_set():
+            left: float = end - time.monotonic()
+            if left <= 0:
+                return False
+            await asyncio.sleep(min(left, RateLimiter.POLL))
+        return True
+
+    async def __connect(
+        self, origin: Tuple[str, str, int], fresh: bool
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Returns connection to origin and whether it was kept alive.
+
+        An idle pooled connection is taken unless fresh is set.
+        """
+        idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = self.__pool.get(
+            origin, []
+        )
+        while idle and not fresh:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = origin
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=True if scheme == "https" else None
+        )
+        return reader, writer, False
+
+    def __release(
+        self,
+        origin: Tuple[str, str, int],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Returns connection to the pool or closes it if the pool is full."""
+        idle: List[
+            Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        ] = self.__pool.setdefault(origin, [])
+        if len(idle) < self._get_data(key=_Keys.POOL_SIZE):  # type: ignore
+            idle.append((reader, writer))
+        else:
+            writer.close()
+
+    @staticmethod
+    async def __body(
+        reader: asyncio.StreamReader, status: int, message: HTTPMessage
+    ) -> Tuple[bytes, bool]:
+        """Returns response body and whether its end was framed.
+
+        A body without Content-Length or chunked encoding ends with
+        the connection, which cannot be kept alive then.
+        """
+        if status < 200 or status in (204, 304):
+            return b"", True
+        if "chunked" in message.get("Transfer-Encoding", "").lower():
+            chunks: List[bytes] = []
+            while True:
+                line: bytes = await reader.readuntil(b"\r\n")
+                size: int = int(line.split(b";")[0], 16)
+                if size == 0:
+                    # optional trailer section
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    return b"".join(chunks), True
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+        length: Optional[str] = message.get("Content-Length")
+        if length is not None:
+            return await reader.readexactly(int(length)), True
+        return await reader.read(), False
+
+    @staticmethod
+    def __decompress(body: bytes, encoding: str) -> bytes:
+        """Returns body decoded from its Content-Encoding."""
+        if encoding == "gzip":
+            return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # raw deflate stream without zlib header
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
+
+    async def __fetch(
+        self, url: str, headers: Dict[str, str]
+    ) -> Tuple[int, HTTPMessage, bytes]:
+        """Sends GET request for url, returns status, headers and body.
+
+        A kept-alive connection closed by the server in the meantime
+        is replaced with a new one, the request is not counted as failed.
+        """
+        parts = urlsplit(url)
+        secure: bool = parts.scheme == "https"
+        origin: Tuple[str, str, int] = (
+            parts.scheme,
+            parts.hostname or "",
+            parts.port or (443 if secure else 80),
+        )
+        target: str = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        lines: str = "".join(
+            f"{name}: {value}\r\n"
+            for name, value in {
+                "Host": parts.netloc,
+                **self.HEADERS,
+                **headers,
+            }.items()
+        )
+        request: bytes = f"GET {target} HTTP/1.1\r\n{lines}\r\n".encode("latin-1")
+        for fresh in (False, True):
+            reader, writer, reused = await self.__connect(origin, fresh)
+            keep: bool = False
+            try:
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    head: bytes = await reader.readuntil(b"\r\n\r\n")
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if reused:
+                        continue
+                    raise
+                status_line, _, rest = head.partition(b"\r\n")
+                version, status, _ = (status_line.decode("latin-1") + " ").split(" ", 2)
+                message: HTTPMessage = parse_headers(BytesIO(rest))
+                body, framed = await self.__body(reader, int(status), message)
+                keep = (
+                    framed
+                    and version == "HTTP/1.1"
+                    and message.get("Connection", "").lower() != "close"
+                )
+                return (
+                    int(status),
+                    message,
+                    self.__decompress(
+                        body, message.get("Content-Encoding", "").lower()
+                    ),
+                )
+            finally:
+                if keep:
+                    self.__release(origin, reader, writer)
+                else:
+                    writer.close()
+        raise Raise.error(
+            "Connection closed by server", ConnectionError, self._c_name, currentframe()
+        )
+
+    async def __get(
+        self, url: str, timeout: int, headers: Dict[str, str]
+    ) -> Tuple[int, HTTPMessage, bytes]:
+        """Returns response for url, retrying failed and throttled requests.
+
+        Retries follow Url: connection errors, timeouts, HTTP 429 and 5xx
+        answers are repeated with exponential backoff, every attempt waits
+        for a RateLimiter token without holding a thread.
+        Raises InterruptedError after abort().
+        """
+        attempt: int = 0
+        while True:
+            wait: float = await RateLimiter.shared().acquire_async(
+                self.url._lane(url), self.__abort
+            )
+            if self.url.metrics is not None:
+                self.url.metrics.observe("ratelimit.wait", wait)
+            delay: float = self.url.backoff * (2**attempt)
+            try:
+                status, message, body = await asyncio.wait_for(
+                    self.__fetch(url, headers), timeout
+                )
+            except (OSError, EOFError, asyncio.TimeoutError):
+                if attempt >= self.url.retries:
+                    raise
             else:
-                out = json.loads(response.text)
+                if status not in Url.RETRY_STATUS or attempt >= self.url.retries:
+                    return status, message, body
+                self.url._count(f"http.{status}")
+                if status == 429:
+                    delay = max(delay, Url._retry_after(message) or 0.0)
+            self.url._count("http.retry")
+            attempt += 1
+            if await self.__pause(delay):
+                raise Raise.error(
+                    "Request aborted", InterruptedError, self._c_name, currentframe()
+                )
+
+    async def __request(
+        self, url: str, timeout: int, label: str, key: Optional[str] = None
+    ) -> Optional[Any]:
+        """Returns decoded response for url or None on error.
+
+        The body is decoded whole, a bodies summary is reduced by
+        FieldsProfile.reduce. With key set, the result is cached and
+        an expired entry is revalidated as in Url.
+        """
+        headers: Dict[str, str] = self.url._conditional_headers(key) if key else {}
+        try:
+            status, message, raw = await self.__get(url, timeout, headers)
+            self.url._count(f"http.{status}")
+            if status == 304 and key and self.url.cache is not None:
+                self.url._count("cache.revalidated")
+                return self.url.cache.refresh(key)
+            if status != 200:
+                print(f"Error calling API for {label} data: {status}")
+                return None
+            digest: str = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            if key and self.url._unchanged(key, digest):
+                out: Optional[Any] = self.url.cache.refresh(key)  # type: ignore
+                if out is not None:
+                    self.url._count("cache.unchanged")
+                    return out
+            start: float = time.perf_counter()
+            out = JsonDecoder.loads(raw)
+            if label == "bodies":
+                out = self.url.fields.reduce(out)
+            self.url._observe(f"decode.{label}", start)
+            if key:
+                self.url._remember(key, out, Url._validators(message, digest))
+            return out
         except Exception as ex:
+            self.url._count("http.error")
             print(ex)
+        return None
+
+    async def system_query(self, s_system: StarsSystem) -> Optional[Dict]:
+        """Returns result of query for system data."""
+        if not isinstance(s_system, StarsSystem):
+            raise Raise.error(
+                f"StarsSystem type expected, '{type(s_system)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        url: str = self.url.system_url(s_system)
+        if not url:
+            return None
+
+        local: Optional[Dict] = None
+        if self.url.local_store is not None:
+            local = self.url.local_store.lookup(s_system.name, s_system.address)
+            if local and self.url.fields.system_fields <= LocalSystemsStore.FIELDS:
+                return local
+
+        hit, cached = self.url._cached(url)
+        if not hit:
+            cached = await self.__request(url, 30, "system", key=url)
+        return self.url._merge_local(cached, local)
+
+    async def bodies_query(self, s_system: StarsSystem) -> Optional[Dict]:
+        """Returns bodies data for system, as selected by the fields profile."""
+        if not isinstance(s_system, StarsSystem):
+            raise Raise.error(
+                f"StarsSystem type expected, '{type(s_system)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        url: str = self.url.bodies_url(s_system)
+        if not url:
+            return None
+        key: str = self.url.bodies_key(url)
+
+        hit, cached = self.url._cached(key)
+        if hit:
+            return cached
+
+        return await self.__request(url, 60, "bodies", key=key)
+
+    async def __center(self, s_system: StarsSystem) -> Optional[List[float]]:
+        """Returns coordinates of system, resolved by system_query if unknown."""
+        if None not in s_system.star_pos:
+            return list(s_system.star_pos)
+        data: Optional[Dict] = await self.system_query(s_system)
+        if data and EdsmKeys.COORDS in data:
+            coords: Dict = data[EdsmKeys.COORDS]
+            return [coords[EdsmKeys.X], coords[EdsmKeys.Y], coords[EdsmKeys.Z]]
+        return None
+
+    async def radius_query(
+        self, s_system: StarsSystem, radius: int
+    ) -> List[Dict[str, Any]]:
+        """Returns systems in radius from s_system in EDSM API format.
+
+        The local spatial index is used if set, the API otherwise.
+        """
+        if self.url.spatial_index is not None:
+            center: Optional[List[float]] = await self.__center(s_system)
+            if center is not None:
+                return self.url._local_sphere(center, radius)
+        return await self.url_query(self.url.radius_url(s_system, radius))  # type: ignore
+
+    async def cube_query(
+        self, s_system: StarsSystem, size: int
+    ) -> List[Dict[str, Any]]:
+        """Returns systems in cube around s_system in EDSM API format.
+
+        The local spatial index is used if set, the API otherwise.
+        """
+        if self.url.spatial_index is not None:
+            center: Optional[List[float]] = await self.__center(s_system)
+            if center is not None:
+                return self.url._local_cube(center, size)
+        return await self.url_query(self.url.cube_url(s_system, size))  # type: ignore
+
+    async def radius_systems(
+        self,
+        s_system: StarsSystem,
+        radius: int,
+        registry: Optional[StarsSystemRegistry] = None,
+    ) -> List[StarsSystem]:
+        """Returns systems in radius from s_system as StarsSystem objects."""
+        return StarsSystem.from_edsm_many(
+            await self.radius_query(s_system, radius), registry
+        )
+
+    async def cube_systems(
+        self,
+        s_system: StarsSystem,
+        size: int,
+        registry: Optional[StarsSystemRegistry] = None,
+    ) -> List[StarsSystem]:
+        """Returns systems in cube around s_system as StarsSystem objects."""
+        return StarsSystem.from_edsm_many(
+            await self.cube_query(s_system, size), registry
+        )
+
+    async def url_query(self, url: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Returns result of query for url."""
+        out = []
+        if not url:
+            return out
+
+        if self.url.cache is not None:
+            cached = self.url.cache.get(url)
+            if cached:
+                return cached
+
+        data = await self.__request(url, 60, "EDSM")
+        if data:
+            out = data
+            if self.url.cache is not None:
+                self.url.cache.put(url, out)
         return out
 
 
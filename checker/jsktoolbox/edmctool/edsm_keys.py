@@ -85,6 +85,7 @@ class EdsmKeys(object, metaclass=ReadOnlyClass):
     PERIOD: str = "period"
     PERMIT_NAME: str = "permitName"
     POPULATION: str = "population"
+    PRIMARY_STAR: str = "primaryStar"
     PROGRESS: str = "progress"
     QTY: str = "qty"
     RADIUS: str = "radius"
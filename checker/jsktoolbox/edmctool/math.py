@@ -13,7 +13,7 @@ import random
 
 from inspect import currentframe
 from queue import Queue, SimpleQueue
-from typing import Optional, List, Tuple, Union, Any, Dict
+from typing import Optional, List, Set, Tuple, Union, Any, Dict
 from types import FrameType, MethodType
 from abc import ABC, abstractmethod
 from itertools import permutations
@@ -291,6 +291,9 @@ class AlgAStar(IAlg, BLogClient):
     __points: List[StarsSystem] = None  # type: ignore
     __jump_range: int = None  # type: ignore
     __final: List[StarsSystem] = None  # type: ignore
+    # hashed copies of __points and __final for membership tests
+    __points_set: Set[StarsSystem] = None  # type: ignore
+    __final_set: Set[StarsSystem] = None  # type: ignore
     __start_point: StarsSystem = None  # type: ignore
 
     def __init__(
@@ -351,14 +354,16 @@ class AlgAStar(IAlg, BLogClient):
 
         self.__start_point = start
         self.__points = systems
+        self.__points_set = set(systems)
         self.__final = []
+        self.__final_set = set()
 
     def __get_neighbors(self, point: StarsSystem) -> List[StarsSystem]:
         """Zwraca sąsiadów, którzy są w zasięgu max_range."""
         neighbors: List[StarsSystem] = []
         for p in self.__points:
             if (
-                p not in self.__final
+                p not in self.__final_set
                 and self.__math.distance(point.star_pos, p.star_pos)
                 <= self.__jump_range
             ):
@@ -389,6 +394,7 @@ class AlgAStar(IAlg, BLogClient):
     def run(self) -> None:
         """Implementacja algorytmu A*."""
         open_set: List[StarsSystem] = [self.__start_point]
+        in_open: Set[StarsSystem] = {self.__start_point}
         came_from: Dict = {}
         g_score: Dict[StarsSystem, float] = {self.__start_point: 0.0}
         f_score: Dict[StarsSystem, float] = {
@@ -404,10 +410,12 @@ class AlgAStar(IAlg, BLogClient):
                 open_set, key=lambda point: f_score.get(point, float("inf"))
             )
             # self.debug(currentframe(), f"{current}")
-            if current in self.__points:
+            if current in self.__points_set:
                 self.__final = self.__reconstruct_path(came_from, current)
+                self.__final_set = set(self.__final)
 
             open_set.remove(current)
+            in_open.discard(current)
             for neighbor in self.__get_neighbors(current):
                 tentative_g_score: float = g_score[current] + self.__math.distance(
                     current.star_pos, neighbor.star_pos
@@ -419,10 +427,12 @@ class AlgAStar(IAlg, BLogClient):
                     f_score[neighbor] = g_score[neighbor] + self.__math.distance(
                         neighbor.star_pos, self.__points[0].star_pos
                     )
-                    if neighbor not in open_set:
+                    if neighbor not in in_open:
                         open_set.append(neighbor)
+                        in_open.add(neighbor)
 
         self.__final = []
+        self.__final_set = set()
 
     @property
     def final_distance(self) -> float:
@@ -937,8 +947,9 @@ class AlgGenetic(IAlg, BLogClient):
         if random.random() > self.__crossover_rate:
             return parent1
         crossover_point: int = random.randint(1, len(parent1) - 2)
+        head: Set[StarsSystem] = set(parent1[:crossover_point])
         child: List[StarsSystem] = parent1[:crossover_point] + [
-            point for point in parent2 if point not in parent1[:crossover_point]
+            point for point in parent2 if point not in head
         ]
         return child
 
@@ -1207,13 +1218,15 @@ class AlgGenetic2(IAlg, BLogClient):
 
         child: List[StarsSystem] = [None] * len(parent1)  # type: ignore
         child[start_idx:end_idx] = parent1[start_idx:end_idx]
+        placed: Set[StarsSystem] = set(parent1[start_idx:end_idx])
 
         current_pos: int = end_idx
         for system in parent2:
-            if system not in child:
+            if system not in placed:
                 if current_pos >= len(parent1):
                     current_pos = 0
                 child[current_pos] = system
+                placed.add(system)
                 current_pos += 1
 
         return child
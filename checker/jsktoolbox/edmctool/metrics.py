@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+metrics.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 16:40:27
+
+Purpose: lightweight timing spans, counters and histograms.
+"""
+
+import time
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, List, Optional
+
+from ..basetool.classes import BClasses
+
+
+class Histogram(BClasses):
+    """Histogram.
+
+    Fixed buckets of durations in seconds with count, sum, min and max.
+    Percentiles are estimated as the upper bound of the bucket.
+    """
+
+    # upper bounds of the buckets in seconds, the last one is open
+    BOUNDS: List[float] = [
+        0.0005,
+        0.001,
+        0.002,
+        0.005,
+        0.01,
+        0.02,
+        0.05,
+        0.1,
+        0.2,
+        0.5,
+        1.0,
+        2.0,
+        5.0,
+        10.0,
+    ]
+
+    __buckets: List[int] = None  # type: ignore
+    __count: int = None  # type: ignore
+    __total: float = None  # type: ignore
+    __min: Optional[float] = None
+    __max: Optional[float] = None
+
+    def __init__(self) -> None:
+        """Create empty histogram."""
+        self.__buckets = [0] * (len(self.BOUNDS) + 1)
+        self.__count = 0
+        self.__total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds duration in seconds."""
+        self.__buckets[bisect_left(self.BOUNDS, value)] += 1
+        self.__count += 1
+        self.__total += value
+        if self.__min is None or value < self.__min:
+            self.__min = value
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    @property
+    def count(self) -> int:
+        """Returns number of observations."""
+        return self.__count
+
+    def percentile(self, fraction: float) -> float:
+        """Returns estimated percentile, fraction in range 0..1."""
+        if not self.__count:
+            return 0.0
+        rank: float = fraction * self.__count
+        seen: int = 0
+        for idx, hits in enumerate(self.__buckets):
+            seen += hits
+            if seen >= rank and hits:
+                if idx < len(self.BOUNDS):
+                    return min(self.BOUNDS[idx], self.__max)  # type: ignore
+                break
+        return self.__max  # type: ignore
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns summary in seconds."""
+        return {
+            "count": self.__count,
+            "sum": self.__total,
+            "avg": self.__total / self.__count if self.__count else 0.0,
+            "min": self.__min or 0.0,
+            "max": self.__max or 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class Metrics(BClasses):
+    """Metrics.
+
+    Thread-safe registry of named counters and duration histograms.
+    Spans are measured with the span() context manager or passed
+    to observe() directly.
+    """
+
+    __lock: Lock = None  # type: ignore
+    __counters: Dict[str, int] = None  # type: ignore
+    __spans: Dict[str, Histogram] = None  # type: ignore
+    __changed: bool = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Create empty registry."""
+        self.__lock = Lock()
+        self.__counters = {}
+        self.__spans = {}
+        self.__changed = False
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Adds value to counter name."""
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+            self.__changed = True
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Adds duration to histogram name."""
+        with self.__lock:
+            histogram: Optional[Histogram] = self.__spans.get(name)
+            if histogram is None:
+                histogram = self.__spans[name] = Histogram()
+            histogram.observe(seconds)
+            self.__changed = True
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Measures duration of the with block as histogram name."""
+        start: float = time.perf_counter()
+        try:
+            yield None
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    @property
+    def changed(self) -> bool:
+        """Checks if anything was recorded since the last report."""
+        return self.__changed
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Returns copy of counters and histogram summaries."""
+        with self.__lock:
+            return {
+                "counters": dict(self.__counters),
+                "spans": {
+                    name: histogram.snapshot()
+                    for name, histogram in self.__spans.items()
+                },
+            }
+
+    def report(self) -> List[str]:
+        """Returns formatted summary lines, durations in milliseconds."""
+        data: Dict[str, Dict] = self.snapshot()
+        self.__changed = False
+        out: List[str] = []
+        for name, summary in sorted(data["spans"].items()):
+            out.append(
+                f"{name}: n={summary['count']} "
+                f"avg={summary['avg'] * 1000:.1f} "
+                f"p50={summary['p50'] * 1000:.1f} "
+                f"p95={summary['p95'] * 1000:.1f} "
+                f"p99={summary['p99'] * 1000:.1f} "
+                f"max={summary['max'] * 1000:.1f} ms"
+            )
+        if data["counters"]:
+            out.append(
+                ", ".join(
+                    f"{name}={value}"
+                    for name, value in sorted(data["counters"].items())
+                )
+            )
+        return out
+
+    def reset(self) -> None:
+        """Removes all recorded data."""
+        with self.__lock:
+            self.__counters.clear()
+            self.__spans.clear()
+            self.__changed = False
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+spatial.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 14:12:09
+
+Purpose: local spatial index for neighbourhood searches.
+"""
+
+import math
+
+from array import array
+from inspect import currentframe
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..basetool.classes import BClasses
+from ..raisetool import Raise
+from .edsm_keys import EdsmKeys
+from .stars import StarsSystem
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    pass
+
+
+def clamp_radius(radius: Any) -> int:
+    """Returns sphere radius clamped as by the EDSM sphere-systems API."""
+    if not isinstance(radius, int):
+        return 50
+    return min(max(radius, 5), 100)
+
+
+def clamp_size(size: Any) -> int:
+    """Returns cube size clamped as by the EDSM cube-systems API."""
+    if not isinstance(size, int):
+        return 100
+    return min(max(size, 10), 200)
+
+
+class SpatialIndex(BClasses):
+    """SpatialIndex.
+
+    Uniform grid of cubic sectors over a flat sequence of coordinates,
+    x, y, z for each row. Each sector holds a span of row numbers sorted
+    by sector, so a sphere or cube query only checks rows of the sectors
+    overlapping the searched box. Rows with NaN or infinite coordinates,
+    unknown positions in StarsSystemTable, are not indexed.
+    """
+
+    # sector coordinates are packed into one int, 21 bits per axis
+    __BITS: int = 21
+    __OFFSET: int = 1 << 20
+
+    __coords: Sequence[float] = None  # type: ignore
+    __cell: float = None  # type: ignore
+    __order: array = None  # type: ignore
+    __cells: Dict[int, Tuple[int, int]] = None  # type: ignore
+    __resolver: Optional[Callable[[int], Optional[Dict[str, Any]]]] = None
+
+    def __init__(
+        self,
+        coords: Sequence[float],
+        cell_size: float = 50.0,
+        resolver: Optional[Callable[[int], Optional[Dict[str, Any]]]] = None,
+    ) -> None:
+        """Create index object.
+
+        ### Arguments:
+        * coords [Sequence[float]] - flat coordinates, array('d'),
+          memoryview or list, three values for each row,
+        * cell_size [float] - sector edge in light years,
+        * resolver [Optional[Callable]] - returns EDSM API formatted data
+          for row number, used by Url neighbourhood queries.
+        """
+        if len(coords) % 3:
+            raise Raise.error(
+                f"Coordinates length must be a multiple of 3, '{len(coords)}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not isinstance(cell_size, (int, float)) or cell_size <= 0:
+            raise Raise.error(
+                f"Positive number expected for cell_size, '{cell_size}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__coords = coords
+        self.__cell = float(cell_size)
+        self.__resolver = resolver
+        try:
+            self.__build_numpy()
+        except NameError:
+            self.__build()
+
+    @classmethod
+    def from_systems(
+        cls, systems: List[StarsSystem], cell_size: float = 50.0
+    ) -> "SpatialIndex":
+        """Returns index over systems with known coordinates."""
+        coords: array = array("d")
+        rows: List[StarsSystem] = []
+        for s_system in systems:
+            if None in s_system.star_pos:
+                continue
+            coords.extend(s_system.star_pos)
+            rows.append(s_system)
+
+        def resolver(row: int) -> Optional[Dict[str, Any]]:
+            s_system: StarsSystem = rows[row]
+            return {
+                EdsmKeys.NAME: s_system.name,
+                EdsmKeys.ID64: s_system.address,
+                EdsmKeys.COORDS: {
+                    EdsmKeys.X: s_system.pos_x,
+                    EdsmKeys.Y: s_system.pos_y,
+                    EdsmKeys.Z: s_system.pos_z,
+                },
+            }
+
+        return cls(coords, cell_size, resolver)
+
+    def __key(self, ix: int, iy: int, iz: int) -> int:
+        """Returns packed sector key."""
+        return (
+            ((ix + self.__OFFSET) << (2 * self.__BITS))
+            | ((iy + self.__OFFSET) << self.__BITS)
+            | (iz + self.__OFFSET)
+        )
+
+    def __build(self) -> None:
+        """Sorts rows into sectors."""
+        coords: Sequence[float] = self.__coords
+        cell: float = self.__cell
+        floor = math.floor
+        isfinite = math.isfinite
+        buckets: Dict[int, List[int]] = {}
+        for row in range(len(coords) // 3):
+            x: float = coords[3 * row]
+            y: float = coords[3 * row + 1]
+            z: float = coords[3 * row + 2]
+            if not (isfinite(x) and isfinite(y) and isfinite(z)):
+                continue
+            key: int = self.__key(floor(x / cell), floor(y / cell), floor(z / cell))
+            bucket: Optional[List[int]] = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [row]
+            else:
+                bucket.append(row)
+        self.__order = array("q")
+        self.__cells = {}
+        for key, rows in buckets.items():
+            self.__cells[key] = (len(self.__order), len(self.__order) + len(rows))
+            self.__order.extend(rows)
+
+    def __build_numpy(self) -> None:
+        """Sorts rows into sectors using numpy."""
+        points = np.asarray(self.__coords, dtype=np.float64).reshape(-1, 3)
+        rows = np.flatnonzero(np.isfinite(points).all(axis=1))
+        sectors = np.floor(points[rows] / self.__cell).astype(np.int64) + self.__OFFSET
+        keys = (
+            (sectors[:, 0] << (2 * self.__BITS))
+            | (sectors[:, 1] << self.__BITS)
+            | sectors[:, 2]
+        )
+        order = rows[np.argsort(keys, kind="stable")]
+        keys = np.sort(keys, kind="stable")
+        unique, starts = np.unique(keys, return_index=True)
+        stops = np.append(starts[1:], len(order))
+        self.__order = array("q")
+        self.__order.frombytes(order.astype(np.int64).tobytes())
+        self.__cells = dict(zip(unique.tolist(), zip(starts.tolist(), stops.tolist())))
+
+    def __len__(self) -> int:
+        """Returns number of indexed rows."""
+        return len(self.__order)
+
+    @property
+    def cell_size(self) -> float:
+        """Returns sector edge in light years."""
+        return self.__cell
+
+    def position(self, row: int) -> Tuple[float, float, float]:
+        """Returns coordinates of row."""
+        coords: Sequence[float] = self.__coords
+        return (coords[3 * row], coords[3 * row + 1], coords[3 * row + 2])
+
+    def resolve(self, row: int) -> Optional[Dict[str, Any]]:
+        """Returns EDSM API formatted data for row, if resolver is set."""
+        if self.__resolver is None:
+            return None
+        return self.__resolver(row)
+
+    def __box(
+        self, center: Sequence[float], half: float
+    ) -> List[Tuple[int, float, float, float]]:
+        """Returns rows with offsets from center inside the box."""
+        cx, cy, cz = (float(center[0]), float(center[1]), float(center[2]))
+        cell: float = self.__cell
+        coords: Sequence[float] = self.__coords
+        order: array = self.__order
+        out: List[Tuple[int, float, float, float]] = []
+        floor = math.floor
+        for ix in range(floor((cx - half) / cell), floor((cx + half) / cell) + 1):
+            for iy in range(floor((cy - half) / cell), floor((cy + half) / cell) + 1):
+                for iz in range(
+                    floor((cz - half) / cell), floor((cz + half) / cell) + 1
+                ):
+                    span: Optional[Tuple[int, int]] = self.__cells.get(
+                        self.__key(ix, iy, iz)
+                    )
+                    if span is None:
+                        continue
+                    for row in order[span[0] : span[1]]:
+                        dx: float = coords[3 * row] - cx
+                        dy: float = coords[3 * row + 1] - cy
+                        dz: float = coords[3 * row + 2] - cz
+                        if abs(dx) <= half and abs(dy) <= half and abs(dz) <= half:
+                            out.append((row, dx, dy, dz))
+        return out
+
+    def sphere(self, center: Sequence[float], radius: Any) -> List[Tuple[int, float]]:
+        """Returns rows within radius from center with their distances.
+
+        The radius is clamped as by the EDSM API, results are sorted
+        by distance.
+        """
+        radius = clamp_radius(radius)
+        limit: float = float(radius * radius)
+        out: List[Tuple[int, float]] = []
+        for row, dx, dy, dz in self.__box(center, radius):
+            dist: float = dx * dx + dy * dy + dz * dz
+            if dist <= limit:
+                out.append((row, math.sqrt(dist)))
+        out.sort(key=itemgetter(1))
+        return out
+
+    def cube(self, center: Sequence[float], size: Any) -> List[int]:
+        """Returns rows inside cube of edge size centered on center.
+
+        The size is clamped as by the EDSM API.
+        """
+        size = clamp_size(size)
+        return [item[0] for item in self.__box(center, size / 2)]
+
+
+# #[EOF]#######################################################################
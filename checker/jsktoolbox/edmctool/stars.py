@@ -8,11 +8,14 @@ Purpose: StarsSystem container.
 """
 
 from inspect import currentframe
-from typing import Optional, List, Dict, Union, Any
+from threading import Lock
+from typing import Optional, List, Dict, Tuple, Union, Any
+from weakref import WeakValueDictionary
 
 from ..attribtool import ReadOnlyClass
 from ..raisetool import Raise
-from ..basetool.data import BData
+from ..basetool.classes import BClasses
+from ..basetool.data import BSlotData
 from .edsm_keys import EdsmKeys
 
 
@@ -23,20 +26,51 @@ class _Keys(object, metaclass=ReadOnlyClass):
     SS_ADDRESS: str = "__ss_address__"
     SS_DATA: str = "__ss_data__"
     SS_NAME: str = "__ss_name__"
+    SS_POS: str = "__ss_pos__"
     SS_POS_X: str = "__ss_pos_x__"
     SS_POS_Y: str = "__ss_pos_y__"
     SS_POS_Z: str = "__ss_pos_z__"
     SS_STAR_CLASS: str = "__ss_star_class__"
 
 
-class StarsSystem(BData):
-    """StarsSystem container class."""
+class StarsSystem(BSlotData):
+    """StarsSystem container class.
+
+    Fields are kept in slots, the route algorithms create and read
+    many thousands of these objects.
+
+    Objects are hashable by case-insensitive name and compare equal
+    if the names match and, when both are known, the addresses too.
+    The address may be filled in later, e.g. by update_from_edsm, without
+    changing the hash. The name must not change while an object is a key
+    of a dict or a set.
+
+    The equality is not transitive: StarsSystem("Sol") equals both
+    StarsSystem("Sol", 10) and StarsSystem("Sol", 11), which differ from
+    each other. A set or dict holding systems of one name with and
+    without addresses finds whichever was inserted first, so the route
+    algorithms should be given systems from a single source.
+    """
+
+    __slots__ = ()
+
+    _FIELDS: Dict[str, Any] = {
+        _Keys.SS_ADDRESS: Optional[int],
+        _Keys.SS_DATA: Dict,
+        _Keys.SS_NAME: Optional[str],
+        # cached star_pos tuple, cleared by pos setters
+        _Keys.SS_POS: Optional[Tuple],
+        _Keys.SS_POS_X: Optional[Union[float, int]],
+        _Keys.SS_POS_Y: Optional[Union[float, int]],
+        _Keys.SS_POS_Z: Optional[Union[float, int]],
+        _Keys.SS_STAR_CLASS: str,
+    }
 
     def __init__(
         self,
         name: Optional[str] = None,
         address: Optional[int] = None,
-        star_pos: Optional[List] = None,
+        star_pos: Optional[Union[List, Tuple]] = None,
     ) -> None:
         """Create Star System object."""
         self.name = name
@@ -52,6 +86,34 @@ class StarsSystem(BData):
             f"data={self.data})"
         )
 
+    def __eq__(self, other: Any) -> bool:
+        """Compare star systems by name and known addresses.
+
+        A system without address matches any address, see the class
+        docstring for the resulting limits.
+        """
+        if not isinstance(other, StarsSystem):
+            return NotImplemented
+        if self is other:
+            return True
+        name: Optional[str] = self.name
+        other_name: Optional[str] = other.name
+        if (name is None) != (other_name is None):
+            return False
+        if name is not None and name.lower() != other_name.lower():  # type: ignore
+            return False
+        address: Optional[int] = self.address
+        other_address: Optional[int] = other.address
+        if address is None or other_address is None:
+            # systems without names are only equal by address
+            return name is not None
+        return address == other_address
+
+    def __hash__(self) -> int:
+        """Returns hash of the lowercased name."""
+        name: Optional[str] = self.name
+        return hash(name.lower() if name is not None else None)
+
     @property
     def address(self) -> Optional[int]:
         """Returns address of the star system."""
@@ -61,15 +123,9 @@ class StarsSystem(BData):
     def address(self, arg: Optional[Union[int, str]]) -> None:
         """Sets  address of the star system."""
         if isinstance(arg, str):
-            self._set_data(
-                key=_Keys.SS_ADDRESS,
-                value=int(arg),
-                set_default_type=Optional[int],
-            )
+            self._set_data(key=_Keys.SS_ADDRESS, value=int(arg))
         else:
-            self._set_data(
-                key=_Keys.SS_ADDRESS, value=arg, set_default_type=Optional[int]
-            )
+            self._set_data(key=_Keys.SS_ADDRESS, value=arg)
 
     @property
     def data(self) -> Dict:
@@ -78,16 +134,16 @@ class StarsSystem(BData):
         This is dictionary object for storing various elements.
         """
         if self._get_data(key=_Keys.SS_DATA, default_value=None) is None:
-            self._set_data(key=_Keys.SS_DATA, value={}, set_default_type=Dict)
+            self._set_data(key=_Keys.SS_DATA, value={})
         return self._get_data(key=_Keys.SS_DATA)  # type: ignore
 
     @data.setter
     def data(self, value: Optional[Dict]) -> None:
         """Initialize or set data container."""
         if value is None:
-            self._set_data(key=_Keys.SS_DATA, value={}, set_default_type=Dict)
+            self._set_data(key=_Keys.SS_DATA, value={})
         else:
-            self._set_data(key=_Keys.SS_DATA, value=value, set_default_type=Dict)
+            self._set_data(key=_Keys.SS_DATA, value=value)
 
     @property
     def name(self) -> Optional[str]:
@@ -97,7 +153,7 @@ class StarsSystem(BData):
     @name.setter
     def name(self, arg: Optional[str]) -> None:
         """Sets name of the star system."""
-        self._set_data(key=_Keys.SS_NAME, value=arg, set_default_type=Optional[str])
+        self._set_data(key=_Keys.SS_NAME, value=arg)
 
     @property
     def pos_x(self) -> Optional[Union[float, int]]:
@@ -107,9 +163,8 @@ class StarsSystem(BData):
     @pos_x.setter
     def pos_x(self, arg: Optional[Union[float, int]]) -> None:
         """Sets pos_x of the star system."""
-        self._set_data(
-            key=_Keys.SS_POS_X, value=arg, set_default_type=Optional[Union[float, int]]
-        )
+        self._set_data(key=_Keys.SS_POS_X, value=arg)
+        self._set_data(key=_Keys.SS_POS, value=None)
 
     @property
     def pos_y(self) -> Optional[Union[float, int]]:
@@ -119,9 +174,8 @@ class StarsSystem(BData):
     @pos_y.setter
     def pos_y(self, arg: Optional[Union[float, int]]) -> None:
         """Sets pos_y of the star system."""
-        self._set_data(
-            key=_Keys.SS_POS_Y, value=arg, set_default_type=Optional[Union[float, int]]
-        )
+        self._set_data(key=_Keys.SS_POS_Y, value=arg)
+        self._set_data(key=_Keys.SS_POS, value=None)
 
     @property
     def pos_z(self) -> Optional[Union[float, int]]:
@@ -131,9 +185,8 @@ class StarsSystem(BData):
     @pos_z.setter
     def pos_z(self, arg: Optional[Union[float, int]]) -> None:
         """Sets pos_z of the star system."""
-        self._set_data(
-            key=_Keys.SS_POS_Z, value=arg, set_default_type=Optional[Union[float, int]]
-        )
+        self._set_data(key=_Keys.SS_POS_Z, value=arg)
+        self._set_data(key=_Keys.SS_POS, value=None)
 
     @property
     def star_class(self) -> str:
@@ -143,28 +196,109 @@ class StarsSystem(BData):
     @star_class.setter
     def star_class(self, value: str) -> None:
         """Sets star class string."""
-        self._set_data(key=_Keys.SS_STAR_CLASS, value=value, set_default_type=str)
+        self._set_data(key=_Keys.SS_STAR_CLASS, value=value)
 
     @property
-    def star_pos(self) -> List:
-        """Returns the star position list."""
-        return [self.pos_x, self.pos_y, self.pos_z]
+    def star_pos(self) -> Tuple:
+        """Returns the star position tuple.
+
+        The tuple is cached until one of the pos setters is called.
+        """
+        pos: Optional[Tuple] = self._get_data(key=_Keys.SS_POS, default_value=None)
+        if pos is None:
+            pos = (self.pos_x, self.pos_y, self.pos_z)
+            self._set_data(key=_Keys.SS_POS, value=pos)
+        return pos
 
     @star_pos.setter
-    def star_pos(self, arg: Optional[List] = None) -> None:
+    def star_pos(self, arg: Optional[Union[List, Tuple]] = None) -> None:
         """Sets  the star position list."""
         if arg is None:
             (self.pos_x, self.pos_y, self.pos_z) = (None, None, None)
-        elif isinstance(arg, List) and len(arg) == 3:
+        elif isinstance(arg, (list, tuple)) and len(arg) == 3:
             (self.pos_x, self.pos_y, self.pos_z) = arg
         else:
             raise Raise.error(
-                f"List type expected, '{type(arg)}' received.",
+                f"List or Tuple type expected, '{type(arg)}' received.",
                 TypeError,
                 self._c_name,
                 currentframe(),
             )
 
+    @classmethod
+    def from_edsm_many(
+        cls,
+        data: Any,
+        registry: Optional["StarsSystemRegistry"] = None,
+    ) -> List["StarsSystem"]:
+        """Returns StarsSystem objects built from EDSM Api list.
+
+        Bulk variant of update_from_edsm for sphere-systems and cube-systems
+        answers. Slot values are filled directly, so only entries with
+        a name and valid JSON types are used, others are skipped.
+
+        ### Arguments:
+        * data [Any] - decoded list of EDSM system dicts,
+        * registry [Optional[StarsSystemRegistry]] - if set, the returned
+          objects are the interned, canonical ones.
+        """
+        if not isinstance(data, List):
+            return []
+        index: Dict[str, int] = cls._SLOT_INDEX
+        template: List[Any] = cls._slot_values()
+        i_address: int = index[_Keys.SS_ADDRESS]
+        i_data: int = index[_Keys.SS_DATA]
+        i_name: int = index[_Keys.SS_NAME]
+        i_pos: int = index[_Keys.SS_POS]
+        i_x: int = index[_Keys.SS_POS_X]
+        i_y: int = index[_Keys.SS_POS_Y]
+        i_z: int = index[_Keys.SS_POS_Z]
+        numbers: Tuple[type, ...] = (int, float)
+        extra_keys: Tuple[str, ...] = (
+            EdsmKeys.BODY_COUNT,
+            EdsmKeys.COORDS_LOCKED,
+            EdsmKeys.REQUIRE_PERMIT,
+            EdsmKeys.DISTANCE,
+        )
+        build = cls._from_slot_values
+        out: List[StarsSystem] = []
+        for item in data:
+            if type(item) is not dict:
+                continue
+            name: Any = item.get(EdsmKeys.NAME)
+            if type(name) is not str:
+                continue
+            values: List[Any] = template.copy()
+            values[i_name] = name
+            address: Any = item.get(EdsmKeys.ID64)
+            if type(address) is int:
+                values[i_address] = address
+            coords: Any = item.get(EdsmKeys.COORDS)
+            if type(coords) is dict:
+                x: Any = coords.get(EdsmKeys.X)
+                y: Any = coords.get(EdsmKeys.Y)
+                z: Any = coords.get(EdsmKeys.Z)
+                if type(x) in numbers and type(y) in numbers and type(z) in numbers:
+                    values[i_x] = x
+                    values[i_y] = y
+                    values[i_z] = z
+                    values[i_pos] = (x, y, z)
+            extra: Dict[str, Any] = {
+                key: item[key] for key in extra_keys if key in item
+            }
+            # number of bodies from streamed summary or the bodies list,
+            # null or other values leave it unset
+            bodies: Any = item.get(EdsmKeys.BODIES)
+            if type(bodies) is int:
+                extra[EdsmKeys.BODIES] = bodies
+            elif type(bodies) is list:
+                extra[EdsmKeys.BODIES] = len(bodies)
+            values[i_data] = extra
+            out.append(build(values))
+        if registry is not None:
+            out = [registry.intern(s_system) for s_system in out]
+        return out
+
     def update_from_edsm(self, data: Dict) -> None:
         """Update records from given EDSM Api dict."""
         if data is None or not isinstance(data, Dict):
@@ -185,7 +319,143 @@ class StarsSystem(BData):
         if EdsmKeys.DISTANCE in data:
             self.data[EdsmKeys.DISTANCE] = data[EdsmKeys.DISTANCE]
         if EdsmKeys.BODIES in data:
-            self.data[EdsmKeys.BODIES] = len(data[EdsmKeys.BODIES])
+            # number of bodies from streamed summary or the bodies list
+            if isinstance(data[EdsmKeys.BODIES], int):
+                self.data[EdsmKeys.BODIES] = data[EdsmKeys.BODIES]
+            elif isinstance(data[EdsmKeys.BODIES], List):
+                self.data[EdsmKeys.BODIES] = len(data[EdsmKeys.BODIES])
+
+
+class StarsSystemRegistry(BClasses):
+    """StarsSystemRegistry.
+
+    Flyweight registry of canonical StarsSystem objects, keyed by address
+    with case-insensitive name fallback. Objects are held by weak
+    references and drop out of the registry when no longer used.
+    Interning an object with a known address or name sets the key fields
+    of the canonical object, it should not be a key of a dict or a set
+    at this moment.
+    """
+
+    __shared: Optional["StarsSystemRegistry"] = None
+    __shared_lock: Lock = Lock()
+
+    __lock: Lock = None  # type: ignore
+    __by_address: WeakValueDictionary = None  # type: ignore
+    __by_name: WeakValueDictionary = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Create empty registry."""
+        self.__lock = Lock()
+        self.__by_address = WeakValueDictionary()
+        self.__by_name = WeakValueDictionary()
+
+    @classmethod
+    def shared(cls) -> "StarsSystemRegistry":
+        """Returns process-wide registry instance."""
+        with cls.__shared_lock:
+            if cls.__shared is None:
+                cls.__shared = cls()
+            return cls.__shared
+
+    def __len__(self) -> int:
+        """Returns number of live objects in the registry."""
+        with self.__lock:
+            return len(
+                {id(item) for item in self.__by_address.values()}
+                | {id(item) for item in self.__by_name.values()}
+            )
+
+    def __find(
+        self, address: Optional[int], name: Optional[str]
+    ) -> Optional[StarsSystem]:
+        """Returns registered object, the lock must be held."""
+        out: Optional[StarsSystem] = None
+        if address is not None:
+            out = self.__by_address.get(address)
+        if out is None and name:
+            out = self.__by_name.get(name.lower())
+            if (
+                out is not None
+                and address is not None
+                and out.address is not None
+                and out.address != address
+            ):
+                # same name, other system
+                out = None
+        return out
+
+    def __index(self, s_system: StarsSystem) -> None:
+        """Register keys of object, the lock must be held."""
+        if s_system.address is not None:
+            self.__by_address[s_system.address] = s_system
+        if s_system.name:
+            self.__by_name.setdefault(s_system.name.lower(), s_system)
+
+    def get(
+        self, address: Optional[int] = None, name: Optional[str] = None
+    ) -> Optional[StarsSystem]:
+        """Returns canonical object for address or name, None if unknown."""
+        with self.__lock:
+            return self.__find(address, name)
+
+    def intern(self, s_system: StarsSystem) -> StarsSystem:
+        """Returns canonical object for the given one.
+
+        If the system is already registered, missing fields, star class
+        and data of the given object are merged into the canonical one.
+        Otherwise the given object is registered and returned.
+        """
+        if not isinstance(s_system, StarsSystem):
+            raise Raise.error(
+                f"StarsSystem type expected, '{type(s_system)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        with self.__lock:
+            out: Optional[StarsSystem] = self.__find(s_system.address, s_system.name)
+            if out is None:
+                out = s_system
+            elif out is not s_system:
+                if out.address is None:
+                    out.address = s_system.address
+                if out.name is None:
+                    out.name = s_system.name
+                if None in out.star_pos and None not in s_system.star_pos:
+                    out.star_pos = s_system.star_pos
+                if s_system.star_class:
+                    out.star_class = s_system.star_class
+                if s_system.data:
+                    out.data.update(s_system.data)
+            self.__index(out)
+            return out
+
+    def merge(self, data: Dict) -> Optional[StarsSystem]:
+        """Returns canonical object updated from EDSM Api dict.
+
+        A new object is created and registered for an unknown system,
+        None is returned if data has neither id64 nor name.
+        """
+        if not isinstance(data, Dict):
+            return None
+        address: Optional[int] = data.get(EdsmKeys.ID64)
+        name: Optional[str] = data.get(EdsmKeys.NAME)
+        if address is None and not name:
+            return None
+        with self.__lock:
+            out: Optional[StarsSystem] = self.__find(address, name)
+            if out is None:
+                out = StarsSystem()
+            out.update_from_edsm(data)
+            self.__index(out)
+            return out
+
+    def clear(self) -> None:
+        """Forget all registered objects."""
+        with self.__lock:
+            self.__by_address.clear()
+            self.__by_name.clear()
 
 
 # #[EOF]#######################################################################
@@ -0,0 +1,509 @@
+# -*- coding: utf-8 -*-
+"""
+table.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 19:05:52
+
+Purpose: columnar storage of many StarsSystem records.
+"""
+
+import math
+
+from array import array
+from inspect import currentframe
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..basetool.classes import BClasses
+from ..raisetool import Raise
+from .edsm_keys import EdsmKeys
+from .stars import StarsSystem
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    pass
+
+
+# id64 column marker of unknown address
+_NO_ADDRESS: int = -1
+
+
+class StarsSystemTable(BClasses):
+    """StarsSystemTable.
+
+    Columnar container of star systems. Coordinates are kept in one
+    contiguous array('d'), x, y, z for each row, with NaN for unknown
+    values, addresses in a parallel array('q') and names in a list.
+    Star classes and data dicts are sparse and kept in side dicts.
+    Rows are accessed as StarsSystemView objects, zero-copy views
+    reading and writing the columns.
+    """
+
+    __coords: array = None  # type: ignore
+    __ids: array = None  # type: ignore
+    __names: List[Optional[str]] = None  # type: ignore
+    __star_class: Dict[int, str] = None  # type: ignore
+    __data: Dict[int, Dict] = None  # type: ignore
+    # address -> row
+    __index: Dict[int, int] = None  # type: ignore
+    # lowercased name -> row
+    __name_index: Dict[str, int] = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Create empty table."""
+        self.__coords = array("d")
+        self.__ids = array("q")
+        self.__names = []
+        self.__star_class = {}
+        self.__data = {}
+        self.__index = {}
+        self.__name_index = {}
+
+    @classmethod
+    def from_list(cls, systems: Sequence[StarsSystem]) -> "StarsSystemTable":
+        """Returns table with copies of systems data."""
+        table: StarsSystemTable = cls()
+        for s_system in systems:
+            table.append_system(s_system)
+        return table
+
+    @classmethod
+    def from_edsm_many(cls, data: Any) -> "StarsSystemTable":
+        """Returns table built from EDSM Api list of systems.
+
+        Columns are filled directly, entries without a name are skipped.
+        """
+        table: StarsSystemTable = cls()
+        if not isinstance(data, List):
+            return table
+        coords: array = table.__coords
+        ids: array = table.__ids
+        names: List[Optional[str]] = table.__names
+        side: Dict[int, Dict] = table.__data
+        index: Dict[int, int] = table.__index
+        name_index: Dict[str, int] = table.__name_index
+        numbers: Tuple[type, ...] = (int, float)
+        extra_keys: Tuple[str, ...] = (
+            EdsmKeys.BODY_COUNT,
+            EdsmKeys.COORDS_LOCKED,
+            EdsmKeys.REQUIRE_PERMIT,
+            EdsmKeys.DISTANCE,
+        )
+        nan: float = math.nan
+        for item in data:
+            if type(item) is not dict:
+                continue
+            name: Any = item.get(EdsmKeys.NAME)
+            if type(name) is not str:
+                continue
+            row: int = len(names)
+            names.append(name)
+            name_index.setdefault(name.lower(), row)
+            address: Any = item.get(EdsmKeys.ID64)
+            if type(address) is int:
+                ids.append(address)
+                index[address] = row
+            else:
+                ids.append(_NO_ADDRESS)
+            pos: Any = item.get(EdsmKeys.COORDS)
+            if type(pos) is dict:
+                x: Any = pos.get(EdsmKeys.X)
+                y: Any = pos.get(EdsmKeys.Y)
+                z: Any = pos.get(EdsmKeys.Z)
+                coords.append(x if type(x) in numbers else nan)
+                coords.append(y if type(y) in numbers else nan)
+                coords.append(z if type(z) in numbers else nan)
+            else:
+                coords.extend((nan, nan, nan))
+            extra: Dict[str, Any] = {
+                key: item[key] for key in extra_keys if key in item
+            }
+            # number of bodies from streamed summary or the bodies list,
+            # null or other values leave it unset
+            bodies: Any = item.get(EdsmKeys.BODIES)
+            if type(bodies) is int:
+                extra[EdsmKeys.BODIES] = bodies
+            elif type(bodies) is list:
+                extra[EdsmKeys.BODIES] = len(bodies)
+            if extra:
+                side[row] = extra
+        return table
+
+    def to_list(self) -> List[StarsSystem]:
+        """Returns detached StarsSystem objects of all rows."""
+        out: List[StarsSystem] = []
+        for row in range(len(self)):
+            s_system = StarsSystem(
+                name=self.__names[row],
+                address=self.get_address(row),
+                star_pos=[self.get_coord(row, axis) for axis in range(3)],
+            )
+            if row in self.__star_class:
+                s_system.star_class = self.__star_class[row]
+            if row in self.__data:
+                s_system.data = dict(self.__data[row])
+            out.append(s_system)
+        return out
+
+    def views(self) -> List["StarsSystemView"]:
+        """Returns views of all rows."""
+        return [StarsSystemView(self, row) for row in range(len(self))]
+
+    def __len__(self) -> int:
+        """Returns number of rows."""
+        return len(self.__names)
+
+    def __getitem__(self, row: int) -> "StarsSystemView":
+        """Returns view of row, negative numbers count from the end."""
+        return StarsSystemView(self, self.__check_row(row))
+
+    def __iter__(self) -> Iterator["StarsSystemView"]:
+        """Iterates over views of rows."""
+        for row in range(len(self)):
+            yield StarsSystemView(self, row)
+
+    def __repr__(self) -> str:
+        return f"{self._c_name}(rows={len(self)})"
+
+    def __check_row(self, row: int) -> int:
+        """Returns non-negative row number or raises IndexError."""
+        if not isinstance(row, int):
+            raise Raise.error(
+                f"Int type expected, '{type(row)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        size: int = len(self.__names)
+        if row < 0:
+            row += size
+        if not 0 <= row < size:
+            raise Raise.error(
+                f"Row number out of range: '{row}'",
+                IndexError,
+                self._c_name,
+                currentframe(),
+            )
+        return row
+
+    def append(
+        self,
+        name: Optional[str] = None,
+        address: Optional[int] = None,
+        star_pos: Optional[Sequence[Optional[Union[float, int]]]] = None,
+    ) -> int:
+        """Adds row and returns its number."""
+        row: int = len(self.__names)
+        if star_pos is None:
+            star_pos = (None, None, None)
+        if len(star_pos) != 3:
+            raise Raise.error(
+                f"Three coordinates expected, '{star_pos}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__coords.extend(math.nan if value is None else value for value in star_pos)
+        self.__ids.append(_NO_ADDRESS)
+        self.__names.append(None)
+        self.set_name(row, name)
+        if address is not None:
+            self.set_address(row, address)
+        return row
+
+    def append_system(self, s_system: StarsSystem) -> int:
+        """Adds copy of system data and returns its row number."""
+        row: int = self.append(s_system.name, s_system.address, s_system.star_pos)
+        if s_system.star_class:
+            self.__star_class[row] = s_system.star_class
+        if s_system.data:
+            self.__data[row] = dict(s_system.data)
+        return row
+
+    @property
+    def coords(self) -> array:
+        """Returns flat coordinates column, x, y, z for each row.
+
+        Usable directly with SpatialIndex.
+        """
+        return self.__coords
+
+    @property
+    def ids(self) -> array:
+        """Returns id64 column, -1 for unknown address."""
+        return self.__ids
+
+    @property
+    def names(self) -> List[Optional[str]]:
+        """Returns names column."""
+        return self.__names
+
+    def as_numpy(self) -> Any:
+        """Returns numpy (N, 3) float64 view of coordinates.
+
+        The view shares memory with the table, rows cannot be appended
+        while it is alive. Raises NameError if numpy is not available.
+        """
+        return np.frombuffer(self.__coords, dtype=np.float64).reshape(-1, 3)
+
+    def row_of(
+        self, address: Optional[int] = None, name: Optional[str] = None
+    ) -> Optional[int]:
+        """Returns row number of system by address or name, None if not found."""
+        if address is not None and address in self.__index:
+            return self.__index[address]
+        if name is not None:
+            return self.__name_index.get(name.lower())
+        return None
+
+    def get_name(self, row: int) -> Optional[str]:
+        return self.__names[row]
+
+    def set_name(self, row: int, value: Optional[str]) -> None:
+        old: Optional[str] = self.__names[row]
+        self.__names[row] = value
+        if old is not None and self.__name_index.get(old.lower()) == row:
+            # renamed, the next row of the same name takes over
+            key: str = old.lower()
+            del self.__name_index[key]
+            for other, item in enumerate(self.__names):
+                if item is not None and item.lower() == key:
+                    self.__name_index[key] = other
+                    break
+        if value is not None:
+            self.__name_index.setdefault(value.lower(), row)
+
+    def get_address(self, row: int) -> Optional[int]:
+        value: int = self.__ids[row]
+        return None if value == _NO_ADDRESS else value
+
+    def set_address(self, row: int, value: Optional[int]) -> None:
+        old: int = self.__ids[row]
+        if old != _NO_ADDRESS and self.__index.get(old) == row:
+            del self.__index[old]
+        if value is None:
+            self.__ids[row] = _NO_ADDRESS
+        else:
+            self.__ids[row] = value
+            self.__index[value] = row
+
+    def get_coord(self, row: int, axis: int) -> Optional[float]:
+        value: float = self.__coords[3 * row + axis]
+        return None if math.isnan(value) else value
+
+    def set_coord(
+        self, row: int, axis: int, value: Optional[Union[float, int]]
+    ) -> None:
+        self.__coords[3 * row + axis] = math.nan if value is None else value
+
+    def get_star_class(self, row: int) -> str:
+        return self.__star_class.get(row, "")
+
+    def set_star_class(self, row: int, value: str) -> None:
+        self.__star_class[row] = value
+
+    def get_data(self, row: int) -> Dict:
+        """Returns data dict of row, created on first use."""
+        data: Optional[Dict] = self.__data.get(row)
+        if data is None:
+            data = self.__data[row] = {}
+        return data
+
+    def set_data(self, row: int, value: Optional[Dict]) -> None:
+        self.__data[row] = {} if value is None else value
+
+    def position(self, row: int) -> Tuple[float, float, float]:
+        """Returns coordinates of row, NaN for unknown values."""
+        coords: array = self.__coords
+        return (coords[3 * row], coords[3 * row + 1], coords[3 * row + 2])
+
+    def distance(self, row_1: int, row_2: int) -> float:
+        """Returns distance between two rows."""
+        coords: array = self.__coords
+        return math.sqrt(
+            (coords[3 * row_1] - coords[3 * row_2]) ** 2
+            + (coords[3 * row_1 + 1] - coords[3 * row_2 + 1]) ** 2
+            + (coords[3 * row_1 + 2] - coords[3 * row_2 + 2]) ** 2
+        )
+
+    def distances(self, point: Sequence[float]) -> array:
+        """Returns array('d') of distances from point to all rows."""
+        try:
+            points = self.as_numpy()
+            out: array = array("d")
+            out.frombytes(
+                np.sqrt(((points - np.asarray(point, dtype=np.float64)) ** 2).sum(1))
+                .astype(np.float64)
+                .tobytes()
+            )
+            del points
+            return out
+        except NameError:
+            pass
+        x, y, z = (float(point[0]), float(point[1]), float(point[2]))
+        coords: array = self.__coords
+        return array(
+            "d",
+            (
+                math.sqrt(
+                    (coords[idx] - x) ** 2
+                    + (coords[idx + 1] - y) ** 2
+                    + (coords[idx + 2] - z) ** 2
+                )
+                for idx in range(0, len(coords), 3)
+            ),
+        )
+
+
+class StarsSystemView(StarsSystem):
+    """StarsSystemView.
+
+    StarsSystem reading and writing one row of StarsSystemTable.
+    """
+
+    __slots__ = ("__table", "__row")
+
+    def __init__(self, table: StarsSystemTable, row: int) -> None:
+        """Create view of table row."""
+        self.__table = table
+        self.__row = row
+
+    @property
+    def table(self) -> StarsSystemTable:
+        """Returns table of the view."""
+        return self.__table
+
+    @property
+    def row(self) -> int:
+        """Returns row number of the view."""
+        return self.__row
+
+    def __coord(self, value: Any, frame: Any) -> Optional[Union[float, int]]:
+        """Returns checked coordinate value."""
+        if value is None or isinstance(value, (int, float)):
+            return value
+        raise Raise.error(
+            f"Optional[Union[float, int]] type expected, '{type(value)}' received",
+            TypeError,
+            self._c_name,
+            frame,
+        )
+
+    @property
+    def address(self) -> Optional[int]:
+        """Returns address of the star system."""
+        return self.__table.get_address(self.__row)
+
+    @address.setter
+    def address(self, arg: Optional[Union[int, str]]) -> None:
+        """Sets address of the star system."""
+        if isinstance(arg, str):
+            arg = int(arg)
+        if arg is not None and not isinstance(arg, int):
+            raise Raise.error(
+                f"Optional[int] type expected, '{type(arg)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__table.set_address(self.__row, arg)
+
+    @property
+    def data(self) -> Dict:
+        """Returns data container."""
+        return self.__table.get_data(self.__row)
+
+    @data.setter
+    def data(self, value: Optional[Dict]) -> None:
+        """Initialize or set data container."""
+        if value is not None and not isinstance(value, Dict):
+            raise Raise.error(
+                f"Dict type expected, '{type(value)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__table.set_data(self.__row, value)
+
+    @property
+    def name(self) -> Optional[str]:
+        """Returns name of the star system."""
+        return self.__table.get_name(self.__row)
+
+    @name.setter
+    def name(self, arg: Optional[str]) -> None:
+        """Sets name of the star system."""
+        if arg is not None and not isinstance(arg, str):
+            raise Raise.error(
+                f"Optional[str] type expected, '{type(arg)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__table.set_name(self.__row, arg)
+
+    @property
+    def pos_x(self) -> Optional[Union[float, int]]:
+        """Returns pos_x of the star system."""
+        return self.__table.get_coord(self.__row, 0)
+
+    @pos_x.setter
+    def pos_x(self, arg: Optional[Union[float, int]]) -> None:
+        """Sets pos_x of the star system."""
+        self.__table.set_coord(self.__row, 0, self.__coord(arg, currentframe()))
+
+    @property
+    def pos_y(self) -> Optional[Union[float, int]]:
+        """Returns pos_y of the star system."""
+        return self.__table.get_coord(self.__row, 1)
+
+    @pos_y.setter
+    def pos_y(self, arg: Optional[Union[float, int]]) -> None:
+        """Sets pos_y of the star system."""
+        self.__table.set_coord(self.__row, 1, self.__coord(arg, currentframe()))
+
+    @property
+    def pos_z(self) -> Optional[Union[float, int]]:
+        """Returns pos_z of the star system."""
+        return self.__table.get_coord(self.__row, 2)
+
+    @pos_z.setter
+    def pos_z(self, arg: Optional[Union[float, int]]) -> None:
+        """Sets pos_z of the star system."""
+        self.__table.set_coord(self.__row, 2, self.__coord(arg, currentframe()))
+
+    @property
+    def star_pos(self) -> Tuple:
+        """Returns the star position tuple read from the table."""
+        table: StarsSystemTable = self.__table
+        row: int = self.__row
+        return (
+            table.get_coord(row, 0),
+            table.get_coord(row, 1),
+            table.get_coord(row, 2),
+        )
+
+    @star_pos.setter
+    def star_pos(self, arg: Optional[Union[List, Tuple]] = None) -> None:
+        """Sets the star position in the table."""
+        StarsSystem.star_pos.fset(self, arg)  # type: ignore
+
+    @property
+    def star_class(self) -> str:
+        """Returns star class string."""
+        return self.__table.get_star_class(self.__row)
+
+    @star_class.setter
+    def star_class(self, value: str) -> None:
+        """Sets star class string."""
+        if not isinstance(value, str):
+            raise Raise.error(
+                f"str type expected, '{type(value)}' received",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__table.set_star_class(self.__row, value)
+
+
+# #[EOF]#######################################################################
@@ -17,8 +17,13 @@ class CheckerKeys(object, metaclass=ReadOnlyClass):
     # base data
     JUMP_SYSTEM: str = "_js_"
     PLUGIN_NAME: str = "_pn_"
+    PREFETCH_DEPTH: str = "_pf_depth_"
+    ROUTE: str = "_route_"
+    SEARCH_WORKERS: str = "_search_workers_"
     SHUTTING_DOWN: str = "_shut_d_"
     STATUS: str = "__status__"
+    STATUS_CHANNEL: str = "__status_channel__"
+    TH_PREFETCH: str = "__prefetch__"
     TH_SEARCH: str = "__search__"
     VERSION: str = "_ver_"
 
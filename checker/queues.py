@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+"""
+  queues.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 10:12:41
+
+  Purpose: queue classes for search engine.
+"""
+
+import heapq
+import tkinter as tk
+
+from concurrent.futures import Future
+from queue import Empty
+from threading import Condition, Lock
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from checker.jsktoolbox.basetool.classes import BClasses
+from checker.jsktoolbox.edmctool.edsm import Priority
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+
+class CoalescingQueue(BClasses):
+    """CoalescingQueue class.
+
+    Single slot queue with latest-wins semantics. Putting a new item
+    replaces the pending one and bumps the generation counter, so
+    a consumer can detect that the item it is working on was superseded.
+    """
+
+    __cond: Condition = None  # type: ignore
+    __item: Any = None
+    __pending: bool = None  # type: ignore
+    __generation: int = None  # type: ignore
+    __timestamp: float = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.__cond = Condition()
+        self.__item = None
+        self.__pending = False
+        self.__generation = 0
+        self.__timestamp = 0.0
+
+    def __repr__(self) -> str:
+        return f"{self._c_name}(generation={self.__generation}, item={self.__item})"
+
+    @property
+    def generation(self) -> int:
+        """Returns generation number of the newest item."""
+        with self.__cond:
+            return self.__generation
+
+    @property
+    def timestamp(self) -> float:
+        """Returns time.perf_counter() value of the newest put."""
+        with self.__cond:
+            return self.__timestamp
+
+    def is_stale(self, generation: int) -> bool:
+        """Checks if an item of given generation was superseded."""
+        with self.__cond:
+            return generation != self.__generation
+
+    def empty(self) -> bool:
+        """Checks if there is no pending item."""
+        with self.__cond:
+            return not self.__pending
+
+    def qsize(self) -> int:
+        """Returns number of pending items, 0 or 1."""
+        with self.__cond:
+            return 1 if self.__pending else 0
+
+    def put(
+        self, item: Any, block: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        """Put item to queue, replacing the pending one.
+
+        Arguments block and timeout are accepted for queue.Queue
+        compatibility, the call never blocks.
+        """
+        with self.__cond:
+            self.__item = item
+            self.__pending = True
+            self.__generation += 1
+            self.__timestamp = perf_counter()
+            self.__cond.notify_all()
+
+    def put_nowait(self, item: Any) -> None:
+        """Put item to queue without blocking."""
+        self.put(item, block=False)
+
+    def get_latest(
+        self, block: bool = True, timeout: Optional[float] = None
+    ) -> Tuple[int, Any]:
+        """Remove and return the newest item with its generation number.
+
+        ### Arguments
+        * block [bool] - wait for an item if the queue is empty,
+        * timeout [Optional[float]] - maximum time to wait in seconds.
+
+        Raises queue.Empty if no item is available.
+        """
+        with self.__cond:
+            if not block:
+                if not self.__pending:
+                    raise Empty
+            elif timeout is None:
+                while not self.__pending:
+                    self.__cond.wait()
+            else:
+                end: float = monotonic() + timeout
+                while not self.__pending:
+                    remaining: float = end - monotonic()
+                    if remaining <= 0.0:
+                        raise Empty
+                    self.__cond.wait(remaining)
+            item: Any = self.__item
+            self.__item = None
+            self.__pending = False
+            return self.__generation, item
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return the newest item."""
+        return self.get_latest(block, timeout)[1]
+
+    def get_nowait(self) -> Any:
+        """Remove and return the newest item without blocking."""
+        return self.get(block=False)
+
+
+class LookupJob(BClasses):
+    """LookupJob.
+
+    System lookup scheduled in LookupQueue. The future is resolved
+    with the updated StarsSystem, or None for a system unknown to EDSM.
+    """
+
+    item: StarsSystem = None  # type: ignore
+    key: Any = None
+    priority: int = None  # type: ignore
+    # foreground generation the job belongs to
+    generation: int = None  # type: ignore
+    # time.perf_counter() value of the request
+    queued: float = None  # type: ignore
+    future: Future = None  # type: ignore
+
+    def __init__(
+        self, item: StarsSystem, key: Any, priority: int, queued: float
+    ) -> None:
+        """Constructor."""
+        self.item = item
+        self.key = key
+        self.priority = priority
+        self.generation = 0
+        self.queued = queued
+        self.future = Future()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self._c_name}(key={self.key!r}, priority={self.priority}, "
+            f"generation={self.generation})"
+        )
+
+
+class LookupQueue(BClasses):
+    """LookupQueue.
+
+    Priority queue of system lookups shared by a pool of search workers.
+    Jobs are deduplicated by system address, or by name if the address
+    is unknown: a request for a pending or running system returns
+    the existing job, raising its priority if needed. The foreground lane
+    keeps latest-wins semantics, a new foreground target cancels pending
+    foreground jobs of previous targets and bumps the generation counter.
+    """
+
+    __cond: Condition = None  # type: ignore
+    __heap: List[Tuple[int, int, LookupJob]] = None  # type: ignore
+    __pending: Dict[Any, LookupJob] = None  # type: ignore
+    __running: Dict[Any, LookupJob] = None  # type: ignore
+    __sequence: int = None  # type: ignore
+    __generation: int = None  # type: ignore
+    __closed: bool = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.__cond = Condition()
+        self.__heap = []
+        self.__pending = {}
+        self.__running = {}
+        self.__sequence = 0
+        self.__generation = 0
+        self.__closed = False
+
+    def __repr__(self) -> str:
+        return (
+            f"{self._c_name}(pending={len(self.__pending)}, "
+            f"running={len(self.__running)}, generation={self.__generation})"
+        )
+
+    @staticmethod
+    def key(item: StarsSystem) -> Any:
+        """Returns deduplication key of system."""
+        if item.address is not None:
+            return item.address
+        return (item.name or "").lower()
+
+    @property
+    def generation(self) -> int:
+        """Returns generation number of the newest foreground target."""
+        with self.__cond:
+            return self.__generation
+
+    def is_stale(self, job: LookupJob) -> bool:
+        """Checks if a foreground job was superseded by a newer target."""
+        with self.__cond:
+            return (
+                job.priority == Priority.FOREGROUND
+                and job.generation != self.__generation
+            )
+
+    def qsize(self) -> int:
+        """Returns number of pending jobs."""
+        with self.__cond:
+            return len(self.__pending)
+
+    def running(self) -> int:
+        """Returns number of jobs being processed."""
+        with self.__cond:
+            return len(self.__running)
+
+    def __push(self, job: LookupJob) -> None:
+        """Adds heap entry for job, outdated entries are skipped by get()."""
+        self.__sequence += 1
+        heapq.heappush(self.__heap, (job.priority, self.__sequence, job))
+        self.__cond.notify()
+
+    def put(
+        self,
+        item: StarsSystem,
+        priority: int = Priority.FOREGROUND,
+        queued: Optional[float] = None,
+    ) -> LookupJob:
+        """Schedule lookup of system and return its job.
+
+        ### Arguments
+        * item [StarsSystem] - system to look up,
+        * priority [int] - Priority lane of the lookup,
+        * queued [Optional[float]] - time.perf_counter() value of the request,
+          now if None.
+        """
+        cancelled: List[LookupJob] = []
+        with self.__cond:
+            key: Any = self.key(item)
+            if priority == Priority.FOREGROUND:
+                self.__generation += 1
+                for old in list(self.__pending.values()):
+                    if old.priority == Priority.FOREGROUND and old.key != key:
+                        del self.__pending[old.key]
+                        cancelled.append(old)
+            job: Optional[LookupJob] = self.__pending.get(key, self.__running.get(key))
+            if job is None:
+                job = LookupJob(
+                    item, key, priority, queued if queued else perf_counter()
+                )
+                self.__pending[key] = job
+                self.__push(job)
+            elif priority < job.priority:
+                job.priority = priority
+                if queued:
+                    job.queued = queued
+                if key in self.__pending:
+                    self.__push(job)
+            if priority == Priority.FOREGROUND:
+                job.generation = self.__generation
+        # callbacks of the futures run outside of the lock
+        for old in cancelled:
+            old.future.cancel()
+        return job
+
+    def get(self, timeout: Optional[float] = None) -> Optional[LookupJob]:
+        """Remove and return the most urgent job, mark it as running.
+
+        Returns None if the queue was closed. Raises queue.Empty
+        on timeout.
+        """
+        with self.__cond:
+            end: Optional[float] = None if timeout is None else monotonic() + timeout
+            while True:
+                while self.__heap:
+                    priority, _, job = heapq.heappop(self.__heap)
+                    if self.__pending.get(job.key) is job and priority == job.priority:
+                        del self.__pending[job.key]
+                        if job.future.set_running_or_notify_cancel():
+                            self.__running[job.key] = job
+                            return job
+                if self.__closed:
+                    return None
+                if end is None:
+                    self.__cond.wait()
+                else:
+                    remaining: float = end - monotonic()
+                    if remaining <= 0.0:
+                        raise Empty
+                    self.__cond.wait(remaining)
+
+    def done(
+        self,
+        job: LookupJob,
+        result: Optional[StarsSystem] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Finish running job with result or error."""
+        with self.__cond:
+            if self.__running.get(job.key) is job:
+                del self.__running[job.key]
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def clear(self, priority: int) -> None:
+        """Cancel pending jobs of the Priority lane."""
+        cancelled: List[LookupJob] = []
+        with self.__cond:
+            for job in list(self.__pending.values()):
+                if job.priority == priority:
+                    del self.__pending[job.key]
+                    cancelled.append(job)
+        for job in cancelled:
+            job.future.cancel()
+
+    def close(self) -> None:
+        """Cancel pending jobs and wake up all waiting workers."""
+        with self.__cond:
+            self.__closed = True
+            cancelled: List[LookupJob] = list(self.__pending.values())
+            self.__pending.clear()
+            self.__heap.clear()
+            self.__cond.notify_all()
+        for job in cancelled:
+            job.future.cancel()
+
+
+class StatusRecord(NamedTuple):
+    """Immutable status line posted by a worker thread."""
+
+    text: str
+    # time.perf_counter() value of the post
+    posted: float
+    sequence: int
+
+
+class StatusChannel(BClasses):
+    """StatusChannel.
+
+    Publication channel of status lines from worker threads to Tk.
+    Workers post immutable StatusRecord objects and the newest one wins.
+    The Tk side drains the channel from an after() callback at most once
+    per interval and sets the variable only if the text has changed,
+    so no Tcl call is made from a worker thread. The callback runs only
+    while the busy check reports a pending lookup or a record is waiting,
+    wake() restarts it when a new lookup is requested.
+    """
+
+    __lock: Lock = None  # type: ignore
+    __record: Optional[StatusRecord] = None
+    __taken: int = None  # type: ignore
+    __shown: int = None  # type: ignore
+    __var: Optional[tk.StringVar] = None
+    __widget: Optional[tk.Misc] = None
+    __after_id: Optional[str] = None
+    __interval: int = None  # type: ignore
+    __busy: Optional[Callable[[], bool]] = None
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.__lock = Lock()
+        self.__taken = 0
+        self.__shown = 0
+        self.__interval = 50
+
+    def __repr__(self) -> str:
+        return f"{self._c_name}(record={self.__record})"
+
+    def post(self, text: str) -> StatusRecord:
+        """Publish status line, safe to call from any thread."""
+        with self.__lock:
+            sequence: int = self.__record.sequence + 1 if self.__record else 1
+            self.__record = StatusRecord(str(text), perf_counter(), sequence)
+            return self.__record
+
+    @property
+    def latest(self) -> Optional[StatusRecord]:
+        """Returns the newest posted record."""
+        with self.__lock:
+            return self.__record
+
+    def take(self) -> Optional[StatusRecord]:
+        """Returns the newest record if it was not taken yet.
+
+        Records posted between two calls are coalesced into the last one.
+        """
+        with self.__lock:
+            if self.__record is None or self.__record.sequence == self.__taken:
+                return None
+            self.__taken = self.__record.sequence
+            return self.__record
+
+    @property
+    def posted(self) -> int:
+        """Returns number of posted records."""
+        with self.__lock:
+            return self.__record.sequence if self.__record else 0
+
+    @property
+    def shown(self) -> int:
+        """Returns number of records set to the Tk variable."""
+        return self.__shown
+
+    def attach(
+        self,
+        var: tk.StringVar,
+        widget: tk.Misc,
+        interval: int = 50,
+        busy: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Start draining the channel into var, call from the Tk thread.
+
+        ### Arguments
+        * var [tk.StringVar] - variable of the status widget,
+        * widget [tk.Misc] - widget used to schedule the after() callback,
+        * interval [int] - drain period in milliseconds, a few frames,
+        * busy [Optional[Callable[[], bool]]] - checks if a lookup will
+          post more records, the records are drained once if None.
+        """
+        self.detach()
+        self.__var = var
+        self.__widget = widget
+        self.__interval = interval
+        self.__busy = busy
+        self.wake()
+
+    def wake(self) -> None:
+        """Drain the channel until the lookups finish, call from the Tk thread."""
+        if self.__after_id is None:
+            self.__poll()
+
+    def detach(self) -> None:
+        """Stop draining the channel, call from the Tk thread."""
+        after_id: Optional[str] = self.__after_id
+        self.__after_id = None
+        if after_id and self.__widget is not None:
+            try:
+                self.__widget.after_cancel(after_id)
+            except tk.TclError:
+                pass
+        self.__var = None
+        self.__widget = None
+        self.__busy = None
+
+    def __poll(self) -> None:
+        """Set the newest record to the variable and reschedule."""
+        self.__after_id = None
+        if self.__var is None or self.__widget is None:
+            return None
+        # checked before take(), the final record is posted before
+        # the lookup stops being busy
+        busy: bool = self.__busy is not None and self.__busy()
+        record: Optional[StatusRecord] = self.take()
+        if record is not None:
+            self.__shown += 1
+            if self.__var.get() != record.text:
+                self.__var.set(record.text)
+        elif not busy:
+            # idle until the next wake()
+            return None
+        try:
+            self.__after_id = self.__widget.after(self.__interval, self.__poll)
+        except tk.TclError:
+            # widget destroyed
+            self.__after_id = None
+
+
+# #[EOF]#######################################################################
@@ -7,39 +7,207 @@
   Purpose: 
 """
 
-from time import sleep
-import tkinter as tk
-
-from typing import Optional, Union, Dict, Any
+from typing import Callable, List, Optional, Union, Dict, Any
 from queue import Empty, Queue, SimpleQueue
 from threading import Event, Thread
+from time import perf_counter
+from functools import partial
+from inspect import currentframe
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 from checker.jsktoolbox.basetool.threads import ThBaseObject
 from checker.jsktoolbox.attribtool import ReadOnlyClass
+from checker.jsktoolbox.raisetool import Raise
 
 from checker.jsktoolbox.edmctool.base import BLogClient
 from checker.jsktoolbox.edmctool.stars import StarsSystem
 from checker.jsktoolbox.edmctool.logs import LogClient
-from checker.jsktoolbox.edmctool.edsm import Url
+from checker.jsktoolbox.edmctool.metrics import Metrics
+from checker.jsktoolbox.edmctool.edsm import EdsmCache, FieldsProfile, Priority, Url
 from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
 
+from checker.queues import CoalescingQueue, LookupJob, LookupQueue, StatusChannel
+
 
 class _Keys(object, metaclass=ReadOnlyClass):
     """Private Keys class."""
 
+    Q_PREFETCH: str = "__q_prefetch__"
     Q_SEARCH: str = "__q_search__"
     EXIT: str = "__exit__"
+    FIELDS: str = "__fields__"
+    FINISHED: str = "__finished__"
+    IDLE: str = "__idle__"
+    LOOKUPS: str = "__lookups__"
+    METRICS: str = "__metrics__"
+    METRICS_INTERVAL: str = "__metrics_interval__"
     STATUS: str = "__status__"
+    URL: str = "__url__"
+    URL_FACTORY: str = "__url_factory__"
+    WORKERS: str = "__workers__"
+
+
+class ThSearchWorker(ThBaseObject, BLogClient, Thread):
+    """Search pool worker.
+
+    Takes jobs from the shared LookupQueue, most urgent first, and
+    resolves them with its own pooled Url object.
+    """
+
+    def __init__(
+        self,
+        log_queue: Union[Queue, SimpleQueue],
+        lookups: LookupQueue,
+        url_factory: Callable[[], Url],
+        metrics: Metrics,
+        number: int = 0,
+        fields: Optional[FieldsProfile] = None,
+    ) -> None:
+        Thread.__init__(self, name=f"{self._c_name}-{number}", daemon=True)
+        self._stop_event = Event()
+
+        # init log subsystem
+        self.logger = LogClient(log_queue)
+
+        self._set_data(key=_Keys.LOOKUPS, value=lookups, set_default_type=LookupQueue)
+        self._set_data(
+            key=_Keys.URL_FACTORY, value=url_factory, set_default_type=Callable
+        )
+        self._set_data(key=_Keys.METRICS, value=metrics, set_default_type=Metrics)
+        # EDSM client, created on the worker thread
+        self._set_data(key=_Keys.URL, value=None, set_default_type=Optional[Url])
+        # EXIT flag
+        self._set_data(key=_Keys.EXIT, value=False, set_default_type=bool)
+        # the status line fields by default
+        self._set_data(
+            key=_Keys.FIELDS,
+            value=fields if fields is not None else FieldsProfile.status(),
+            set_default_type=FieldsProfile,
+        )
+
+    @property
+    def lookups(self) -> LookupQueue:
+        return self._get_data(
+            key=_Keys.LOOKUPS,
+        )  # type: ignore
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._get_data(
+            key=_Keys.METRICS,
+        )  # type: ignore
+
+    def __timed(self, name: str, method: Callable, *args: Any) -> Any:
+        """Calls method and records its duration as span name."""
+        with self.metrics.span(name):
+            return method(*args)
+
+    def __lookup(
+        self, url: Url, executor: ThreadPoolExecutor, job: LookupJob
+    ) -> Optional[StarsSystem]:
+        """Returns system updated with EDSM data, None if unknown."""
+        item: StarsSystem = job.item
+        url.priority = job.priority
+        fields: FieldsProfile = url.fields
+        # only the endpoints needed by the fields profile are queried,
+        # the system and bodies requests are issued concurrently
+        f_system: Optional[Future] = None
+        f_bodies: Optional[Future] = None
+        if fields.system:
+            f_system = executor.submit(
+                self.__timed, "fetch.system", url.system_query, item
+            )
+        if fields.bodies:
+            f_bodies = executor.submit(
+                self.__timed, "fetch.bodies", url.bodies_query, item
+            )
+        if f_system is not None:
+            system: Optional[Dict[str, Any]] = f_system.result()
+            self.logger.debug = f"{self._c_name}: {system}"
+            if not system:
+                if f_bodies is not None:
+                    f_bodies.cancel()
+                return None
+            with self.metrics.span("update_from_edsm"):
+                item.update_from_edsm(system)
+        if f_bodies is None:
+            return item
+        if f_system is not None and self.lookups.is_stale(job):
+            # the commander has already selected another target
+            f_bodies.cancel()
+            return item
+        bodies = f_bodies.result()
+        if bodies and isinstance(bodies, Dict):
+            with self.metrics.span("update_from_edsm"):
+                item.update_from_edsm(bodies)
+        elif f_system is None:
+            # without the system endpoint the empty answer means unknown
+            return None
+        return item
+
+    def run(self) -> None:
+        """Go to work."""
+
+        url: Url = self._get_data(key=_Keys.URL_FACTORY)()  # type: ignore
+        if url.metrics is None:
+            url.metrics = self.metrics
+        url.fields = self._get_data(key=_Keys.FIELDS)  # type: ignore
+        self._set_data(key=_Keys.URL, value=url)
+        if self._get_data(key=_Keys.EXIT):
+            url.abort()
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=self.name)
+
+        self.logger.debug = f"{self.name} start"
+
+        while True:
+            # returns None when the queue is closed
+            job: Optional[LookupJob] = self.lookups.get()
+            if job is None:
+                break
+            if job.priority == Priority.FOREGROUND:
+                self.metrics.observe("queue_wait", perf_counter() - job.queued)
+            try:
+                result: Optional[StarsSystem] = self.__lookup(url, executor, job)
+            except Exception as ex:
+                self.logger.warning = f"{self.name}: lookup failed: {ex}"
+                self.lookups.done(job, error=ex)
+            else:
+                self.lookups.done(job, result)
+
+        executor.shutdown(wait=True, cancel_futures=True)
+        url.close()
+        self.logger.debug = f"{self.name} end"
+
+    def abort(self) -> None:
+        """Set exit flag and abort requests of the worker."""
+        self._set_data(key=_Keys.EXIT, value=True)
+        url: Optional[Url] = self._get_data(key=_Keys.URL)
+        if url is not None:
+            url.abort()
 
 
 class ThSearchSystem(ThBaseObject, BLogClient, Thread):
-    """Threaded system search engine."""
+    """Threaded system search engine.
+
+    Dispatches jump targets to a pool of ThSearchWorker threads through
+    a shared LookupQueue and posts their status lines. A lookup in
+    progress never blocks the next target, route prefetch jobs use
+    the same pool in a lower priority lane.
+    """
+
+    # seconds to wait for the workers at shutdown
+    JOIN_TIMEOUT: float = 5.0
 
     def __init__(
         self,
         log_queue: Union[Queue, SimpleQueue],
-        status: tk.StringVar,
+        status: StatusChannel,
+        url_factory: Optional[Callable[[], Url]] = None,
+        metrics: Optional[Metrics] = None,
+        metrics_interval: int = 600,
+        workers: int = 3,
+        fields: Optional[FieldsProfile] = None,
     ) -> None:
         Thread.__init__(self, name=self._c_name, daemon=True)
         self._stop_event = Event()
@@ -47,88 +215,356 @@ class ThSearchSystem(ThBaseObject, BLogClient, Thread):
         # init log subsystem
         self.logger = LogClient(log_queue)
 
-        # status
-        self._set_data(key=_Keys.STATUS, value=status, set_default_type=tk.StringVar)
+        if not isinstance(workers, int) or workers < 1:
+            raise Raise.error(
+                f"Positive int expected for workers, '{workers}' received",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+
+        # EDSM client factory, called on each worker thread
+        if url_factory is None:
+            url_factory = lambda: Url(cache=EdsmCache())
+
+        # timing spans and counters, written to the log every
+        # metrics_interval seconds if anything was recorded
+        self._set_data(
+            key=_Keys.METRICS,
+            value=metrics if metrics is not None else Metrics(),
+            set_default_type=Metrics,
+        )
+        self._set_data(
+            key=_Keys.METRICS_INTERVAL, value=metrics_interval, set_default_type=int
+        )
+
+        # status lines, drained by the Tk thread
+        self._set_data(key=_Keys.STATUS, value=status, set_default_type=StatusChannel)
+
+        # init search queue, only the newest target is kept
+        self._set_data(
+            key=_Keys.Q_SEARCH,
+            value=CoalescingQueue(),
+            set_default_type=CoalescingQueue,
+        )
+        # search queue generation of the last target with its final status
+        self._set_data(key=_Keys.FINISHED, value=0, set_default_type=int)
+
+        # lookup jobs shared by the workers pool
+        self._set_data(
+            key=_Keys.LOOKUPS, value=LookupQueue(), set_default_type=LookupQueue
+        )
+        self._set_data(
+            key=_Keys.WORKERS,
+            value=[
+                ThSearchWorker(
+                    log_queue, self.lookups, url_factory, self.metrics, number, fields
+                )
+                for number in range(workers)
+            ],
+            set_default_type=List,
+        )
 
-        # init search queue
-        self._set_data(key=_Keys.Q_SEARCH, value=Queue(), set_default_type=Queue)
+        # cleared while a foreground lookup is in progress
+        self._set_data(key=_Keys.IDLE, value=Event(), set_default_type=Event)
+        self.idle.set()
 
         # EXIT flag
         self._set_data(key=_Keys.EXIT, value=False, set_default_type=bool)
 
     @property
-    def status(self) -> tk.StringVar:
+    def idle(self) -> Event:
+        """Returns event set when no foreground lookup is running."""
+        return self._get_data(
+            key=_Keys.IDLE,
+        )  # type: ignore
+
+    @property
+    def busy(self) -> bool:
+        """Checks if the newest target still waits for its final status."""
+        return self._get_data(key=_Keys.FINISHED) != self.search_queue.generation
+
+    @property
+    def lookups(self) -> LookupQueue:
+        """Returns lookup queue shared by the workers pool."""
+        return self._get_data(
+            key=_Keys.LOOKUPS,
+        )  # type: ignore
+
+    @property
+    def metrics(self) -> Metrics:
+        """Returns timing spans and counters of the lookups."""
+        return self._get_data(
+            key=_Keys.METRICS,
+        )  # type: ignore
+
+    @property
+    def status(self) -> StatusChannel:
         return self._get_data(
             key=_Keys.STATUS,
         )  # type: ignore
 
     @property
-    def search_queue(self) -> Queue:
+    def search_queue(self) -> CoalescingQueue:
         return self._get_data(
             key=_Keys.Q_SEARCH,
         )  # type: ignore
 
+    @property
+    def workers(self) -> List[ThSearchWorker]:
+        """Returns workers of the pool."""
+        return self._get_data(
+            key=_Keys.WORKERS,
+        )  # type: ignore
+
+    def __status_line(self, item: StarsSystem) -> str:
+        """Returns formatted status string for given system."""
+        out: str = ""
+        if EdsmKeys.BODY_COUNT in item.data and EdsmKeys.BODIES in item.data:
+            bodies = item.data[EdsmKeys.BODIES]
+            count = item.data[EdsmKeys.BODY_COUNT]
+            if not f"{bodies}".isnumeric():
+                bodies = "??"
+            if not f"{count}".isnumeric():
+                count = "??"
+            out = f"[{bodies}/{count}]"
+        else:
+            out = "[??/??]"
+        if EdsmKeys.COORDS_LOCKED in item.data:
+            if item.data[EdsmKeys.COORDS_LOCKED]:
+                out = f"Lock {out}"
+            else:
+                out = f"Unlock {out}"
+        if EdsmKeys.REQUIRE_PERMIT in item.data and item.data[EdsmKeys.REQUIRE_PERMIT]:
+            out = f"Permit {out}"
+            self.logger.debug = f"OUT: {out}"
+        return f"{item.name} - {out}"
+
+    def __set_status(self, value: str, queued: float) -> None:
+        """Posts final status line and records time-to-status."""
+        self.status.post(value)
+        self.metrics.observe("time_to_status", perf_counter() - queued)
+
+    def __done(
+        self, name: str, target: int, generation: int, queued: float, future: Future
+    ) -> None:
+        """Posts status of finished foreground lookup, runs on a worker."""
+        if future.cancelled() or self.lookups.generation != generation:
+            self.metrics.increment("superseded")
+            self.logger.debug = f"superseded: {name}"
+            return None
+        try:
+            if future.exception() is None:
+                item: Optional[StarsSystem] = future.result()
+                if item is None:
+                    self.__set_status(f"{name} - system unknown", queued)
+                else:
+                    self.logger.debug = f"system information: {item}"
+                    with self.metrics.span("format"):
+                        line: str = self.__status_line(item)
+                    self.__set_status(line, queued)
+            else:
+                # the status was cleared when the lookup was queued
+                self.metrics.increment("failed")
+                self.status.post(f"{name} - lookup failed")
+        finally:
+            self._set_data(key=_Keys.FINISHED, value=target)
+            self.idle.set()
+
     def run(self) -> None:
         """Go to work."""
 
-        url = Url()
+        interval: int = self._get_data(key=_Keys.METRICS_INTERVAL)  # type: ignore
+        for worker in self.workers:
+            worker.start()
 
         self.logger.debug = f"{self._c_name} start"
 
+        last_report: float = perf_counter()
         while not self._get_data(key=_Keys.EXIT):
+            # sleeps until a target arrives, the report is due or quit()
+            # wakes the thread
+            target: int = 0
             try:
-                item: StarsSystem = self.search_queue.get_nowait()
-                # processing
-                if item and item.name:
-                    system: Optional[Dict[str, Any]] = url.system_query(item)
-                    self.logger.debug = f"{self._c_name}: {system}"
-                    if system:
-                        self.status.set("")
-                        item.update_from_edsm(system)
-                        query: str = url.bodies_url(item)
-                        self.logger.debug = f"url: {query}"
-                        bodies = url.url_query(query)
-                        if bodies and isinstance(bodies, Dict):
-                            item.update_from_edsm(bodies)
-                            self.logger.debug = f"system information: {item}"
-                            out: str = ""
-                            if (
-                                EdsmKeys.BODY_COUNT in item.data
-                                and EdsmKeys.BODIES in item.data
-                            ):
-                                bodies = item.data[EdsmKeys.BODIES]
-                                count = item.data[EdsmKeys.BODY_COUNT]
-                                if not f"{bodies}".isnumeric():
-                                    bodies = "??"
-                                if not f"{count}".isnumeric():
-                                    count = "??"
-                                out = f"[{bodies}/{count}]"
-                            else:
-                                out = "[??/??]"
-                            if EdsmKeys.COORDS_LOCKED in item.data:
-                                if item.data[EdsmKeys.COORDS_LOCKED]:
-                                    out = f"Lock {out}"
-                                else:
-                                    out = f"Unlock {out}"
-                            if (
-                                EdsmKeys.REQUIRE_PERMIT in item.data
-                                and item.data[EdsmKeys.REQUIRE_PERMIT]
-                            ):
-                                out = f"Permit {out}"
-                                self.logger.debug = f"OUT: {out}"
-                            self.status.set(f"{item.name} - {out}")
-
-                    else:
-                        self.status.set(f"{item.name} - system unknown")
-
+                target, item = self.search_queue.get_latest(
+                    timeout=max(0.0, last_report + interval - perf_counter())
+                )
             except Empty:
-                sleep(0.5)
+                item = None
+            if perf_counter() >= last_report + interval:
+                last_report = perf_counter()
+                if self.metrics.changed:
+                    self.logger.info = self.metrics.report()
+            if self._get_data(key=_Keys.EXIT):
+                break
+            if not item or not item.name:
+                if target:
+                    self._set_data(key=_Keys.FINISHED, value=target)
+                continue
+            queued: float = self.search_queue.timestamp
+            self.idle.clear()
+            # clears the status of the previous target
+            self.status.post("")
+            job: LookupJob = self.lookups.put(item, Priority.FOREGROUND, queued)
+            job.future.add_done_callback(
+                partial(self.__done, item.name, target, job.generation, queued)
+            )
+
+        self.lookups.close()
+        # a worker can be inside a request until its timeout,
+        # the threads are daemons and are left behind after JOIN_TIMEOUT
+        deadline: float = perf_counter() + self.JOIN_TIMEOUT
+        for worker in self.workers:
+            worker.abort()
+            worker.join(max(0.0, deadline - perf_counter()))
+            if worker.is_alive():
+                self.logger.warning = f"{worker.name} did not stop in time"
+        if self.metrics.changed:
+            self.logger.info = self.metrics.report()
+        self.logger.debug = f"{self._c_name} end"
+
+    def quit(self) -> None:
+        """Set exit flag, abort requests and wake up the waiting thread."""
+        self._set_data(key=_Keys.EXIT, value=True)
+        for worker in self.workers:
+            worker.abort()
+        self.search_queue.put(None)
+
+
+class ThPrefetchSystems(ThBaseObject, BLogClient, Thread):
+    """Threaded route prefetcher.
+
+    Warms the EDSM cache for the next systems of the plotted route,
+    so the foreground lookup resolves from cache on arrival.
+    Systems of the route are resolved with one batch request while
+    the foreground search engine is idle, their bodies are then queued
+    in the prefetch lane of the search pool, if lookups is set.
+    """
+
+    # seconds to wait for the thread at shutdown
+    JOIN_TIMEOUT: float = 5.0
+
+    def __init__(
+        self,
+        log_queue: Union[Queue, SimpleQueue],
+        idle: Event,
+        url_factory: Optional[Callable[[], Url]] = None,
+        lookups: Optional[LookupQueue] = None,
+        fields: Optional[FieldsProfile] = None,
+    ) -> None:
+        Thread.__init__(self, name=self._c_name, daemon=True)
+        self._stop_event = Event()
+
+        # init log subsystem
+        self.logger = LogClient(log_queue)
+
+        # EDSM client factory, called on the worker thread
+        if url_factory is None:
+            url_factory = lambda: Url(cache=EdsmCache(), priority=Priority.PREFETCH)
+        self._set_data(
+            key=_Keys.URL_FACTORY, value=url_factory, set_default_type=Callable
+        )
+
+        # foreground idle flag
+        self._set_data(key=_Keys.IDLE, value=idle, set_default_type=Event)
+
+        # search pool queue, bodies are fetched here if not set
+        self._set_data(
+            key=_Keys.LOOKUPS, value=lookups, set_default_type=Optional[LookupQueue]
+        )
+
+        # the same profile as ThSearchSystem, so the cache keys match
+        self._set_data(
+            key=_Keys.FIELDS,
+            value=fields if fields is not None else FieldsProfile.status(),
+            set_default_type=FieldsProfile,
+        )
+
+        # EDSM client, created on the worker thread
+        self._set_data(key=_Keys.URL, value=None, set_default_type=Optional[Url])
+
+        # init prefetch queue, only the newest route slice is kept
+        self._set_data(
+            key=_Keys.Q_PREFETCH,
+            value=CoalescingQueue(),
+            set_default_type=CoalescingQueue,
+        )
+
+        # EXIT flag
+        self._set_data(key=_Keys.EXIT, value=False, set_default_type=bool)
+
+    @property
+    def __idle(self) -> Event:
+        return self._get_data(
+            key=_Keys.IDLE,
+        )  # type: ignore
+
+    @property
+    def __lookups(self) -> Optional[LookupQueue]:
+        return self._get_data(
+            key=_Keys.LOOKUPS,
+        )  # type: ignore
+
+    @property
+    def prefetch_queue(self) -> CoalescingQueue:
+        return self._get_data(
+            key=_Keys.Q_PREFETCH,
+        )  # type: ignore
+
+    def __wait_idle(self, generation: int) -> bool:
+        """Wait for idle foreground, returns False if work is obsolete."""
+        while not self.__idle.wait(0.5):
+            if self._get_data(key=_Keys.EXIT):
+                return False
+        return not (
+            self._get_data(key=_Keys.EXIT) or self.prefetch_queue.is_stale(generation)
+        )
+
+    def run(self) -> None:
+        """Go to work."""
+
+        url: Url = self._get_data(key=_Keys.URL_FACTORY)()  # type: ignore
+        url.fields = self._get_data(key=_Keys.FIELDS)  # type: ignore
+        self._set_data(key=_Keys.URL, value=url)
+        if self._get_data(key=_Keys.EXIT):
+            url.abort()
+
+        self.logger.debug = f"{self._c_name} start"
+
+        while not self._get_data(key=_Keys.EXIT):
+            generation, items = self.prefetch_queue.get_latest()
+            if self._get_data(key=_Keys.EXIT):
+                break
+            if self.__lookups is not None:
+                # jobs of the previous route slice are obsolete
+                self.__lookups.clear(Priority.PREFETCH)
+            if not items:
+                continue
+            if not self.__wait_idle(generation):
+                continue
+            systems: List[StarsSystem] = url.systems_query(items)
+            self.logger.debug = f"prefetched {len(systems)}/{len(items)} systems"
+            if self.__lookups is not None:
+                for item in systems:
+                    self.__lookups.put(item, Priority.PREFETCH)
+                continue
+            if not url.fields.bodies:
+                continue
+            for item in systems:
+                if not self.__wait_idle(generation):
+                    break
+                url.bodies_query(item)
 
+        url.close()
         self.logger.debug = f"{self._c_name} end"
 
     def quit(self) -> None:
-        """Set exit flag."""
+        """Set exit flag, abort requests and wake up the waiting thread."""
         self._set_data(key=_Keys.EXIT, value=True)
+        url: Optional[Url] = self._get_data(key=_Keys.URL)
+        if url is not None:
+            url.abort()
+        self.prefetch_queue.put(None)
 
 
 # #[EOF]#######################################################################
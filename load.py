@@ -52,9 +52,14 @@ def plugin_stop() -> None:
     checker_object.logger.debug = (
         f"{checker_object.plugin_name}->plugin_stop: terminating the logger"
     )
+    checker_object.status_channel.detach()
+    # requests in progress may outlive the timeouts, the threads are daemons
+    if checker_object._prefetch:
+        checker_object._prefetch.quit()
+        checker_object._prefetch.join(checker_object._prefetch.JOIN_TIMEOUT)
     if checker_object._search:
         checker_object._search.quit()
-        checker_object._search.join()
+        checker_object._search.join(checker_object._search.JOIN_TIMEOUT)
     checker_object.qlog.put(None)
     checker_object.th_log.join()
 
@@ -83,6 +88,12 @@ def plugin_app(parent: tk.Frame) -> Tuple[tk.Label, tk.Label]:
     status_label: tk.Label = tk.Label(parent, textvariable=status)
     checker_object.status = status
     checker_object.start_search_engine()
+    # status lines are posted by the search thread and drained here
+    # while a lookup is in progress
+    search = checker_object._search
+    checker_object.status_channel.attach(
+        status, status_label, busy=(lambda: search.busy) if search else None
+    )
     return label, status_label
 
 
@@ -135,6 +146,7 @@ def journal_entry(
             EDKeys.STAR_CLASS, checker_object.jump_system.star_class
         )
         checker_object.dialog_update()
+        checker_object.prefetch_update(entry.get(EDKeys.REMAINING_JUMPS_IN_ROUTE))
     elif entry[EDKeys.EVENT] == EDKeys.CARRIER_JUMP_REQUEST:
         checker_object.jump_system.name = entry.get(
             EDKeys.SYSTEM_NAME, checker_object.jump_system.name
@@ -146,10 +158,15 @@ def journal_entry(
             EDKeys.STAR_CLASS, checker_object.jump_system.star_class
         )
         checker_object.dialog_update()
+    elif entry[EDKeys.EVENT] == EDKeys.NAV_ROUTE:
+        checker_object.route_update(entry.get(EDKeys.ROUTE))
+    elif entry[EDKeys.EVENT] == EDKeys.NAV_ROUTE_CLEAR:
+        checker_object.route_update(None)
     if entry[EDKeys.EVENT] in (EDKeys.FSD_JUMP, EDKeys.CARRIER_JUMP):
         star_system: str = entry.get(EDKeys.STAR_SYSTEM, "")
         if checker_object.jump_system.name == star_system:
-            checker_object.status.set("Waiting for data...")
+            checker_object.status_channel.post("Waiting for data...")
+            checker_object.status_channel.wake()
     checker_object.logger.debug = f"{checker_object.plugin_name}->journal_entry: done."
 
 
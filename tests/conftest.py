@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+conftest.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 21:10:04
+
+Purpose: make the plugin packages and tools importable from the tests,
+shared EDSM stand-in server fixtures.
+"""
+
+import os
+import sys
+
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# plugin packages and the tools, EDSM stand-in server
+for path in (ROOT, os.path.join(ROOT, "tools")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from edsm_standin import EdsmStandIn  # noqa: E402
+
+from checker.jsktoolbox.edmctool.edsm import RateLimiter  # noqa: E402
+
+
+@pytest.fixture
+def limiter() -> Iterator[RateLimiter]:
+    """Shared RateLimiter without throttling, restored on teardown."""
+    shared: RateLimiter = RateLimiter.shared()
+    rate: float = shared.rate
+    burst: int = shared.burst
+    shared.configure(1000, 1000)
+    yield shared
+    shared.configure(rate, burst)
+
+
+@pytest.fixture
+def standin(limiter: RateLimiter) -> Iterator[Callable[..., EdsmStandIn]]:
+    """Returns EdsmStandIn factory, the servers are stopped on teardown."""
+    servers: List[EdsmStandIn] = []
+
+    def start(**kwargs: Any) -> EdsmStandIn:
+        server: EdsmStandIn = EdsmStandIn(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def server(standin: Callable[..., EdsmStandIn]) -> EdsmStandIn:
+    """Returns running EdsmStandIn replaying the fixtures."""
+    return standin()
+
+
+# #[EOF]#######################################################################
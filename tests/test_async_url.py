@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+test_async_url.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 19.10.2026, 10:42:18
+
+Purpose: AsyncUrl queries run on one event loop thread, waits for
+RateLimiter tokens do not hold threads.
+"""
+
+import asyncio
+import threading
+import time
+
+from typing import Callable, Iterator, List
+
+import pytest
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import AsyncUrl, Priority, RateLimiter, Url
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+
+@pytest.fixture
+def clients() -> Iterator[Callable[..., AsyncUrl]]:
+    """Returns AsyncUrl factory, the clients are closed on teardown."""
+    created: List[AsyncUrl] = []
+
+    def create(base_url: str, **kwargs) -> AsyncUrl:
+        client: AsyncUrl = AsyncUrl(Url(base_url=base_url, **kwargs))
+        created.append(client)
+        return client
+
+    yield create
+    for client in created:
+        client.close()
+
+
+def test_queries_match_url(
+    server: EdsmStandIn, clients: Callable[..., AsyncUrl]
+) -> None:
+    client: AsyncUrl = clients(server.base_url)
+    url: Url = Url(base_url=server.base_url)
+    sol: StarsSystem = StarsSystem(name="Sol")
+    assert client.submit(client.system_query(sol)).result(5) == url.system_query(sol)
+    assert client.submit(client.bodies_query(sol)).result(5) == url.bodies_query(sol)
+    assert client.submit(client.radius_query(sol, 10)).result(5) == url.radius_query(
+        sol, 10
+    )
+    assert client.submit(client.cube_query(sol, 20)).result(5) == url.cube_query(
+        sol, 20
+    )
+
+
+def test_lookups_overlap_on_one_thread(
+    standin: Callable[..., EdsmStandIn], clients: Callable[..., AsyncUrl]
+) -> None:
+    server: EdsmStandIn = standin(latency=0.3, synthetic=True)
+    client: AsyncUrl = clients(server.base_url)
+    start: float = time.monotonic()
+    futures = [
+        client.submit(client.system_query(StarsSystem(name=f"Test {idx}")))
+        for idx in range(10)
+    ]
+    names: List[str] = [future.result(10)[EdsmKeys.NAME] for future in futures]
+    assert names == [f"Test {idx}" for idx in range(10)]
+    # ten requests of 0.3 s each, sent at once
+    assert time.monotonic() - start < 1.5
+    assert server.stats == {200: 10}
+
+
+def test_failed_requests_are_retried(
+    standin: Callable[..., EdsmStandIn],
+    clients: Callable[..., AsyncUrl],
+    limiter: RateLimiter,
+) -> None:
+    server: EdsmStandIn = standin(error_rate=1.0)
+    client: AsyncUrl = clients(server.base_url, retries=2, backoff=0.01)
+    before: float = limiter.metrics["foreground"]["requests"]
+    assert client.submit(client.system_query(StarsSystem(name="Sol"))).result(5) is None
+    assert server.stats == {500: 3}
+    assert limiter.metrics["foreground"]["requests"] - before == 3
+
+
+def test_abort_ends_retry_backoff(
+    standin: Callable[..., EdsmStandIn], clients: Callable[..., AsyncUrl]
+) -> None:
+    server: EdsmStandIn = standin(error_rate=1.0)
+    client: AsyncUrl = clients(server.base_url, retries=3, backoff=30.0)
+    threading.Timer(0.2, client.abort).start()
+    start: float = time.monotonic()
+    assert client.submit(client.system_query(StarsSystem(name="Sol"))).result(5) is None
+    assert time.monotonic() - start < 2.0
+    assert server.stats == {500: 1}
+
+
+def test_close_cancels_pending_queries(
+    standin: Callable[..., EdsmStandIn], limiter: RateLimiter
+) -> None:
+    server: EdsmStandIn = standin()
+    client: AsyncUrl = AsyncUrl(Url(base_url=server.base_url))
+    # the only token is taken, the next one is due in 100 s
+    limiter.configure(1000, 1)
+    limiter.acquire()
+    limiter.configure(0.01, 1)
+    future = client.submit(client.system_query(StarsSystem(name="Sol")))
+    time.sleep(0.1)
+    client.close()
+    assert future.cancelled()
+    assert client.loop.is_closed()
+    assert server.stats == {}
+
+
+def test_acquire_async_does_not_hold_threads(limiter: RateLimiter) -> None:
+    limiter.configure(100, 1)
+    threads: List[int] = []
+
+    async def take() -> None:
+        await limiter.acquire_async()
+        threads.append(threading.active_count())
+
+    async def main() -> None:
+        await asyncio.gather(*(take() for _ in range(20)))
+
+    before: int = threading.active_count()
+    start: float = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start >= 0.15
+    assert max(threads) == before
+
+
+def test_acquire_async_serves_higher_lane_first(limiter: RateLimiter) -> None:
+    limiter.configure(1000, 1)
+    limiter.acquire()
+    limiter.configure(20, 1)
+    order: List[int] = []
+
+    async def take(priority: int) -> None:
+        await limiter.acquire_async(priority)
+        order.append(priority)
+
+    async def main() -> None:
+        scan = asyncio.ensure_future(take(Priority.SCAN))
+        await asyncio.sleep(0)
+        await asyncio.gather(scan, take(Priority.FOREGROUND))
+
+    asyncio.run(main())
+    assert order == [Priority.FOREGROUND, Priority.SCAN]
+
+
+def test_acquire_async_abort(limiter: RateLimiter) -> None:
+    # the only token is taken, the next one is due in 100 s
+    limiter.configure(1000, 1)
+    limiter.acquire()
+    limiter.configure(0.01, 1)
+    abort: threading.Event = threading.Event()
+    threading.Timer(0.2, abort.set).start()
+    start: float = time.monotonic()
+    with pytest.raises(InterruptedError):
+        asyncio.run(limiter.acquire_async(abort=abort))
+    assert time.monotonic() - start < 1.0
+
+
+# #[EOF]#######################################################################
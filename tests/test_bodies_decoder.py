@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+test_bodies_decoder.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 21:12:37
+
+Purpose: BodiesSummaryDecoder against json.loads at every chunk boundary,
+streamed bodies summaries in Url.
+"""
+
+import json
+import os
+
+from typing import Any, Iterator, List
+
+import pytest
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import (
+    BodiesSummaryDecoder,
+    FieldsProfile,
+    JsonDecoder,
+    Url,
+)
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+FIXTURES: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools", "fixtures"
+)
+
+
+def _payloads() -> List[str]:
+    with open(os.path.join(FIXTURES, "bodies_sol.json"), encoding="utf-8") as file:
+        sol: str = file.read()
+    return [
+        sol,
+        "[]",
+        '{"x":1.5e3,"bodies":[]}',
+        '{"id":27,"bodies":[1.5,-2e-3,10,{"a":[1,2]},"]"],"n":-0.25}',
+        '{ "name" : "A \\"]\\" \\u0105" , "bodies" : [ {"r":1E+2} , {} ] , "z": 0 }',
+        '{"bodies":[{"x":12345678901234567890}],"y":-1.0e-10}',
+        '{"bodyCount":3,"bodies":[[],[[]],{"k":null}],"t":true,"f":false}',
+    ]
+
+
+def _expected(payload: str) -> Any:
+    data: Any = json.loads(payload)
+    if isinstance(data, dict) and isinstance(data.get(EdsmKeys.BODIES), list):
+        data[EdsmKeys.BODIES] = len(data[EdsmKeys.BODIES])
+    return data
+
+
+def _chunks(payload: str, size: int) -> Iterator[str]:
+    for idx in range(0, len(payload), size):
+        yield payload[idx : idx + size]
+
+
+@pytest.mark.parametrize("payload", _payloads())
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_decode_chunked(payload: str, size: int) -> None:
+    assert BodiesSummaryDecoder().decode(_chunks(payload, size)) == _expected(payload)
+
+
+@pytest.mark.parametrize("payload", _payloads())
+def test_decode_every_split(payload: str) -> None:
+    if len(payload) > 200:
+        pytest.skip("covered by chunk size 1")
+    expected: Any = _expected(payload)
+    for idx in range(1, len(payload)):
+        chunks: List[str] = [payload[:idx], payload[idx:]]
+        assert BodiesSummaryDecoder().decode(chunks) == expected
+
+
+def test_unterminated_bodies() -> None:
+    with pytest.raises(ValueError):
+        BodiesSummaryDecoder().decode(_chunks('{"bodies":[{"a":1},', 1))
+
+
+class _StreamingUrl(Url):
+    """Url streaming every bodies summary."""
+
+    STREAM_LENGTH: int = 0
+    STREAM_BACKENDS: frozenset = frozenset(JsonDecoder.BACKENDS)
+
+
+class _LongUrl(Url):
+    """Url treating every response as long."""
+
+    STREAM_LENGTH: int = 0
+
+
+@pytest.fixture
+def streams(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Counts BodiesSummaryDecoder.decode calls."""
+    calls: List[int] = []
+    decode = BodiesSummaryDecoder.decode
+
+    def counted(self: BodiesSummaryDecoder, chunks: Any) -> Any:
+        calls.append(1)
+        return decode(self, chunks)
+
+    monkeypatch.setattr(BodiesSummaryDecoder, "decode", counted)
+    return calls
+
+
+def test_short_summary_is_decoded_whole(
+    server: EdsmStandIn, streams: List[int]
+) -> None:
+    url: Url = Url(base_url=server.base_url, fields=FieldsProfile.status())
+    out: Any = url.bodies_query(StarsSystem(name="Sol"))
+    with open(os.path.join(FIXTURES, "bodies_sol.json"), encoding="utf-8") as file:
+        assert out == _expected(file.read())
+    assert not streams
+
+
+def test_long_summary_is_streamed(server: EdsmStandIn, streams: List[int]) -> None:
+    whole: Any = Url(base_url=server.base_url, fields=FieldsProfile.status())
+    url: Url = _StreamingUrl(base_url=server.base_url, fields=FieldsProfile.status())
+    assert url.bodies_query(StarsSystem(name="Sol")) == whole.bodies_query(
+        StarsSystem(name="Sol")
+    )
+    assert streams == [1]
+
+
+def test_fast_backend_is_not_streamed(server: EdsmStandIn, streams: List[int]) -> None:
+    url: Url = _LongUrl(base_url=server.base_url, fields=FieldsProfile.status())
+    assert url.bodies_query(StarsSystem(name="Sol"))
+    assert streams == ([1] if JsonDecoder.BACKEND == "json" else [])
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+test_edsm_cache.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 23:58:14
+
+Purpose: EdsmCache lifetimes, negative entries and revalidation.
+"""
+
+import sqlite3
+
+from typing import Any, Callable, Dict
+
+import pytest
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import (
+    EdsmCache,
+    FieldsProfile,
+    Url,
+)
+from checker.jsktoolbox.edmctool.metrics import Metrics
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+SYSTEM: str = "https://www.edsm.net/api-v1/system?systemName=Sol&showId=1"
+BODIES: str = "https://www.edsm.net/api-system-v1/bodies?systemName=Sol"
+
+
+def _age(cache: EdsmCache, url: str, seconds: float) -> None:
+    """Moves creation time of the entry for url into the past."""
+    db = sqlite3.connect(cache.path, isolation_level=None)
+    try:
+        db.execute(
+            "UPDATE responses SET created=created-? WHERE url=?",
+            (seconds, cache.normalize(url)),
+        )
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def cache(tmp_path) -> EdsmCache:
+    return EdsmCache(
+        str(tmp_path / "cache.sqlite"),
+        system_ttl=100,
+        bodies_ttl=10,
+        max_entries=3,
+        negative_ttl=5,
+    )
+
+
+def test_normalized_urls_share_entry(cache: EdsmCache) -> None:
+    cache.put(SYSTEM, {"name": "Sol"})
+    assert cache.get("HTTPS://WWW.EDSM.NET/api-v1/system?showId=1&systemName=SOL") == {
+        "name": "Sol"
+    }
+    assert cache.get(SYSTEM.replace("showId=1", "showId=0")) is None
+
+
+def test_lifetime_depends_on_endpoint(cache: EdsmCache) -> None:
+    assert cache.ttl(SYSTEM) == 100
+    assert cache.ttl(BODIES) == 10
+    cache.put(SYSTEM, {"name": "Sol"})
+    cache.put(BODIES, {"bodies": 13})
+    _age(cache, SYSTEM, 50)
+    _age(cache, BODIES, 50)
+    assert cache.get(SYSTEM) == {"name": "Sol"}
+    assert cache.get(BODIES) is None
+
+
+def test_expired_entry_keeps_validators_until_refreshed(cache: EdsmCache) -> None:
+    validators: Dict[str, str] = {"etag": '"abc"', "digest": "d1"}
+    cache.put(SYSTEM, {"name": "Sol"}, validators)
+    _age(cache, SYSTEM, 101)
+    assert cache.get(SYSTEM) is None
+    assert not cache.is_negative(SYSTEM)
+    assert cache.validators(SYSTEM) == validators
+    assert cache.refresh(SYSTEM) == {"name": "Sol"}
+    assert cache.get(SYSTEM) == {"name": "Sol"}
+
+
+def test_negative_entries(cache: EdsmCache) -> None:
+    cache.put_negative(SYSTEM)
+    assert cache.is_negative(SYSTEM)
+    assert cache.get(SYSTEM) is None
+    assert cache.validators(SYSTEM) == {}
+    assert cache.refresh(SYSTEM) is None
+    _age(cache, SYSTEM, 6)
+    assert not cache.is_negative(SYSTEM)
+    # a data entry replaces the negative one
+    cache.put_negative(BODIES)
+    cache.put(BODIES, {"bodies": 13})
+    assert not cache.is_negative(BODIES)
+    assert cache.get(BODIES) == {"bodies": 13}
+
+
+def test_least_recently_used_entries_are_evicted(cache: EdsmCache) -> None:
+    for name in ("A", "B", "C"):
+        cache.put(f"{SYSTEM}&n={name}", name)
+    assert cache.get(f"{SYSTEM}&n=A") == "A"
+    cache.put(f"{SYSTEM}&n=D", "D")
+    assert cache.get(f"{SYSTEM}&n=B") is None
+    for name in ("A", "C", "D"):
+        assert cache.get(f"{SYSTEM}&n={name}") == name
+
+
+def test_expired_entry_is_revalidated_with_etag(
+    standin: Callable[..., EdsmStandIn], cache: EdsmCache
+) -> None:
+    server: EdsmStandIn = standin(etag=True)
+    metrics: Metrics = Metrics()
+    url: Url = Url(cache=cache, base_url=server.base_url, metrics=metrics)
+    s_system: StarsSystem = StarsSystem(name="Sol")
+    first: Any = url.system_query(s_system)
+    assert first and first["name"] == "Sol"
+    assert "etag" in cache.validators(url.system_url(s_system))
+
+    assert url.system_query(s_system) == first
+    assert server.stats == {200: 1}
+
+    _age(cache, url.system_url(s_system), 101)
+    assert url.system_query(s_system) == first
+    assert server.stats == {200: 1, 304: 1}
+    assert metrics.snapshot()["counters"]["cache.revalidated"] == 1
+    assert cache.get(url.system_url(s_system)) == first
+
+
+def test_unchanged_payload_is_not_decoded_again(
+    server: EdsmStandIn, cache: EdsmCache
+) -> None:
+    metrics: Metrics = Metrics()
+    fields: FieldsProfile = FieldsProfile.status()
+    assert fields.summary
+    url: Url = Url(
+        cache=cache, base_url=server.base_url, metrics=metrics, fields=fields
+    )
+    s_system: StarsSystem = StarsSystem(name="Sol")
+    first: Any = url.bodies_query(s_system)
+    assert first and first["bodies"] == 13
+
+    key: str = url.bodies_key(url.bodies_url(s_system))
+    _age(cache, key, 11)
+    assert cache.get(key) is None
+    assert url.bodies_query(s_system) == first
+    assert server.stats == {200: 2}
+    assert metrics.snapshot()["counters"]["cache.unchanged"] == 1
+    assert cache.get(key) == first
+
+
+# #[EOF]#######################################################################
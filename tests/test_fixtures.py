@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+test_fixtures.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 23:31:52
+
+Purpose: recorded EDSM fixtures agree with each other.
+"""
+
+import json
+import math
+import os
+
+from typing import Any, Dict
+
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+from checker.jsktoolbox.edmctool.spatial import clamp_size
+
+FIXTURES: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools", "fixtures"
+)
+
+
+def _load(name: str) -> Any:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_bodies_list_within_count() -> None:
+    data: Dict[str, Any] = _load("bodies_sol.json")
+    bodies = data[EdsmKeys.BODIES]
+    # bodyCount is the system total, the list holds the known bodies only
+    assert len(bodies) <= data[EdsmKeys.BODY_COUNT]
+    assert len({body["bodyId"] for body in bodies}) == len(bodies)
+    for body in bodies:
+        assert body["id64"] == (body["bodyId"] << 55) | data[EdsmKeys.ID64]
+
+
+def test_system_matches_bodies() -> None:
+    system: Dict[str, Any] = _load("system_sol.json")
+    bodies: Dict[str, Any] = _load("bodies_sol.json")
+    for key in (EdsmKeys.NAME, EdsmKeys.ID, EdsmKeys.ID64):
+        assert system[key] == bodies[key]
+
+
+def test_neighbourhood_positions() -> None:
+    center: Dict[str, float] = _load("system_sol.json")[EdsmKeys.COORDS]
+    for item in _load("sphere_sol.json"):
+        coords: Dict[str, float] = item[EdsmKeys.COORDS]
+        dist: float = math.dist(
+            (coords["x"], coords["y"], coords["z"]),
+            (center["x"], center["y"], center["z"]),
+        )
+        assert round(dist, 2) == item[EdsmKeys.DISTANCE]
+    sphere: Dict[str, Any] = {
+        item[EdsmKeys.NAME]: item for item in _load("sphere_sol.json")
+    }
+    half: float = clamp_size(None) / 2
+    for item in _load("cube_sol.json"):
+        assert item[EdsmKeys.COORDS] == sphere[item[EdsmKeys.NAME]][EdsmKeys.COORDS]
+        assert all(abs(value) <= half for value in item[EdsmKeys.COORDS].values())
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+test_local_store.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 21:41:18
+
+Purpose: Url answers from LocalSystemsStore only for covered fields.
+"""
+
+from typing import Iterator
+
+import pytest
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import (
+    FieldsProfile,
+    LocalSystemsStore,
+    Url,
+)
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+
+@pytest.fixture
+def store(tmp_path) -> Iterator[LocalSystemsStore]:
+    local: LocalSystemsStore = LocalSystemsStore(str(tmp_path / "systems.sqlite"))
+    local.add_many(
+        [
+            {
+                "id": 27,
+                "id64": 10477373803,
+                "name": "Sol",
+                "coords": {"x": 0.0, "y": 0.0, "z": 0.0},
+            },
+            {
+                "id": 1,
+                "id64": 42,
+                "name": "Offline Only",
+                "coords": {"x": 1.0, "y": 2.0, "z": 3.0},
+            },
+        ]
+    )
+    yield local
+    local.close()
+
+
+def test_covered_profile_skips_api(server: EdsmStandIn, store) -> None:
+    url: Url = Url(
+        local_store=store,
+        base_url=server.base_url,
+        fields=FieldsProfile((EdsmKeys.ID64, EdsmKeys.COORDS)),
+    )
+    data = url.system_query(StarsSystem(name="Sol"))
+    assert data[EdsmKeys.ID64] == 10477373803
+    assert not server.stats
+
+
+def test_status_profile_keeps_api_fields(server: EdsmStandIn, store) -> None:
+    url: Url = Url(
+        local_store=store, base_url=server.base_url, fields=FieldsProfile.status()
+    )
+    data = url.system_query(StarsSystem(name="Sol"))
+    assert data[EdsmKeys.COORDS_LOCKED] is True
+    assert data[EdsmKeys.REQUIRE_PERMIT] is True
+    assert data[EdsmKeys.COORDS] == {EdsmKeys.X: 0, EdsmKeys.Y: 0, EdsmKeys.Z: 0}
+    assert server.stats == {200: 1}
+
+
+def test_local_answer_when_api_does_not_know(server: EdsmStandIn, store) -> None:
+    url: Url = Url(
+        local_store=store, base_url=server.base_url, fields=FieldsProfile.status()
+    )
+    data = url.system_query(StarsSystem(name="Offline Only"))
+    assert data[EdsmKeys.ID64] == 42
+    assert data[EdsmKeys.COORDS][EdsmKeys.Z] == 3.0
+
+
+def test_systems_query_merges_local_coords(server: EdsmStandIn, store) -> None:
+    url: Url = Url(
+        local_store=store, base_url=server.base_url, fields=FieldsProfile.status()
+    )
+    sol: StarsSystem = StarsSystem(name="Sol")
+    offline: StarsSystem = StarsSystem(name="Offline Only")
+    assert url.systems_query([sol, offline]) == [sol, offline]
+    assert sol.data[EdsmKeys.COORDS_LOCKED] is True
+    assert offline.star_pos == (1.0, 2.0, 3.0)
+
+
+# #[EOF]#######################################################################
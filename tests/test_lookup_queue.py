@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+test_lookup_queue.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 23:48:06
+
+Purpose: LookupQueue deduplication, priority lanes and supersede.
+"""
+
+import threading
+
+from queue import Empty
+from typing import List, Optional
+
+import pytest
+
+from checker.queues import LookupJob, LookupQueue
+from checker.jsktoolbox.edmctool.edsm import Priority
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+
+def _system(name: str, address: Optional[int] = None) -> StarsSystem:
+    return StarsSystem(name=name, address=address)
+
+
+def _drain(queue: LookupQueue) -> List[str]:
+    out: List[str] = []
+    while True:
+        try:
+            job: Optional[LookupJob] = queue.get(timeout=0)
+        except Empty:
+            return out
+        assert job is not None
+        out.append(job.item.name)
+
+
+def test_key() -> None:
+    assert LookupQueue.key(_system("Sol", 10477373803)) == 10477373803
+    assert LookupQueue.key(_system("Sol")) == "sol"
+    assert LookupQueue.key(StarsSystem()) == ""
+
+
+def test_pending_jobs_are_deduplicated() -> None:
+    queue: LookupQueue = LookupQueue()
+    first: LookupJob = queue.put(_system("Sol"), Priority.SCAN)
+    assert queue.put(_system("SOL"), Priority.SCAN) is first
+    by_address: LookupJob = queue.put(_system("Sol", 27), Priority.SCAN)
+    assert by_address is not first
+    assert queue.put(_system("Other name", 27), Priority.SCAN) is by_address
+    assert queue.qsize() == 2
+    assert len(_drain(queue)) == 2
+
+
+def test_lanes_are_served_by_priority_then_fifo() -> None:
+    queue: LookupQueue = LookupQueue()
+    queue.put(_system("scan 1"), Priority.SCAN)
+    queue.put(_system("prefetch 1"), Priority.PREFETCH)
+    queue.put(_system("scan 2"), Priority.SCAN)
+    queue.put(_system("prefetch 2"), Priority.PREFETCH)
+    queue.put(_system("target"), Priority.FOREGROUND)
+    assert _drain(queue) == [
+        "target",
+        "prefetch 1",
+        "prefetch 2",
+        "scan 1",
+        "scan 2",
+    ]
+
+
+def test_request_raises_priority_of_pending_job() -> None:
+    queue: LookupQueue = LookupQueue()
+    job: LookupJob = queue.put(_system("Sol"), Priority.SCAN)
+    queue.put(_system("Alpha Centauri"), Priority.PREFETCH)
+    assert queue.put(_system("Sol"), Priority.FOREGROUND) is job
+    assert job.priority == Priority.FOREGROUND
+    assert job.generation == queue.generation
+    # a lower priority request does not demote the job
+    assert queue.put(_system("Sol"), Priority.SCAN) is job
+    assert job.priority == Priority.FOREGROUND
+    # the outdated heap entry is skipped
+    assert _drain(queue) == ["Sol", "Alpha Centauri"]
+
+
+def test_running_job_is_shared_until_done() -> None:
+    queue: LookupQueue = LookupQueue()
+    job: LookupJob = queue.put(_system("Sol"), Priority.PREFETCH)
+    assert queue.get(timeout=0) is job
+    assert queue.running() == 1
+    assert queue.put(_system("Sol"), Priority.FOREGROUND) is job
+    assert queue.qsize() == 0
+    result: StarsSystem = _system("Sol", 10477373803)
+    queue.done(job, result)
+    assert job.future.result(timeout=0) is result
+    assert queue.running() == 0
+    assert queue.put(_system("Sol"), Priority.PREFETCH) is not job
+
+
+def test_done_with_error() -> None:
+    queue: LookupQueue = LookupQueue()
+    job: LookupJob = queue.put(_system("Sol"))
+    queue.get(timeout=0)
+    queue.done(job, error=ValueError("failed"))
+    with pytest.raises(ValueError):
+        job.future.result(timeout=0)
+
+
+def test_new_foreground_target_supersedes_the_previous() -> None:
+    queue: LookupQueue = LookupQueue()
+    prefetch: LookupJob = queue.put(_system("Neighbour"), Priority.PREFETCH)
+    old: LookupJob = queue.put(_system("Old"))
+    running: LookupJob = queue.get(timeout=0)  # type: ignore
+    assert running is old
+    assert not queue.is_stale(old)
+    pending: LookupJob = queue.put(_system("Pending"))
+    assert queue.is_stale(old)
+    assert not queue.is_stale(pending)
+
+    new: LookupJob = queue.put(_system("New"))
+    assert queue.generation == 3
+    assert pending.future.cancelled()
+    assert not old.future.cancelled()
+    assert queue.is_stale(pending)
+    assert not queue.is_stale(new)
+    assert not queue.is_stale(prefetch)
+    assert not prefetch.future.cancelled()
+    assert _drain(queue) == ["New", "Neighbour"]
+
+
+def test_repeated_foreground_target_keeps_its_job() -> None:
+    queue: LookupQueue = LookupQueue()
+    job: LookupJob = queue.put(_system("Sol"))
+    assert queue.put(_system("Sol")) is job
+    assert not job.future.cancelled()
+    assert not queue.is_stale(job)
+    assert _drain(queue) == ["Sol"]
+
+
+def test_clear_cancels_one_lane() -> None:
+    queue: LookupQueue = LookupQueue()
+    scan: LookupJob = queue.put(_system("scan"), Priority.SCAN)
+    prefetch: LookupJob = queue.put(_system("prefetch"), Priority.PREFETCH)
+    queue.clear(Priority.SCAN)
+    assert scan.future.cancelled()
+    assert not prefetch.future.cancelled()
+    assert _drain(queue) == ["prefetch"]
+
+
+def test_get_timeout_raises_empty() -> None:
+    queue: LookupQueue = LookupQueue()
+    with pytest.raises(Empty):
+        queue.get(timeout=0.01)
+
+
+def test_close_wakes_up_workers_and_cancels_jobs() -> None:
+    queue: LookupQueue = LookupQueue()
+    results: List[Optional[LookupJob]] = []
+    worker = threading.Thread(target=lambda: results.append(queue.get()))
+    worker.start()
+    worker.join(0.05)
+    assert worker.is_alive()
+    queue.close()
+    worker.join(1.0)
+    assert not worker.is_alive()
+    assert results == [None]
+
+    queue = LookupQueue()
+    job: LookupJob = queue.put(_system("Sol"), Priority.SCAN)
+    queue.close()
+    assert job.future.cancelled()
+    assert queue.qsize() == 0
+    assert queue.get(timeout=0) is None
+
+
+# #[EOF]#######################################################################
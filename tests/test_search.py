@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+test_search.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 19.10.2026, 01:12:36
+
+Purpose: ThSearchSystem status lines and shutdown.
+"""
+
+import time
+
+from queue import SimpleQueue
+from typing import Callable, Dict, Optional
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import RateLimiter, Url
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+from checker.queues import StatusChannel, StatusRecord
+from checker.th import ThSearchSystem
+
+
+class _FailingUrl(Url):
+    """Url raising on system queries."""
+
+    def system_query(self, s_system: StarsSystem) -> Optional[Dict]:
+        raise RuntimeError("broken")
+
+
+def _status(channel: StatusChannel, text: str, timeout: float = 5.0) -> bool:
+    end: float = time.monotonic() + timeout
+    while time.monotonic() < end:
+        record: Optional[StatusRecord] = channel.latest
+        if record is not None and record.text == text:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _search(url_factory: Callable[[], Url]) -> ThSearchSystem:
+    search: ThSearchSystem = ThSearchSystem(
+        SimpleQueue(), StatusChannel(), url_factory, workers=2
+    )
+    search.start()
+    return search
+
+
+def test_failed_lookup_posts_status(server: EdsmStandIn) -> None:
+    search: ThSearchSystem = _search(lambda: _FailingUrl(base_url=server.base_url))
+    search.search_queue.put(StarsSystem(name="Sol"))
+    assert _status(search.status, "Sol - lookup failed")
+    assert search.idle.wait(5.0)
+    search.quit()
+    search.join(5.0)
+    assert search.metrics.snapshot()["counters"]["failed"] == 1
+
+
+def test_lookup_posts_status(server: EdsmStandIn) -> None:
+    search: ThSearchSystem = _search(lambda: Url(base_url=server.base_url))
+    assert not search.busy
+    search.search_queue.put(StarsSystem(name="Sol"))
+    assert search.busy
+    assert _status(search.status, "Sol - Permit Lock [13/40]")
+    end: float = time.monotonic() + 5.0
+    while search.busy and time.monotonic() < end:
+        time.sleep(0.01)
+    assert not search.busy
+    # a target without name is finished at once
+    search.search_queue.put(StarsSystem())
+    while search.busy and time.monotonic() < end:
+        time.sleep(0.01)
+    assert not search.busy
+    search.quit()
+    search.join(5.0)
+    assert not search.is_alive()
+
+
+def _stops_quickly(search: ThSearchSystem) -> bool:
+    search.quit()
+    start: float = time.monotonic()
+    search.join(search.JOIN_TIMEOUT + 1.0)
+    return not search.is_alive() and time.monotonic() - start < 2.0
+
+
+def test_quit_aborts_retry_backoff(standin: Callable[..., EdsmStandIn]) -> None:
+    server: EdsmStandIn = standin(error_rate=1.0)
+    search: ThSearchSystem = _search(
+        lambda: Url(retries=5, backoff=30.0, base_url=server.base_url)
+    )
+    search.search_queue.put(StarsSystem(name="Sol"))
+    end: float = time.monotonic() + 5.0
+    while not server.stats and time.monotonic() < end:
+        time.sleep(0.01)
+    assert server.stats
+    assert _stops_quickly(search)
+    assert not any(worker.is_alive() for worker in search.workers)
+
+
+def test_quit_aborts_rate_limiter_wait(
+    server: EdsmStandIn, limiter: RateLimiter
+) -> None:
+    limiter.configure(0.001, 1)
+    limiter.acquire()
+    search: ThSearchSystem = _search(lambda: Url(base_url=server.base_url))
+    search.search_queue.put(StarsSystem(name="Sol"))
+    time.sleep(0.3)
+    assert not search.idle.is_set()
+    assert _stops_quickly(search)
+    assert not any(worker.is_alive() for worker in search.workers)
+    assert not server.stats
+
+
+# #[EOF]#######################################################################
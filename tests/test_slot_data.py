@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+test_slot_data.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 19.10.2026, 00:41:27
+
+Purpose: BSlotData keeps the BData container API.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from checker.jsktoolbox.basetool.data import BSlotData
+
+
+class _Base(BSlotData):
+    __slots__ = ()
+
+    _FIELDS: Dict[str, Any] = {
+        "name": Optional[str],
+        "items": List[int],
+    }
+
+
+class _Child(_Base):
+    __slots__ = ()
+
+    _FIELDS: Dict[str, Any] = {
+        "count": int,
+        # redeclared fields keep their slot and take the new type
+        "name": str,
+    }
+
+
+def test_fields_are_inherited() -> None:
+    assert list(_Base._SLOT_INDEX) == ["name", "items"]
+    assert list(_Child._SLOT_INDEX) == ["name", "items", "count"]
+    obj: _Child = _Child()
+    obj._set_data("items", [1])
+    obj._set_data("count", 2)
+    assert obj._get_data("items") == [1]
+    assert obj._get_data("count") == 2
+    with pytest.raises(TypeError):
+        obj._set_data("name", None)
+    _Base()._set_data("name", None)
+
+
+def test_declared_keys_are_type_checked() -> None:
+    obj: _Base = _Base()
+    obj._set_data("name", "Sol")
+    obj._set_data("name", None)
+    with pytest.raises(TypeError):
+        obj._set_data("name", 1)
+    with pytest.raises(TypeError):
+        obj._set_data("items", (1, 2))
+    # the declared type wins over set_default_type
+    with pytest.raises(TypeError):
+        obj._set_data("items", "x", set_default_type=str)
+    assert obj._get_data("name") is None
+
+
+def test_undeclared_keys_are_type_checked() -> None:
+    obj: _Base = _Base()
+    obj._set_data("free", "anything")
+    obj._set_data("free", 1)
+    obj._set_data("level", 1, set_default_type=int)
+    with pytest.raises(TypeError):
+        obj._set_data("level", "high")
+    # the first declared type is kept
+    with pytest.raises(TypeError):
+        obj._set_data("level", "high", set_default_type=str)
+    obj._get_data("limit", set_default_type=float)
+    with pytest.raises(TypeError):
+        obj._set_data("limit", "x")
+    obj._delete_data("level")
+    obj._set_data("level", "high")
+
+
+def test_default_value_is_type_checked() -> None:
+    obj: _Base = _Base()
+    assert obj._get_data("name") is None
+    assert obj._get_data("name", default_value="Sol") == "Sol"
+    with pytest.raises(TypeError):
+        obj._get_data("name", default_value=1)
+    assert obj._get_data("other", default_value=1) == 1
+    with pytest.raises(TypeError):
+        obj._get_data("other", set_default_type=str, default_value=1)
+    obj._set_data("name", "Sol")
+    # a set value is returned without checking the default
+    assert obj._get_data("name", default_value=1) == "Sol"
+
+
+def test_clear_delete_and_copy() -> None:
+    obj: _Base = _Base()
+    items: List[int] = [1, 2]
+    obj._set_data("items", items)
+    copied: Optional[Any] = obj._copy_data("items")
+    assert copied == [1, 2] and copied is not items
+    obj._clear_data("items")
+    assert items == []
+    assert obj._get_data("items") is None
+    obj._set_data("level", 1, set_default_type=int)
+    obj._clear_data("level")
+    with pytest.raises(TypeError):
+        obj._set_data("level", "high")
+    obj._clear_data("missing")
+
+
+def test_from_slot_values() -> None:
+    values: List[Any] = _Child._slot_values()
+    assert len(values) == 3
+    values[_Child._SLOT_INDEX["count"]] = 5
+    obj: _Child = _Child._from_slot_values(values)
+    assert obj._get_data("count") == 5
+    assert obj._get_data("name") is None
+    with pytest.raises(ValueError):
+        _Child._from_slot_values([None, None])
+    with pytest.raises(ValueError):
+        _Base._from_slot_values(_Child._slot_values())
+
+
+def test_no_instance_dict() -> None:
+    obj: _Child = _Child()
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.other = 1  # type: ignore
+
+
+def test_data_holds_all_set_variables() -> None:
+    obj: _Base = _Base()
+    assert dict(obj._data) == {}
+    obj._set_data("name", "Sol")
+    obj._set_data("free", 1)
+    assert dict(obj._data) == {"name": "Sol", "free": 1}
+    assert "items" not in obj._data
+    assert len(obj._data) == 2
+
+    obj._data["items"] = [3]
+    assert obj._get_data("items") == [3]
+    with pytest.raises(TypeError):
+        obj._data["name"] = 1
+    del obj._data["free"]
+    assert obj._get_data("free") is None
+    with pytest.raises(KeyError):
+        del obj._data["free"]
+
+    obj._data = {"name": "Achenar", "free": 2}
+    assert dict(obj._data) == {"name": "Achenar", "items": [3], "free": 2}
+    with pytest.raises(TypeError):
+        obj._data = [("name", "Sol")]  # type: ignore
+    obj._set_data("level", 1, set_default_type=int)
+    del obj._data
+    assert dict(obj._data) == {}
+    obj._set_data("level", "high")
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+test_spatial.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 22:31:09
+
+Purpose: SpatialIndex against brute force, with and without numpy.
+"""
+
+import math
+import random
+
+from array import array
+from typing import List, Tuple
+
+import pytest
+
+from checker.jsktoolbox.edmctool import spatial
+from checker.jsktoolbox.edmctool.spatial import SpatialIndex, clamp_radius, clamp_size
+
+
+def _coords(count: int, seed: int) -> array:
+    rnd: random.Random = random.Random(seed)
+    out: array = array("d")
+    for _ in range(count):
+        out.extend(rnd.uniform(-300.0, 300.0) for _ in range(3))
+    # unknown positions as stored by StarsSystemTable
+    out.extend((math.nan, 0.0, 0.0))
+    out.extend((math.nan, math.nan, math.nan))
+    out.extend((1.0, math.inf, 2.0))
+    return out
+
+
+def _rows(coords: array) -> List[Tuple[int, Tuple[float, float, float]]]:
+    return [
+        (row, (coords[3 * row], coords[3 * row + 1], coords[3 * row + 2]))
+        for row in range(len(coords) // 3)
+    ]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch) -> str:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.delattr(spatial, "np", raising=False)
+    return request.param
+
+
+@pytest.mark.parametrize("cell_size", [7.5, 50.0, 200.0])
+def test_sphere_matches_brute_force(backend: str, cell_size: float) -> None:
+    coords: array = _coords(2000, 1)
+    index: SpatialIndex = SpatialIndex(coords, cell_size)
+    assert len(index) == 2000
+    rnd: random.Random = random.Random(2)
+    for _ in range(20):
+        center = [rnd.uniform(-250.0, 250.0) for _ in range(3)]
+        radius: int = rnd.choice([3, 20, 50, 120])
+        limit: int = clamp_radius(radius)
+        expected = sorted(
+            row for row, pos in _rows(coords) if math.dist(pos, center) <= limit
+        )
+        found = index.sphere(center, radius)
+        assert sorted(row for row, _ in found) == expected
+        distances = [dist for _, dist in found]
+        assert distances == sorted(distances)
+        for row, dist in found:
+            assert dist == pytest.approx(math.dist(index.position(row), center))
+
+
+@pytest.mark.parametrize("cell_size", [7.5, 50.0])
+def test_cube_matches_brute_force(backend: str, cell_size: float) -> None:
+    coords: array = _coords(2000, 3)
+    index: SpatialIndex = SpatialIndex(coords, cell_size)
+    rnd: random.Random = random.Random(4)
+    for _ in range(20):
+        center = [rnd.uniform(-250.0, 250.0) for _ in range(3)]
+        size: int = rnd.choice([5, 40, 100, 300])
+        half: float = clamp_size(size) / 2
+        expected = sorted(
+            row
+            for row, pos in _rows(coords)
+            if all(abs(pos[axis] - center[axis]) <= half for axis in range(3))
+        )
+        assert sorted(index.cube(center, size)) == expected
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        SpatialIndex(array("d", [1.0, 2.0]))
+    with pytest.raises(ValueError):
+        SpatialIndex(array("d"), 0)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+test_stars.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 22:05:41
+
+Purpose: StarsSystem identity and cached position.
+"""
+
+from typing import Any, Dict, List, Set
+
+import pytest
+
+from checker.jsktoolbox.edmctool.stars import StarsSystem, StarsSystemRegistry
+from checker.jsktoolbox.edmctool.table import StarsSystemTable
+
+SPHERE: List[Any] = [
+    {
+        "name": "Sol",
+        "id64": 10477373803,
+        "coords": {"x": 0, "y": 0, "z": 0},
+        "distance": 0,
+        "bodyCount": 40,
+        "bodies": [{"id": 1}, {"id": 2}],
+    },
+    {"name": "Alpha Centauri", "coords": {"x": 3.03125, "y": -0.09375, "z": 3.15625}},
+    {"name": "Null Bodies", "id64": 7, "bodies": None},
+    {"name": "Count Bodies", "bodies": 12},
+    {"name": "Text Bodies", "bodies": "many"},
+    {"id64": 99},
+    "junk",
+]
+
+
+def test_equal_by_name_and_known_address() -> None:
+    assert StarsSystem(name="Sol") == StarsSystem(name="SOL", address=10)
+    assert StarsSystem(name="Sol", address=10) == StarsSystem(name="sol", address=10)
+    assert StarsSystem(name="Sol", address=10) != StarsSystem(name="Sol", address=11)
+    assert StarsSystem(name="Sol") != StarsSystem(name="Achenar")
+    assert StarsSystem(name="Sol") != StarsSystem(address=10)
+    assert StarsSystem(address=10) == StarsSystem(address=10)
+    assert StarsSystem() != StarsSystem()
+
+
+def test_equality_is_not_transitive() -> None:
+    unknown: StarsSystem = StarsSystem(name="Sol")
+    first: StarsSystem = StarsSystem(name="Sol", address=10)
+    second: StarsSystem = StarsSystem(name="Sol", address=11)
+    assert unknown == first and unknown == second and first != second
+    # the object inserted first is found
+    assert {first: 1, second: 2}[unknown] == 1
+    assert {second: 2, first: 1}[unknown] == 2
+
+
+def test_hash_matches_equality() -> None:
+    pairs = [
+        (StarsSystem(name="Sol"), StarsSystem(name="SOL", address=10)),
+        (StarsSystem(address=10), StarsSystem(address=10)),
+    ]
+    for left, right in pairs:
+        assert left == right
+        assert hash(left) == hash(right)
+
+
+def test_hash_stable_when_address_is_filled_in() -> None:
+    s_system: StarsSystem = StarsSystem(name="Sol")
+    members: Set[StarsSystem] = {s_system}
+    scores: Dict[StarsSystem, float] = {s_system: 1.0}
+    s_system.update_from_edsm({"name": "Sol", "id64": 10477373803})
+    assert s_system.address == 10477373803
+    assert s_system in members
+    assert scores[s_system] == 1.0
+
+
+def test_hash_stable_after_intern() -> None:
+    registry: StarsSystemRegistry = StarsSystemRegistry()
+    canonical: StarsSystem = registry.intern(StarsSystem(name="Sol"))
+    members: Set[StarsSystem] = {canonical}
+    assert registry.intern(StarsSystem(name="sol", address=10)) is canonical
+    assert canonical.address == 10
+    assert canonical in members
+
+
+def test_star_pos_cache() -> None:
+    s_system: StarsSystem = StarsSystem(name="Sol", star_pos=[1, 2, 3])
+    pos = s_system.star_pos
+    assert pos == (1, 2, 3)
+    assert s_system.star_pos is pos
+    s_system.pos_y = 5
+    assert s_system.star_pos == (1, 5, 3)
+    s_system.star_pos = (7, 8, 9)
+    assert s_system.star_pos == (7, 8, 9)
+    s_system.update_from_edsm({"coords": {"x": 0, "y": 0, "z": 0}})
+    assert s_system.star_pos == (0, 0, 0)
+
+
+def _reference(data: List[Any]) -> List[StarsSystem]:
+    out: List[StarsSystem] = []
+    for item in data:
+        if isinstance(item, dict) and isinstance(item.get("name"), str):
+            s_system: StarsSystem = StarsSystem()
+            s_system.update_from_edsm(item)
+            out.append(s_system)
+    return out
+
+
+@pytest.mark.parametrize("data", [SPHERE, [], None, {"name": "Sol"}])
+def test_from_edsm_many_matches_update_from_edsm(data: Any) -> None:
+    reference: List[StarsSystem] = _reference(data if isinstance(data, list) else [])
+    bulk: List[StarsSystem] = StarsSystem.from_edsm_many(data)
+    assert len(bulk) == len(reference)
+    for left, right in zip(bulk, reference):
+        assert left.name == right.name
+        assert left.address == right.address
+        assert left.data == right.data
+    assert [item.star_pos for item in bulk[:2]] == [
+        item.star_pos for item in reference[:2]
+    ]
+    if bulk:
+        assert "bodies" not in bulk[2].data
+        assert bulk[3].data["bodies"] == 12
+        assert "bodies" not in bulk[4].data
+
+
+def test_from_edsm_many_cached_position_is_invalidated() -> None:
+    s_system: StarsSystem = StarsSystem.from_edsm_many(SPHERE)[1]
+    assert s_system.star_pos == (3.03125, -0.09375, 3.15625)
+    s_system.pos_x = 1
+    assert s_system.star_pos == (1, -0.09375, 3.15625)
+
+
+def test_from_edsm_many_registry() -> None:
+    registry: StarsSystemRegistry = StarsSystemRegistry()
+    first: List[StarsSystem] = StarsSystem.from_edsm_many(SPHERE, registry)
+    second: List[StarsSystem] = StarsSystem.from_edsm_many(SPHERE[:2], registry)
+    assert second[0] is first[0]
+    assert second[1] is first[1]
+
+
+def test_table_from_edsm_many() -> None:
+    table: StarsSystemTable = StarsSystemTable.from_edsm_many(SPHERE)
+    assert len(table) == 5
+    assert table.row_of(address=10477373803) == 0
+    assert table.row_of(name="null bodies") == 2
+    assert table[0].data["bodies"] == 2
+    assert "bodies" not in table[2].data
+    assert table[3].data["bodies"] == 12
+    assert "bodies" not in table[4].data
+
+
+# #[EOF]#######################################################################
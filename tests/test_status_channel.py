@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+test_status_channel.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 19.10.2026, 01:58:03
+
+Purpose: StatusChannel drains records only while lookups are pending.
+"""
+
+import itertools
+
+from typing import Callable, Dict, List
+
+from checker.queues import StatusChannel
+
+
+class _Var:
+    """StringVar stand-in counting set() calls."""
+
+    def __init__(self) -> None:
+        self.value: str = ""
+        self.sets: int = 0
+
+    def get(self) -> str:
+        return self.value
+
+    def set(self, value: str) -> None:
+        self.value = value
+        self.sets += 1
+
+
+class _Widget:
+    """Widget stand-in running after() callbacks on demand."""
+
+    def __init__(self) -> None:
+        self.pending: Dict[str, Callable[[], None]] = {}
+        self.__ids = itertools.count()
+
+    def after(self, ms: int, func: Callable[[], None]) -> str:
+        after_id: str = f"after#{next(self.__ids)}"
+        self.pending[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        self.pending.pop(after_id, None)
+
+    def tick(self) -> int:
+        """Runs scheduled callbacks, returns their number."""
+        calls: List[Callable[[], None]] = list(self.pending.values())
+        self.pending.clear()
+        for func in calls:
+            func()
+        return len(calls)
+
+
+def test_idle_channel_does_not_poll() -> None:
+    channel: StatusChannel = StatusChannel()
+    var: _Var = _Var()
+    widget: _Widget = _Widget()
+    channel.post("first")
+    channel.attach(var, widget)  # type: ignore
+    assert var.value == "first"
+    # one more check after the record, then idle
+    assert widget.tick() == 1
+    assert widget.tick() == 0
+    channel.post("second")
+    assert widget.tick() == 0
+    channel.wake()
+    assert var.value == "second"
+
+
+def test_polls_while_busy() -> None:
+    channel: StatusChannel = StatusChannel()
+    var: _Var = _Var()
+    widget: _Widget = _Widget()
+    busy: List[bool] = [True]
+    channel.attach(var, widget, busy=lambda: busy[0])  # type: ignore
+    for _ in range(5):
+        assert widget.tick() == 1
+    channel.post("")
+    channel.post("Sol - [13/40]")
+    busy[0] = False
+    assert widget.tick() == 1
+    assert var.value == "Sol - [13/40]"
+    assert widget.tick() == 1
+    assert widget.tick() == 0
+    assert channel.shown == 1 and var.sets == 1
+
+    # a second wake() does not schedule twice
+    busy[0] = True
+    channel.wake()
+    channel.wake()
+    assert len(widget.pending) == 1
+
+
+def test_detach_stops_polling() -> None:
+    channel: StatusChannel = StatusChannel()
+    widget: _Widget = _Widget()
+    channel.attach(_Var(), widget, busy=lambda: True)  # type: ignore
+    assert widget.pending
+    channel.detach()
+    assert not widget.pending
+    channel.wake()
+    assert not widget.pending
+
+
+# #[EOF]#######################################################################
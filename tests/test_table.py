@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+test_table.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 22:44:52
+
+Purpose: StarsSystemTable columns, views and lookups.
+"""
+
+import math
+
+import pytest
+
+from checker.jsktoolbox.edmctool.spatial import SpatialIndex
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+from checker.jsktoolbox.edmctool.table import StarsSystemTable, StarsSystemView
+
+
+def _table() -> StarsSystemTable:
+    sol: StarsSystem = StarsSystem(name="Sol", address=10477373803, star_pos=[0, 0, 0])
+    sol.star_class = "G"
+    sol.data = {"bodyCount": 40}
+    return StarsSystemTable.from_list(
+        [
+            sol,
+            StarsSystem(name="Achenar", star_pos=[67.5, -119.46875, 24.84375]),
+            StarsSystem(name="Unknown"),
+        ]
+    )
+
+
+def test_round_trip() -> None:
+    table: StarsSystemTable = _table()
+    systems = table.to_list()
+    assert [item.name for item in systems] == ["Sol", "Achenar", "Unknown"]
+    assert systems[0].address == 10477373803
+    assert systems[0].star_class == "G"
+    assert systems[0].data == {"bodyCount": 40}
+    assert systems[2].star_pos == (None, None, None)
+
+
+def test_views_write_columns() -> None:
+    table: StarsSystemTable = _table()
+    view: StarsSystemView = table[1]
+    assert isinstance(view, StarsSystem)
+    view.pos_x = 1.0
+    view.address = 5
+    assert table.coords[3] == 1.0
+    assert table.row_of(address=5) == 1
+    assert table[-1].star_pos == (None, None, None)
+    with pytest.raises(IndexError):
+        table[3]
+    with pytest.raises(TypeError):
+        view.pos_y = "1"
+
+
+def test_row_of_name() -> None:
+    table: StarsSystemTable = _table()
+    assert table.row_of(name="ACHENAR") == 1
+    assert table.row_of(name="Nowhere") is None
+    table[1].name = "Renamed"
+    assert table.row_of(name="achenar") is None
+    assert table.row_of(name="renamed") == 1
+    row: int = table.append("Sol")
+    table[0].name = "Old Sol"
+    assert table.row_of(name="sol") == row
+
+
+def test_distances() -> None:
+    table: StarsSystemTable = _table()
+    assert table.distance(0, 1) == pytest.approx(
+        math.dist((0, 0, 0), table.position(1))
+    )
+    distances = table.distances((0.0, 0.0, 0.0))
+    assert distances[0] == 0.0
+    assert math.isnan(distances[2])
+
+
+def test_spatial_index_skips_unknown_rows() -> None:
+    table: StarsSystemTable = _table()
+    index: SpatialIndex = SpatialIndex(table.coords)
+    assert len(index) == 2
+    assert [row for row, _ in index.sphere((0, 0, 0), 100)] == [0]
+
+
+# #[EOF]#######################################################################
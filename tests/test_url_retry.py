@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+test_url_retry.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 23:05:37
+
+Purpose: every Url retry attempt takes a RateLimiter token.
+"""
+
+import socket
+import threading
+import time
+
+from typing import Callable
+
+import pytest
+
+from edsm_standin import EdsmStandIn
+
+from checker.jsktoolbox.edmctool.edsm import RateLimiter, Url
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+
+def _tokens(limiter: RateLimiter) -> float:
+    return limiter.metrics["foreground"]["requests"]
+
+
+def test_server_errors_are_retried_through_limiter(
+    standin: Callable[..., EdsmStandIn], limiter: RateLimiter
+) -> None:
+    server: EdsmStandIn = standin(error_rate=1.0)
+    url: Url = Url(retries=2, backoff=0.01, base_url=server.base_url)
+    before: float = _tokens(limiter)
+    assert url.system_query(StarsSystem(name="Sol")) is None
+    assert server.stats == {500: 3}
+    assert _tokens(limiter) - before == 3
+
+
+def test_throttled_request_honours_retry_after(
+    standin: Callable[..., EdsmStandIn], limiter: RateLimiter
+) -> None:
+    server: EdsmStandIn = standin(throttle_rate=1.0)
+    url: Url = Url(retries=1, backoff=0.0, base_url=server.base_url)
+    before: float = _tokens(limiter)
+    start: float = time.monotonic()
+    assert url.system_query(StarsSystem(name="Sol")) is None
+    assert time.monotonic() - start >= 0.9
+    assert server.stats == {429: 2}
+    assert _tokens(limiter) - before == 2
+
+
+def test_successful_request_takes_one_token(
+    server: EdsmStandIn, limiter: RateLimiter
+) -> None:
+    url: Url = Url(retries=3, backoff=0.01, base_url=server.base_url)
+    before: float = _tokens(limiter)
+    assert url.system_query(StarsSystem(name="Sol"))
+    assert server.stats == {200: 1}
+    assert _tokens(limiter) - before == 1
+
+
+def test_connection_errors_are_retried_through_limiter(limiter: RateLimiter) -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+    url: Url = Url(retries=2, backoff=0.01, base_url=f"http://127.0.0.1:{port}/")
+    before: float = _tokens(limiter)
+    assert url.system_query(StarsSystem(name="Sol")) is None
+    assert _tokens(limiter) - before == 3
+
+
+def test_abort_ends_retry_backoff(standin: Callable[..., EdsmStandIn]) -> None:
+    server: EdsmStandIn = standin(error_rate=1.0)
+    url: Url = Url(retries=3, backoff=30.0, base_url=server.base_url)
+    threading.Timer(0.2, url.abort).start()
+    start: float = time.monotonic()
+    assert url.system_query(StarsSystem(name="Sol")) is None
+    assert time.monotonic() - start < 2.0
+    assert server.stats == {500: 1}
+    # no further requests after abort
+    assert url.bodies_query(StarsSystem(name="Sol")) is None
+    assert server.stats == {500: 1}
+
+
+def test_retry_arguments_are_checked() -> None:
+    with pytest.raises(ValueError):
+        Url(retries=-1)
+    with pytest.raises(ValueError):
+        Url(backoff=-0.5)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+edsm_bench.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 15:58:12
+
+Purpose: end-to-end jump target lookup benchmark against EDSM stand-in.
+
+Measures time-to-status, from queueing a jump target to the final
+status line, for the bare Url client and for the ThSearchSystem thread.
+Systems are cycled over a pool of unique names, so the pool size sets
+the cache hit ratio.
+
+Usage:
+    python tools/edsm_bench.py [-n 200] [-u 50] [-l 150] [-j 50] [-e 0.02]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from queue import SimpleQueue
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker.jsktoolbox.systemtool import CommandLineParser
+from checker.jsktoolbox.edmctool.edsm import EdsmCache, RateLimiter, Url
+from checker.jsktoolbox.edmctool.metrics import Metrics
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+from checker.queues import StatusChannel, StatusRecord
+from checker.th import ThSearchSystem
+
+from edsm_standin import EdsmStandIn
+
+
+class StatusProbe(StatusChannel):
+    """Status channel signalling the final status line, no Tk required."""
+
+    changed: threading.Event = None  # type: ignore
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.changed = threading.Event()
+
+    def post(self, text: str) -> StatusRecord:
+        record: StatusRecord = super().post(text)
+        # empty string only clears the previous status
+        if text:
+            self.changed.set()
+        return record
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Returns p50/p95/p99 of samples in milliseconds."""
+    if len(samples) < 2:
+        return {
+            "p50": samples[0] * 1000,
+            "p95": samples[0] * 1000,
+            "p99": samples[0] * 1000,
+        }
+    cuts: List[float] = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+def bench_url(
+    factory: Callable[[], Url], names: List[str]
+) -> Tuple[List[float], List[str]]:
+    """Returns time-to-data of system and bodies lookups with Url."""
+    url: Url = factory()
+    url.metrics = Metrics()
+    executor = ThreadPoolExecutor(max_workers=2)
+    out: List[float] = []
+    for name in names:
+        item = StarsSystem(name=name)
+        start: float = time.perf_counter()
+        f_system = executor.submit(url.system_query, item)
+        f_bodies = executor.submit(url.bodies_query, item)
+        f_system.result()
+        f_bodies.result()
+        out.append(time.perf_counter() - start)
+    executor.shutdown()
+    url.close()
+    return out, url.metrics.report()
+
+
+def bench_thread(
+    factory: Callable[[], Url], names: List[str]
+) -> Tuple[List[float], List[str]]:
+    """Returns time-to-status of ThSearchSystem lookups."""
+    status = StatusProbe()
+    search = ThSearchSystem(SimpleQueue(), status, factory)
+    search.start()
+    out: List[float] = []
+    for name in names:
+        status.changed.clear()
+        start: float = time.perf_counter()
+        search.search_queue.put(StarsSystem(name=name))
+        if not status.changed.wait(120):
+            print(f"timeout: {name}")
+            continue
+        out.append(time.perf_counter() - start)
+    search.quit()
+    search.join()
+    return out, search.metrics.report()
+
+
+def main() -> None:
+    parser = CommandLineParser()
+    parser.configure_argument("n", "number", "lookups per run", True, "200")
+    parser.configure_argument("u", "unique", "unique systems pool", True, "50")
+    parser.configure_argument("l", "latency", "response delay [ms]", True, "100")
+    parser.configure_argument("j", "jitter", "random extra delay [ms]", True, "50")
+    parser.configure_argument("e", "errors", "HTTP 500 probability", True, "0")
+    parser.configure_argument("t", "throttle", "HTTP 429 probability", True, "0")
+    parser.configure_argument("r", "rate", "rate limit [req/s]", True, "1000")
+    parser.configure_argument("x", "nocache", "disable response cache")
+    parser.configure_argument("h", "help", "show help")
+    if not parser.parse_arguments() or parser.get_option("help") is not None:
+        parser.help()
+        return None
+
+    number: int = int(parser.get_option("number") or 200)
+    unique: int = int(parser.get_option("unique") or 50)
+    use_cache: bool = parser.get_option("nocache") is None
+    server = EdsmStandIn(
+        latency=float(parser.get_option("latency") or 100) / 1000,
+        jitter=float(parser.get_option("jitter") or 50) / 1000,
+        error_rate=float(parser.get_option("errors") or 0),
+        throttle_rate=float(parser.get_option("throttle") or 0),
+        synthetic=True,
+    ).start()
+    # the plugin default of 1 req/s would dominate the measurement
+    rate: float = float(parser.get_option("rate") or 1000)
+    RateLimiter.shared().configure(rate, max(1, int(rate)))
+    names: List[str] = [f"Bench System {i % unique}" for i in range(number)]
+
+    tmpdir: str = tempfile.mkdtemp(prefix="edsm_bench_")
+    try:
+        for label, run in (("Url", bench_url), ("ThSearchSystem", bench_thread)):
+            # each run starts with an empty cache
+            path: str = os.path.join(tmpdir, f"{label}.sqlite")
+            factory: Callable[[], Url] = lambda: Url(
+                cache=EdsmCache(path=path) if use_cache else None,
+                base_url=server.base_url,
+            )
+            samples, report = run(factory, names)
+            result: Dict[str, float] = percentiles(samples)
+            print(
+                f"{label:<16} n={len(samples):<5} "
+                + " ".join(f"{key}={value:8.1f} ms" for key, value in result.items())
+            )
+            for line in report:
+                print(f"    {line}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    print(f"stand-in responses: {server.stats}")
+    print(f"rate limiter: {RateLimiter.shared().metrics}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
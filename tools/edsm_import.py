@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+edsm_import.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 13:31:08
+
+Purpose: import EDSM nightly systems dump into the local systems store.
+
+Usage:
+    python tools/edsm_import.py                          full dump from EDSM
+    python tools/edsm_import.py -w                       last 7 days, appended
+    python tools/edsm_import.py -s systems.json.gz -o systems.sqlite
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker.jsktoolbox.systemtool import CommandLineParser
+from checker.jsktoolbox.edmctool.dump import DumpUrls, EdsmDumpImporter
+from checker.jsktoolbox.edmctool.edsm import LocalSystemsStore
+
+
+def main() -> None:
+    parser = CommandLineParser()
+    parser.configure_argument("s", "source", "dump file or url", True, "SOURCE")
+    parser.configure_argument("o", "output", "store database file", True, "PATH")
+    parser.configure_argument("b", "batch", "systems per transaction", True, "20000")
+    parser.configure_argument("w", "week", "import last 7 days dump, keep data")
+    parser.configure_argument("a", "append", "keep existing data")
+    parser.configure_argument("h", "help", "show help")
+    if not parser.parse_arguments() or parser.get_option("help") is not None:
+        parser.help()
+        return None
+
+    week: bool = parser.get_option("week") is not None
+    source: str = parser.get_option("source") or (
+        DumpUrls.SYSTEMS_7DAYS if week else DumpUrls.SYSTEMS
+    )
+    replace: bool = not week and parser.get_option("append") is None
+    store = LocalSystemsStore(parser.get_option("output"))
+    importer = EdsmDumpImporter(store, int(parser.get_option("batch") or 20000))
+
+    start: float = time.monotonic()
+    print(f"importing: {source} -> {store.path}")
+    count: int = importer.run(
+        source,
+        replace,
+        lambda done: print(f"    {done} systems", end="\r", flush=True),
+    )
+    print(f"\nimported {count} systems in {time.monotonic() - start:.1f} s")
+    print(f"store size: {store.count} systems")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
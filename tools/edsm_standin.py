@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+edsm_standin.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 15:20:44
+
+Purpose: local EDSM API stand-in replaying recorded fixtures.
+
+Serves api-v1/system, api-v1/systems, api-v1/sphere-systems,
+api-v1/cube-systems and api-system-v1/bodies from fixture files named
+'<kind>_<system>.json', kind is one of: system, bodies, sphere, cube.
+Unknown systems get the EDSM empty answer, or a copy of the first
+fixture of the kind renamed to the requested system in synthetic mode.
+
+Usage:
+    python tools/edsm_standin.py [-p 8080] [-l 150] [-j 50] [-e 0.05] [-t 0.05]
+    then: Url(base_url="http://127.0.0.1:8080/")
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker.jsktoolbox.systemtool import CommandLineParser
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+
+FIXTURES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# request path suffix -> fixture kind
+ROUTES: Dict[str, str] = {
+    "/api-v1/system": "system",
+    "/api-v1/systems": "systems",
+    "/api-v1/sphere-systems": "sphere",
+    "/api-v1/cube-systems": "cube",
+    "/api-system-v1/bodies": "bodies",
+}
+
+
+class EdsmStandIn(ThreadingHTTPServer):
+    """Threaded HTTP server replaying EDSM fixtures."""
+
+    daemon_threads = True
+    # concurrent clients connect at once, the default backlog of 5 drops
+    # connections that are retried a second later
+    request_queue_size = 64
+
+    def __init__(
+        self,
+        port: int = 0,
+        directory: str = FIXTURES,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        synthetic: bool = False,
+        etag: bool = False,
+    ) -> None:
+        """Create server bound to 127.0.0.1.
+
+        ### Arguments:
+        * port [int] - listening port, 0 for a free one,
+        * directory [str] - fixtures directory,
+        * latency [float] - base response delay in seconds,
+        * jitter [float] - maximum random delay added to latency,
+        * error_rate [float] - probability of HTTP 500 answer,
+        * throttle_rate [float] - probability of HTTP 429 with Retry-After,
+        * synthetic [bool] - answer unknown systems with renamed fixtures,
+        * etag [bool] - send ETag and honour If-None-Match.
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.synthetic = synthetic
+        self.etag = etag
+        self.lock = threading.Lock()
+        self.stats: Dict[int, int] = {}
+        for file_name in sorted(os.listdir(directory)):
+            kind, _, rest = file_name.partition("_")
+            if not file_name.endswith(".json") or kind not in ROUTES.values():
+                continue
+            with open(os.path.join(directory, file_name), "rb") as file:
+                self.fixtures.setdefault(kind, {})[rest[:-5]] = json.load(file)
+
+    @property
+    def base_url(self) -> str:
+        """Returns address for Url(base_url=...)."""
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def start(self) -> "EdsmStandIn":
+        """Serve in a daemon thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def count(self, status: int) -> None:
+        with self.lock:
+            self.stats[status] = self.stats.get(status, 0) + 1
+
+    def answer(self, kind: str, name: str) -> Any:
+        """Returns response data for system name."""
+        fixtures: Dict[str, Any] = self.fixtures.get(kind, {})
+        slug: str = name.lower().replace(" ", "_")
+        if slug in fixtures:
+            return fixtures[slug]
+        if not self.synthetic or not fixtures:
+            return []
+        data: Any = json.loads(json.dumps(next(iter(fixtures.values()))))
+        if isinstance(data, Dict):
+            data[EdsmKeys.NAME] = name
+            if EdsmKeys.ID64 in data:
+                data[EdsmKeys.ID64] = int(
+                    hashlib.md5(slug.encode()).hexdigest()[:12], 16
+                )
+        return data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler of EdsmStandIn."""
+
+    protocol_version = "HTTP/1.1"
+    server: EdsmStandIn
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def __send(self, status: int, body: bytes = b"", headers: Dict = {}) -> None:
+        self.server.count(status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        server: EdsmStandIn = self.server
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        parts = urlsplit(self.path)
+        kind: Optional[str] = ROUTES.get(parts.path)
+        if kind is None:
+            self.__send(404)
+            return None
+        draw: float = random.random()
+        if draw < server.throttle_rate:
+            self.__send(429, headers={"Retry-After": "1"})
+            return None
+        if draw < server.throttle_rate + server.error_rate:
+            self.__send(500)
+            return None
+
+        query: Dict[str, List[str]] = parse_qs(parts.query)
+        data: Any
+        if kind == "systems":
+            data = [
+                item
+                for item in (
+                    server.answer("system", name)
+                    for name in query.get(f"{EdsmKeys.SYSTEM_NAME}[]", [])
+                )
+                if item
+            ]
+        else:
+            data = server.answer(kind, query.get(EdsmKeys.SYSTEM_NAME, [""])[0])
+        body: bytes = json.dumps(data).encode()
+
+        headers: Dict[str, str] = {}
+        if server.etag:
+            tag: str = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == tag:
+                self.__send(304, headers={"ETag": tag})
+                return None
+            headers["ETag"] = tag
+        self.__send(200, body, headers)
+
+
+def main() -> None:
+    parser = CommandLineParser()
+    parser.configure_argument("p", "port", "listening port", True, "8080")
+    parser.configure_argument("d", "dir", "fixtures directory", True, "DIR")
+    parser.configure_argument("l", "latency", "response delay [ms]", True, "0")
+    parser.configure_argument("j", "jitter", "random extra delay [ms]", True, "0")
+    parser.configure_argument("e", "errors", "HTTP 500 probability", True, "0")
+    parser.configure_argument("t", "throttle", "HTTP 429 probability", True, "0")
+    parser.configure_argument("s", "synthetic", "answer unknown systems")
+    parser.configure_argument("g", "etag", "send ETag headers")
+    parser.configure_argument("h", "help", "show help")
+    if not parser.parse_arguments() or parser.get_option("help") is not None:
+        parser.help()
+        return None
+
+    server = EdsmStandIn(
+        port=int(parser.get_option("port") or 8080),
+        directory=parser.get_option("dir") or FIXTURES,
+        latency=float(parser.get_option("latency") or 0) / 1000,
+        jitter=float(parser.get_option("jitter") or 0) / 1000,
+        error_rate=float(parser.get_option("errors") or 0),
+        throttle_rate=float(parser.get_option("throttle") or 0),
+        synthetic=parser.get_option("synthetic") is not None,
+        etag=parser.get_option("etag") is not None,
+    )
+    print(f"EDSM stand-in: {server.base_url}")
+    for kind, fixtures in sorted(server.fixtures.items()):
+        print(f"    {kind}: {', '.join(sorted(fixtures))}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"responses: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
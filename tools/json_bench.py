@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+json_bench.py
+Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 18.10.2026, 11:02:17
+
+Purpose: micro-benchmark of JSON decoding backends on EDSM fixtures.
+
+Usage:
+    python tools/json_bench.py [-n 200] [-s 10] [-d tools/fixtures]
+    python tools/json_bench.py -r "Colonia"     record live responses
+"""
+
+import json
+import os
+import sys
+import timeit
+
+import requests  # type: ignore
+
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checker.jsktoolbox.systemtool import CommandLineParser
+from checker.jsktoolbox.edmctool.edsm import BodiesSummaryDecoder, JsonDecoder, Url
+from checker.jsktoolbox.edmctool.edsm_keys import EdsmKeys
+from checker.jsktoolbox.edmctool.stars import StarsSystem
+
+FIXTURES: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def record(name: str, directory: str) -> None:
+    """Save live EDSM responses for system name as fixtures."""
+    url = Url()
+    system = StarsSystem(name=name)
+    slug: str = name.lower().replace(" ", "_")
+    for prefix, query in (
+        ("system", url.system_url(system)),
+        ("bodies", url.bodies_url(system)),
+    ):
+        # raw payload is needed, so the session is bypassed
+        response = requests.get(query, timeout=60)
+        if response.status_code != 200:
+            print(f"{query}: HTTP {response.status_code}")
+            continue
+        path: str = os.path.join(directory, f"{prefix}_{slug}.json")
+        with open(path, "wb") as file:
+            file.write(response.content)
+        print(f"saved: {path} ({len(response.content)} bytes)")
+    url.close()
+
+
+def scale(raw: bytes, factor: int) -> bytes:
+    """Multiply the bodies list to emulate a large system."""
+    data: Any = json.loads(raw)
+    if factor > 1 and isinstance(data, Dict) and EdsmKeys.BODIES in data:
+        data[EdsmKeys.BODIES] = data[EdsmKeys.BODIES] * factor
+        return json.dumps(data).encode()
+    return raw
+
+
+def bench(raw: bytes, number: int) -> Dict[str, float]:
+    """Returns mean decoding time in seconds for each backend."""
+    out: Dict[str, float] = {}
+    for name, loads in JsonDecoder.BACKENDS.items():
+        out[name] = timeit.timeit(lambda: loads(raw), number=number) / number
+    text: str = raw.decode("utf-8")
+    chunks: List[str] = [text[i : i + 16384] for i in range(0, len(text), 16384)]
+    if text.lstrip().startswith("{") and f'"{EdsmKeys.BODIES}"' in text:
+        stream: Callable[[], Any] = lambda: BodiesSummaryDecoder().decode(chunks)
+        out["stream"] = timeit.timeit(stream, number=number) / number
+    return out
+
+
+def main() -> None:
+    parser = CommandLineParser()
+    parser.configure_argument("d", "dir", "fixtures directory", True, "DIR")
+    parser.configure_argument("n", "number", "iterations per test", True, "200")
+    parser.configure_argument("s", "scale", "bodies list multiplier", True, "1")
+    parser.configure_argument("r", "record", "record live system", True, "NAME")
+    parser.configure_argument("h", "help", "show help")
+    if not parser.parse_arguments() or parser.get_option("help") is not None:
+        parser.help()
+        return None
+
+    directory: str = parser.get_option("dir") or FIXTURES
+    if parser.get_option("record"):
+        record(parser.get_option("record"), directory)  # type: ignore
+        return None
+    number: int = int(parser.get_option("number") or 200)
+    factor: int = int(parser.get_option("scale") or 1)
+
+    print(f"selected backend: {JsonDecoder.BACKEND}")
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, file_name), "rb") as file:
+            raw: bytes = scale(file.read(), factor)
+        results: Dict[str, float] = bench(raw, number)
+        base: float = results["json"]
+        print(f"{file_name} ({len(raw)} bytes)")
+        for name, value in sorted(results.items(), key=lambda item: item[1]):
+            print(f"    {name:<8} {value * 1e6:>10.1f} us  x{base / value:.2f}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################